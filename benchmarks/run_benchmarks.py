@@ -0,0 +1,213 @@
+"""
+Benchmarks de PAESAnalyzer y PAESVisualizer sobre datos sintéticos
+Mide tiempo y memoria de cada etapa y guarda los resultados en JSON
+
+Uso:
+    python benchmarks/run_benchmarks.py --rows 300000 --output benchmarks/resultados.json
+"""
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import argparse
+import gc
+import json
+import platform
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+
+from src import __version__
+from src.paes_analyzer import PAESAnalyzer, _peak_rss_mb
+from src.synthetic import generate_archivo_c
+from src.visualizations import PAESVisualizer
+
+
+class StageTimer:
+    """
+    Ejecuta etapas midiendo tiempo de reloj, tiempo de CPU y memoria.
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        """
+        Args:
+            trace_memory: Si es True, mide el pico de memoria con tracemalloc
+                          (agrega algo de costo a las etapas con muchos objetos Python)
+        """
+        self.trace_memory = trace_memory
+        self.results = []
+
+    def run(self, name: str, func, rows_in: int = None):
+        """
+        Ejecuta una etapa y registra sus métricas.
+
+        Args:
+            name: Nombre de la etapa
+            func: Función sin argumentos a medir
+            rows_in: Filas de entrada (opcional)
+
+        Returns:
+            Valor retornado por func
+        """
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+        start_wall = time.perf_counter()
+        start_cpu = time.process_time()
+
+        value = func()
+
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        peak_mb = None
+        if self.trace_memory:
+            peak_mb = round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 2)
+            tracemalloc.stop()
+
+        result = {
+            'etapa': name,
+            'segundos': round(wall, 4),
+            'cpu_segundos': round(cpu, 4),
+            'memoria_pico_mb': peak_mb,
+            'rss_pico_mb': _peak_rss_mb(),
+            'filas_entrada': rows_in,
+            'filas_salida': (len(value) if isinstance(value, (pd.DataFrame, pd.Series, list))
+                             else None)
+        }
+        self.results.append(result)
+        print(f"  {name:.<40} {wall:8.3f} s  (pico {peak_mb} MB)")
+        return value
+
+
+def run_benchmarks(rows: int, schools: int, workdir: str, 
+                   trace_memory: bool = True, plots: bool = True,
+                   plot_profile: str = 'print') -> dict:
+    """
+    Ejecuta todas las etapas del análisis sobre datos sintéticos.
+
+    Args:
+        rows: Filas del archivo sintético
+        schools: Número de establecimientos
+        workdir: Directorio para datos y salidas temporales
+        trace_memory: Medir memoria con tracemalloc
+        plots: Incluir las visualizaciones
+        plot_profile: Perfil de salida de los gráficos
+
+    Returns:
+        Diccionario con metadatos y métricas por etapa
+    """
+    file_2025 = os.path.join(workdir, 'ArchivoC_Adm2025.csv')
+    file_2024 = os.path.join(workdir, 'ArchivoC_Adm2024.csv')
+    generate_archivo_c(file_2025, rows, n_schools=schools, seed=2025)
+    generate_archivo_c(file_2024, rows, n_schools=schools, seed=2024)
+
+    timer = StageTimer(trace_memory)
+    print("\nEtapas:")
+
+    analyzer = PAESAnalyzer(file_2025, 2025)
+    timer.run('load_data', lambda: analyzer.load_data(use_cache=False), rows)
+    timer.run('load_data_fast', 
+              lambda: PAESAnalyzer(file_2025, 2025).load_data(fast=True, use_cache=False), 
+              rows)
+    filtered = timer.run('filter_graduates', analyzer.filter_graduates, rows)
+    timer.run('calculate_school_averages', analyzer.calculate_school_averages, len(filtered))
+    ranking = timer.run('create_ranking', analyzer.create_ranking, len(filtered))
+    timer.run('create_ranking_streaming',
+              lambda: PAESAnalyzer(file_2025, 2025).create_ranking_streaming(), rows)
+
+    rbds = ranking['RBD'].to_numpy()
+    timer.run('get_school_position_x1000',
+              lambda: [analyzer.get_school_position(int(rbd)) for rbd in rbds[:1000]],
+              1000)
+    timer.run('get_school_positions', lambda: analyzer.get_school_positions(rbds), len(rbds))
+    timer.run('get_statistics', analyzer.get_statistics, len(ranking))
+
+    analyzer_2024 = PAESAnalyzer(file_2024, 2024)
+    analyzer_2024.create_ranking_streaming()
+    timer.run('compare_all_schools', 
+              lambda: analyzer.compare_all_schools(analyzer_2024), len(ranking))
+
+    for format, ext in [('csv', 'csv'), ('json', 'json'), ('sqlite', 'db')]:
+        path = os.path.join(workdir, f'ranking.{ext}')
+        timer.run(f'export_ranking_{format}', 
+                  lambda: analyzer.export_ranking(path, format=format), len(ranking))
+
+    if plots:
+        visualizer = PAESVisualizer(profile=plot_profile)
+        plot_stages = {
+            'plot_top_schools': lambda path: visualizer.plot_top_schools(ranking, 20, path),
+            'plot_score_distribution': 
+                lambda path: visualizer.plot_score_distribution(ranking, path),
+            'plot_year_comparison': lambda path: visualizer.plot_year_comparison(
+                ranking, analyzer_2024.ranking, 2025, 2024, path),
+            'plot_regional_comparison': 
+                lambda path: visualizer.plot_regional_comparison(analyzer.filtered_data, path),
+            'create_summary_dashboard': 
+                lambda path: visualizer.create_summary_dashboard(ranking, 2025, path)
+        }
+        for name, plot in plot_stages.items():
+            path = os.path.join(workdir, f'{name}.png')
+            timer.run(name, lambda: plot(path), len(ranking))
+
+    return {
+        'version': __version__,
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'filas': rows,
+        'establecimientos': schools,
+        'memoria_tracemalloc': trace_memory,
+        'perfil_graficos': plot_profile if plots else None,
+        'etapas': timer.results
+    }
+
+
+def main():
+    """Función principal de los benchmarks."""
+    parser = argparse.ArgumentParser(
+        description='Benchmarks de PAES Ranking Chile con datos sintéticos'
+    )
+    parser.add_argument('--rows', type=int, default=300_000,
+                        help='Filas del archivo sintético (default: 300000)')
+    parser.add_argument('--schools', type=int, default=3000,
+                        help='Número de establecimientos (default: 3000)')
+    parser.add_argument('--output', type=str, default='benchmarks/resultados.json',
+                        help='Archivo JSON de resultados')
+    parser.add_argument('--workdir', type=str,
+                        help='Directorio de trabajo (default: temporal)')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='No medir memoria con tracemalloc')
+    parser.add_argument('--no-plots', action='store_true',
+                        help='Omitir las visualizaciones')
+    parser.add_argument('--plot-profile', type=str, default='print',
+                        choices=['draft', 'print', 'web', 'svg'],
+                        help='Perfil de salida de los gráficos (default: print)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        results = run_benchmarks(args.rows, args.schools, workdir,
+                                 trace_memory=not args.no_memory,
+                                 plots=not args.no_plots,
+                                 plot_profile=args.plot_profile)
+
+    output_dir = os.path.dirname(args.output)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ Resultados guardados en: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
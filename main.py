@@ -7,10 +7,343 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from paes_analyzer import PAESAnalyzer
-from visualizations import PAESVisualizer
+from paes_analyzer import PAESAnalyzer, SUBJECT_NAMES
+from instrumentation import format_report
+from pipeline import parse_year_source, run_years
+from scenarios import load_scenarios
+from schema import validate_source
 import argparse
 import json
+import pandas as pd
+
+
+def read_rbd_file(path: str) -> list:
+    """
+    Lee una lista de RBD desde un archivo de texto o CSV.
+    
+    Acepta un RBD por línea o un CSV con columna 'RBD' 
+    (si no existe, se usa la primera columna).
+    
+    Args:
+        path: Ruta al archivo con códigos RBD
+        
+    Returns:
+        Lista de RBD sin duplicados, en el orden del archivo
+    """
+    with open(path, encoding='utf-8-sig') as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if not lines:
+        return []
+    
+    sep = next((c for c in (';', ',', '\t') if c in lines[0]), None)
+    rows = [line.split(sep) if sep else [line] for line in lines]
+    
+    column = 0
+    header = [cell.strip().strip('"').upper() for cell in rows[0]]
+    if not any(cell.isdigit() for cell in header):
+        column = header.index('RBD') if 'RBD' in header else 0
+        rows = rows[1:]
+    
+    values = pd.Series([row[column].strip().strip('"') for row in rows if len(row) > column])
+    rbds = pd.to_numeric(values, errors='coerce').dropna()
+    return rbds.astype('int64').drop_duplicates().tolist()
+
+
+def write_table(df: pd.DataFrame, path: str, format: str) -> str:
+    """
+    Guarda una tabla de resultados en CSV o JSON.
+    
+    Args:
+        df: DataFrame a guardar
+        path: Ruta del archivo
+        format: 'csv' o 'json'
+        
+    Returns:
+        Ruta del archivo generado
+    """
+    if format == 'json':
+        df.to_json(path, orient='records', indent=2, force_ascii=False)
+    else:
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+    return path
+
+
+def write_profile(analyzers: list, path: str):
+    """
+    Muestra y guarda el perfil de etapas (tiempo, CPU, filas y memoria).
+    
+    Args:
+        analyzers: Analizadores cuyas etapas se reportan
+        path: Ruta del archivo JSON
+    """
+    records = [record for analyzer in analyzers for record in analyzer.stage_metrics]
+    
+    print(f"\n{'='*60}")
+    print("   PERFIL DE ETAPAS")
+    print(f"{'='*60}\n")
+    print(format_report(records))
+    
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    print(f"\n✓ Perfil exportado a: {path}")
+
+
+def export_regional(analyzer: PAESAnalyzer, output_dir: str, format: str):
+    """
+    Exporta promedios por región y comuna y el ranking dentro de cada región,
+    leídos del cubo de agregación.
+    
+    Args:
+        analyzer: Analizador con ranking calculado
+        output_dir: Directorio de salida
+        format: 'csv' o 'json'
+    """
+    try:
+        cube = analyzer.build_cube()
+    except ValueError as e:
+        print(f"⚠ {e}")
+        return
+    
+    outputs = {
+        f'regiones_paes_{analyzer.year}': 'CODIGO_REGION',
+        f'comunas_paes_{analyzer.year}': 'CODIGO_COMUNA',
+        f'dependencia_paes_{analyzer.year}': 'GRUPO_DEPENDENCIA'
+    }
+    for name, level in outputs.items():
+        if level in cube.dimensions:
+            path = write_table(cube.rollup(level), 
+                               os.path.join(output_dir, f'{name}.{format}'), format)
+            print(f"✓ Promedios por {level} exportados a: {path}")
+    
+    if 'CODIGO_REGION' in cube.dimensions:
+        path = write_table(
+            cube.ranking_within('CODIGO_REGION'),
+            os.path.join(output_dir, f'ranking_regional_paes_{analyzer.year}.{format}'),
+            format
+        )
+        print(f"✓ Ranking regional exportado a: {path}")
+
+
+def print_memory(memory: dict, label: str = ''):
+    """
+    Muestra la memoria pico y estable (al terminar) del procesamiento.
+    
+    Args:
+        memory: Resultado de PAESAnalyzer.memory_usage
+        label: Prefijo opcional (por ejemplo, el año)
+    """
+    print(f"✓ Memoria{label}: pico {memory['rss_pico_mb']} MB, "
+          f"estable {memory['rss_actual_mb']} MB "
+          f"(datos {memory['datos_mb']} MB, egresados {memory['egresados_mb']} MB)")
+
+
+def validate_sources(sources: list) -> bool:
+    """
+    Valida encabezado y muestra de cada archivo y muestra el resultado.
+    
+    Args:
+        sources: Lista de pares (ruta, año)
+        
+    Returns:
+        True si todos los archivos son válidos
+    """
+    valid = True
+    for file_path, year in sources:
+        report = validate_source(file_path, year, strict=False)
+        status = '❌' if report['errores'] else '✓'
+        print(f"{status} {file_path} ({year}): {report['columnas']} columnas, "
+              f"{report['filas_muestra']:,} filas de muestra, {report['segundos']} s")
+        for old, new in report['renombres'].items():
+            print(f"    {old} → {new}")
+        for warning in report['advertencias']:
+            print(f"    ⚠ {warning}")
+        for error in report['errores']:
+            print(f"    ❌ {error}")
+        valid = valid and not report['errores']
+    return valid
+
+
+def export_scenarios(analyzer: PAESAnalyzer, scenarios: list, output_dir: str, 
+                     format: str):
+    """
+    Exporta puntajes y posiciones de todos los escenarios de un año.
+    
+    Args:
+        analyzer: Analizador con ranking calculado
+        scenarios: Escenarios de ponderación
+        output_dir: Directorio de salida
+        format: 'csv' o 'json'
+    """
+    table = analyzer.rank_scenarios(scenarios)
+    path = write_table(
+        table,
+        os.path.join(output_dir, f'escenarios_paes_{analyzer.year}.{format}'),
+        format
+    )
+    print(f"✓ {len(scenarios)} escenarios exportados a: {path}")
+
+
+def export_subjects(analyzer: PAESAnalyzer, output_dir: str, format: str):
+    """
+    Exporta el ranking por asignatura (establecimiento × prueba) de un año.
+    
+    Args:
+        analyzer: Analizador con datos cargados
+        output_dir: Directorio de salida
+        format: 'csv' o 'json'
+    """
+    table = analyzer.subject_rankings()
+    path = write_table(
+        table,
+        os.path.join(output_dir, f'ranking_asignaturas_paes_{analyzer.year}.{format}'),
+        format
+    )
+    print(f"✓ Ranking por asignatura de {len(table):,} establecimientos exportado a: {path}")
+
+
+def export_percentiles(analyzer: PAESAnalyzer, output_dir: str, format: str):
+    """
+    Exporta percentiles de puntaje de estudiantes, nacionales y por región.
+    
+    Args:
+        analyzer: Analizador con datos cargados o sketch calculado
+        output_dir: Directorio de salida
+        format: 'csv' o 'json'
+    """
+    tables = {'percentiles_paes': analyzer.score_percentiles()}
+    if analyzer.quantile_sketch().key is not None:
+        tables['percentiles_region_paes'] = analyzer.score_percentiles(by_region=True)
+    for name, table in tables.items():
+        path = write_table(
+            table, os.path.join(output_dir, f'{name}_{analyzer.year}.{format}'), format
+        )
+        print(f"✓ Percentiles de estudiantes exportados a: {path}")
+
+
+def ingest_sources(sources: list, store_dir: str, load_options: dict):
+    """
+    Convierte cada año en un almacén columnar store_dir/<año>.
+    
+    Args:
+        sources: Lista de pares (ruta, año)
+        store_dir: Directorio base de los almacenes
+        load_options: Opciones para load_data (se fuerza la carga rápida)
+    """
+    for file_path, year in sources:
+        analyzer = PAESAnalyzer(file_path, year)
+        analyzer.load_data(**dict(load_options, fast=True))
+        analyzer.export_store(os.path.join(store_dir, str(year)))
+
+
+def run_multi_year(args, sources: list, load_options: dict, scenarios: list = None):
+    """
+    Procesa varios años en paralelo y exporta sus resultados.
+    
+    Args:
+        args: Argumentos de línea de comandos
+        sources: Lista de pares (ruta, año) de --years
+        load_options: Opciones para load_data
+        scenarios: Escenarios de --scenarios ya validados (None si no se pidieron)
+    """
+    years = [year for _, year in sources]
+    
+    print(f"\n{'='*60}")
+    print(f"   ANÁLISIS PAES MULTI-AÑO {', '.join(map(str, years))}")
+    print(f"{'='*60}\n")
+    
+    analyzers = run_years(
+        sources, 
+        workers=args.workers,
+        stream=args.stream,
+        chunksize=args.chunksize,
+        load_options=load_options,
+        low_memory=args.low_memory,
+        bootstrap=args.bootstrap
+    )
+    
+    print(f"\n{'='*60}")
+    print("   ESTADÍSTICAS POR AÑO")
+    print(f"{'='*60}\n")
+    
+    all_stats = []
+    for analyzer in analyzers:
+        stats = analyzer.get_statistics()
+        all_stats.append(stats)
+        print(f"{analyzer.year}: {stats['total_establecimientos']:,} establecimientos  |  "
+              f"Promedio: {stats['promedio_nacional']}  |  "
+              f"Mediana: {stats['mediana_nacional']}")
+        if args.low_memory:
+            print_memory(analyzer.memory_report, f" {analyzer.year}")
+        
+        output_csv = os.path.join(args.output_dir, f'ranking_paes_{analyzer.year}.csv')
+        analyzer.export_ranking(output_csv, format='csv')
+        top_output = os.path.join(args.output_dir, f'top_{args.top}_paes_{analyzer.year}.csv')
+        analyzer.get_top_schools(args.top).to_csv(top_output, index=False, encoding='utf-8-sig')
+        print(f"✓ Top {args.top} exportado a: {top_output}")
+        if args.regional:
+            export_regional(analyzer, args.output_dir, args.rbd_format)
+        if scenarios:
+            export_scenarios(analyzer, scenarios, args.output_dir, args.rbd_format)
+        if args.subjects:
+            export_subjects(analyzer, args.output_dir, args.rbd_format)
+        if args.percentiles:
+            export_percentiles(analyzer, args.output_dir, args.rbd_format)
+        if args.sqlite:
+            analyzer.export_ranking(args.sqlite, format='sqlite', include_averages=True)
+    
+    stats_output = os.path.join(args.output_dir, 'estadisticas_paes_multi_anio.json')
+    with open(stats_output, 'w', encoding='utf-8') as f:
+        json.dump(all_stats, f, indent=2, ensure_ascii=False)
+    print(f"✓ Estadísticas exportadas a: {stats_output}")
+    
+    # Comparación de todos los establecimientos entre años
+    if len(analyzers) > 1:
+        comparison = analyzers[0].compare_all_schools(*analyzers[1:])
+        comparison_output = os.path.join(args.output_dir, 'comparacion_multi_anio.csv')
+        comparison.to_csv(comparison_output, index=False, encoding='utf-8-sig')
+        print(f"✓ Comparación de {len(comparison):,} establecimientos exportada a: "
+              f"{comparison_output}")
+    
+    # Percentiles de todos los años juntos: los sketches se suman
+    if args.percentiles and len(analyzers) > 1:
+        sketch = analyzers[0].quantile_sketch()
+        for analyzer in analyzers[1:]:
+            sketch = sketch.merge(analyzer.quantile_sketch())
+        pooled = sketch.quantiles()
+        pooled['PRUEBA'] = pooled['PRUEBA'].map(SUBJECT_NAMES).fillna(pooled['PRUEBA'])
+        pooled_output = write_table(
+            pooled,
+            os.path.join(args.output_dir, f'percentiles_paes_multi_anio.{args.rbd_format}'),
+            args.rbd_format
+        )
+        print(f"✓ Percentiles de {', '.join(map(str, years))} exportados a: {pooled_output}")
+    
+    # Consultas de RBD en todos los años
+    rbd_list = []
+    if args.rbd:
+        rbd_list.append(args.rbd)
+    if args.rbd_file:
+        rbd_list.extend(read_rbd_file(args.rbd_file))
+    
+    if rbd_list:
+        positions = pd.concat(
+            [analyzer.get_school_positions(rbd_list) for analyzer in analyzers],
+            ignore_index=True
+        )
+        positions_output = os.path.join(
+            args.output_dir, 
+            f'consulta_rbd_multi_anio.{args.rbd_format}'
+        )
+        write_table(positions, positions_output, args.rbd_format)
+        print(f"✓ Consulta de {len(rbd_list):,} RBD exportada a: {positions_output}")
+    
+    if args.profile:
+        write_profile(analyzers, os.path.join(args.output_dir, 'perfil_paes_multi_anio.json'))
+    
+    print(f"\n{'='*60}")
+    print("   ✓ ANÁLISIS COMPLETADO")
+    print(f"{'='*60}\n")
+    print(f"Los resultados se guardaron en: {args.output_dir}/\n")
 
 
 def main():
@@ -23,17 +356,30 @@ def main():
     parser.add_argument(
         '--file', 
         type=str, 
-        required=True,
-        help='Ruta al archivo CSV con datos PAES'
+        help='Ruta al archivo CSV con datos PAES (también .zip, .gz, .bz2 o .zst; '
+             'archivo.zip::miembro.csv para elegir el archivo dentro de un .zip)'
     )
     
     parser.add_argument(
         '--year', 
         type=int, 
-        required=True,
         help='Año de admisión'
     )
     
+    parser.add_argument(
+        '--years', 
+        type=str,
+        nargs='+',
+        help='Modo multi-año: pares ruta,año procesados en paralelo'
+    )
+    
+    parser.add_argument(
+        '--workers', 
+        type=int,
+        help='Procesos para el modo multi-año y para generar gráficos '
+             '(default: uno por año o por gráfico, hasta el número de CPU)'
+    )
+    
     parser.add_argument(
         '--output-dir', 
         type=str, 
@@ -54,35 +400,232 @@ def main():
         help='Consultar posición de un RBD específico'
     )
     
+    parser.add_argument(
+        '--rbd-file', 
+        type=str,
+        help='Archivo de texto o CSV con una lista de RBD a consultar'
+    )
+    
+    parser.add_argument(
+        '--rbd-format', 
+        type=str,
+        choices=['csv', 'json'],
+        default='csv',
+        help='Formato del resultado de --rbd-file, --regional, --scenarios, '
+             '--subjects y --percentiles (default: csv)'
+    )
+    
+    parser.add_argument(
+        '--sqlite', 
+        type=str,
+        help='Base SQLite donde guardar rankings y promedios de cada año'
+    )
+    
+    parser.add_argument(
+        '--regional', 
+        action='store_true',
+        help='Exportar promedios por región, comuna y dependencia, y el ranking '
+             'dentro de cada región (formato de --rbd-format)'
+    )
+    
+    parser.add_argument(
+        '--scenarios', 
+        type=str,
+        metavar='JSON',
+        help='Archivo JSON con escenarios de ponderación; exporta puntaje y '
+             'posición de cada colegio en todos ellos (formato de --rbd-format)'
+    )
+    
+    parser.add_argument(
+        '--subjects', 
+        action='store_true',
+        help='Exportar el ranking de cada colegio en las cinco pruebas, con el '
+             'N de cada una (formato de --rbd-format)'
+    )
+    
+    parser.add_argument(
+        '--percentiles', 
+        action='store_true',
+        help='Exportar percentiles P10/P50/P90 de puntaje de los estudiantes por '
+             'prueba, nacionales y por región (formato de --rbd-format)'
+    )
+    
     parser.add_argument(
         '--visualize', 
         action='store_true',
         help='Generar visualizaciones'
     )
     
+    parser.add_argument(
+        '--plot-profile', 
+        type=str,
+        choices=['draft', 'print', 'web', 'svg'],
+        default='print',
+        help='Perfil de salida de los gráficos: draft (72 dpi), print (300 dpi), '
+             'web (PNG comprimido) o svg (default: print)'
+    )
+    
     parser.add_argument(
         '--compare', 
         type=str,
         help='Archivo CSV de otro año para comparar (formato: ruta,año)'
     )
     
+    parser.add_argument(
+        '--fast', 
+        action='store_true',
+        help='Carga rápida: solo columnas necesarias y tipos compactos'
+    )
+    
+    parser.add_argument(
+        '--engine', 
+        type=str,
+        choices=['c', 'pyarrow'],
+        default='c',
+        help='Motor de lectura CSV para la carga rápida (default: c)'
+    )
+    
+    parser.add_argument(
+        '--no-cache', 
+        action='store_true',
+        help='No leer ni escribir el caché Parquet de datos'
+    )
+    
+    parser.add_argument(
+        '--rebuild-cache', 
+        action='store_true',
+        help='Reconstruir el caché Parquet aunque exista'
+    )
+    
+    parser.add_argument(
+        '--stream', 
+        action='store_true',
+        help='Procesar el archivo por bloques con memoria acotada'
+    )
+    
+    parser.add_argument(
+        '--chunksize', 
+        type=int,
+        default=250_000,
+        help='Filas por bloque en modo --stream (default: 250000)'
+    )
+    
+    parser.add_argument(
+        '--ingest', 
+        type=str,
+        metavar='DIR',
+        help='Convertir cada año en un almacén columnar DIR/<año> (memmap) y terminar. '
+             'Luego se usa con --file DIR/<año>'
+    )
+    
+    parser.add_argument(
+        '--validate', 
+        action='store_true',
+        help='Solo validar columnas y tipos (encabezado y una muestra) sin procesar'
+    )
+    
+    parser.add_argument(
+        '--bootstrap', 
+        type=int,
+        default=0,
+        metavar='N',
+        help='Agregar al ranking intervalos de confianza y rango probable de '
+             'posición con N réplicas bootstrap (ej: 1000)'
+    )
+    
+    parser.add_argument(
+        '--low-memory', 
+        action='store_true',
+        help='Filtrar egresados sin copiar filas y liberar los datos de '
+             'estudiantes una vez creado el ranking'
+    )
+    
+    parser.add_argument(
+        '--profile', 
+        action='store_true',
+        help='Medir tiempo, CPU, filas y memoria de cada etapa'
+    )
+    
     args = parser.parse_args()
+    load_options = {
+        'fast': args.fast,
+        'engine': args.engine,
+        'use_cache': not args.no_cache,
+        'refresh_cache': args.rebuild_cache
+    }
+    
+    if not args.years and (args.file is None or args.year is None):
+        parser.error('se requieren --file y --year, o bien --years')
+    
+    if args.stream and args.bootstrap:
+        parser.error('--bootstrap necesita los datos de estudiantes y --stream no los '
+                     'guarda; use --low-memory para reducir la memoria')
+    
+    if args.years:
+        try:
+            sources = [parse_year_source(value) for value in args.years]
+        except ValueError as error:
+            parser.error(f'--years: {error}')
+        years = [year for _, year in sources]
+        duplicated = sorted({year for year in years if years.count(year) > 1})
+        if duplicated:
+            parser.error(f"--years: años repetidos {', '.join(map(str, duplicated))}")
+        # --years ya compara todos los años entre sí
+        unsupported = [flag for flag, value in (('--visualize', args.visualize),
+                                                ('--compare', args.compare))
+                       if value]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} no se puede usar con --years")
+    else:
+        sources = [(args.file, args.year)]
+    
+    # Validar los escenarios antes de calcular cualquier ranking
+    scenarios = None
+    if args.scenarios:
+        try:
+            scenarios = load_scenarios(args.scenarios)
+        except (OSError, ValueError) as error:
+            parser.error(f'--scenarios: {error}')
+    
+    if args.validate:
+        sys.exit(0 if validate_sources(sources) else 1)
+    
+    if args.ingest:
+        ingest_sources(sources, args.ingest, load_options)
+        return
     
     # Crear directorio de salida si no existe
     os.makedirs(args.output_dir, exist_ok=True)
     
+    if args.years:
+        run_multi_year(args, sources, load_options, scenarios)
+        return
+    
     # Inicializar analizador
     print(f"\n{'='*60}")
     print(f"   ANÁLISIS PAES {args.year}")
     print(f"{'='*60}\n")
     
     analyzer = PAESAnalyzer(args.file, args.year)
+    analyzers = [analyzer]
     
     # Cargar y procesar datos
-    analyzer.load_data()
-    analyzer.filter_graduates()
-    analyzer.calculate_school_averages()
-    ranking = analyzer.create_ranking()
+    if args.stream:
+        ranking = analyzer.create_ranking_streaming(args.chunksize)
+    else:
+        analyzer.load_data(**load_options)
+        if args.low_memory:
+            analyzer.index_graduates()
+        else:
+            analyzer.filter_graduates()
+        analyzer.calculate_school_averages()
+        ranking = analyzer.create_ranking()
+    
+    if args.bootstrap:
+        ranking = analyzer.bootstrap_ranking(args.bootstrap, workers=args.workers)
+    if args.low_memory and not args.stream:
+        analyzer.release_raw_data()
+        print_memory(analyzer.memory_usage())
     
     # Mostrar estadísticas
     print(f"\n{'='*60}")
@@ -91,8 +634,16 @@ def main():
     
     stats = analyzer.get_statistics()
     for key, value in stats.items():
+        if key == 'percentiles_estudiantes':
+            continue
         print(f"{key.replace('_', ' ').title():.<40} {value}")
     
+    if 'percentiles_estudiantes' in stats:
+        print("\nPercentiles de estudiantes (P10 / P50 / P90):")
+        for name, row in stats['percentiles_estudiantes'].items():
+            print(f"  {name:6s} {row['P10']:6.1f} / {row['P50']:6.1f} / {row['P90']:6.1f}  |  "
+                  f"N: {row['N']:,}")
+    
     # Exportar ranking completo
     output_csv = os.path.join(args.output_dir, f'ranking_paes_{args.year}.csv')
     analyzer.export_ranking(output_csv, format='csv')
@@ -100,6 +651,21 @@ def main():
     output_excel = os.path.join(args.output_dir, f'ranking_paes_{args.year}.xlsx')
     analyzer.export_ranking(output_excel, format='excel')
     
+    if args.sqlite:
+        analyzer.export_ranking(args.sqlite, format='sqlite', include_averages=True)
+    
+    if args.regional:
+        export_regional(analyzer, args.output_dir, args.rbd_format)
+    
+    if scenarios:
+        export_scenarios(analyzer, scenarios, args.output_dir, args.rbd_format)
+    
+    if args.subjects:
+        export_subjects(analyzer, args.output_dir, args.rbd_format)
+    
+    if args.percentiles:
+        export_percentiles(analyzer, args.output_dir, args.rbd_format)
+    
     # Exportar top establecimientos
     top_schools = analyzer.get_top_schools(args.top)
     top_output = os.path.join(args.output_dir, f'top_{args.top}_paes_{args.year}.csv')
@@ -123,7 +689,9 @@ def main():
               f"Promedio: {row['PAES_PROMEDIO']:6.2f}  |  "
               f"CLEC: {row['CLEC_REG_ACTUAL']:6.2f}  |  "
               f"MATE1: {row['MATE1_REG_ACTUAL']:6.2f}  |  "
-              f"N: {int(row['N_ESTUDIANTES']):3d}")
+              f"N: {int(row['N_ESTUDIANTES']):3d}" + 
+              (f"  |  Rango: {row['RANK_IC_INF']}-{row['RANK_IC_SUP']}" 
+               if 'RANK_IC_INF' in row else ''))
     
     # Consultar RBD específico
     if args.rbd:
@@ -137,41 +705,71 @@ def main():
             print(f"❌ {result['error']}")
         else:
             print(f"RBD: {result['rbd']}")
-            print(f"Ranking Nacional: #{result['rank']}")
-            print(f"Percentil: {result['percentil']}%")
+            if result['rank'] is None:
+                print("Ranking Nacional: sin ranking (sin puntajes CLEC/MATE1)")
+            else:
+                print(f"Ranking Nacional: #{result['rank']}")
+                print(f"Percentil: {result['percentil']}%")
             print(f"Promedio PAES: {result['paes_promedio']}")
             print(f"Comprensión Lectora: {result['clec']}")
             print(f"Matemática 1: {result['mate1']}")
             print(f"Número de Estudiantes: {result['n_estudiantes']}")
+            
+            if args.subjects:
+                subjects = analyzer.get_subject_positions(args.rbd).iloc[0]
+                print("\nPor prueba:")
+                for name in SUBJECT_NAMES.values():
+                    if pd.notna(subjects[f'RANK_{name}']):
+                        print(f"  {name:6s} #{subjects[f'RANK_{name}']}  |  "
+                              f"Percentil: {subjects[f'PERCENTIL_{name}']}%  |  "
+                              f"N: {int(subjects[f'N_{name}'])}")
     
-    # Generar visualizaciones
-    if args.visualize:
+    # Consultar lista de RBD
+    rbd_list = None
+    if args.rbd_file:
         print(f"\n{'='*60}")
-        print("   GENERANDO VISUALIZACIONES")
+        print("   CONSULTA MASIVA DE RBD")
         print(f"{'='*60}\n")
         
-        visualizer = PAESVisualizer()
-        
-        # Dashboard principal
-        dashboard_path = os.path.join(
-            args.output_dir, 
-            f'dashboard_paes_{args.year}.png'
-        )
-        visualizer.create_summary_dashboard(ranking, args.year, dashboard_path)
+        rbd_list = read_rbd_file(args.rbd_file)
+        positions = analyzer.get_school_positions(rbd_list)
         
-        # Top establecimientos
-        top_path = os.path.join(
+        positions_output = os.path.join(
             args.output_dir, 
-            f'top_20_paes_{args.year}.png'
+            f'consulta_rbd_{args.year}.{args.rbd_format}'
         )
-        visualizer.plot_top_schools(ranking, n=20, save_path=top_path)
-        
-        # Distribución
-        dist_path = os.path.join(
-            args.output_dir, 
-            f'distribucion_paes_{args.year}.png'
-        )
-        visualizer.plot_score_distribution(ranking, dist_path)
+        write_table(positions, positions_output, args.rbd_format)
+        print(f"✓ {int(positions['encontrado'].sum()):,} de {len(rbd_list):,} RBD "
+              f"encontrados")
+        print(f"✓ Consulta exportada a: {positions_output}")
+    
+    # Visualizaciones: se generan juntas al final, en paralelo
+    figure_jobs = []
+    if args.visualize:
+        # Todos los gráficos usan el mismo resumen que las estadísticas exportadas
+        summary = analyzer.get_summary()
+        figure_jobs.append(('create_summary_dashboard', {
+            'ranking_df': ranking, 
+            'year': args.year,
+            'summary': summary,
+            'save_path': os.path.join(args.output_dir, f'dashboard_paes_{args.year}.png')
+        }))
+        figure_jobs.append(('plot_top_schools', {
+            'ranking_df': ranking, 
+            'n': 20,
+            'summary': summary,
+            'save_path': os.path.join(args.output_dir, f'top_20_paes_{args.year}.png')
+        }))
+        figure_jobs.append(('plot_score_distribution', {
+            'ranking_df': ranking,
+            'summary': summary,
+            'save_path': os.path.join(args.output_dir, f'distribucion_paes_{args.year}.png')
+        }))
+        if analyzer.get_school_regions() is not None:
+            figure_jobs.append(('plot_regional_comparison', {
+                'cube': analyzer.build_cube(),
+                'save_path': os.path.join(args.output_dir, f'regiones_paes_{args.year}.png')
+            }))
     
     # Comparación entre años
     if args.compare:
@@ -184,9 +782,21 @@ def main():
             print(f"{'='*60}\n")
             
             analyzer2 = PAESAnalyzer(compare_file, compare_year)
-            analyzer2.load_data()
-            analyzer2.filter_graduates()
-            ranking2 = analyzer2.create_ranking()
+            analyzers.append(analyzer2)
+            if args.stream:
+                ranking2 = analyzer2.create_ranking_streaming(args.chunksize)
+            else:
+                analyzer2.load_data(**load_options)
+                if args.low_memory:
+                    analyzer2.index_graduates()
+                else:
+                    analyzer2.filter_graduates()
+                ranking2 = analyzer2.create_ranking()
+                if args.low_memory:
+                    analyzer2.release_raw_data()
+            
+            if args.sqlite:
+                analyzer2.export_ranking(args.sqlite, format='sqlite', include_averages=True)
             
             if args.rbd:
                 comparison = analyzer.compare_years(analyzer2, args.rbd)
@@ -201,20 +811,57 @@ def main():
                     print(f"Cambio en puntaje: {comparison['cambio_puntaje']:+.2f} puntos")
                     print(f"Tendencia: {comparison['tendencia'].upper()}")
             
-            if args.visualize:
-                comp_path = os.path.join(
+            comparison_all = analyzer.compare_all_schools(analyzer2)
+            comparison_all_output = os.path.join(
+                args.output_dir, 
+                f'comparacion_{args.year}_vs_{compare_year}.csv'
+            )
+            comparison_all.to_csv(comparison_all_output, index=False, encoding='utf-8-sig')
+            print(f"✓ Comparación de {len(comparison_all):,} establecimientos exportada a: "
+                  f"{comparison_all_output}")
+            
+            if rbd_list is not None:
+                comparison_table = analyzer.compare_years_batch(analyzer2, rbd_list)
+                comparison_output = os.path.join(
                     args.output_dir, 
-                    f'comparacion_{args.year}_vs_{compare_year}.png'
-                )
-                visualizer.plot_year_comparison(
-                    ranking, ranking2, 
-                    args.year, compare_year, 
-                    comp_path
+                    f'consulta_rbd_{args.year}_vs_{compare_year}.{args.rbd_format}'
                 )
+                write_table(comparison_table, comparison_output, args.rbd_format)
+                print(f"✓ Comparación de {len(rbd_list):,} RBD exportada a: "
+                      f"{comparison_output}")
+            
+            if args.visualize:
+                figure_jobs.append(('plot_year_comparison', {
+                    'year1_df': ranking, 
+                    'year2_df': ranking2,
+                    'year1': args.year, 
+                    'year2': compare_year,
+                    'summary1': summary,
+                    'summary2': analyzer2.get_summary(),
+                    'save_path': os.path.join(
+                        args.output_dir, 
+                        f'comparacion_{args.year}_vs_{compare_year}.png'
+                    )
+                }))
         
         except Exception as e:
             print(f"❌ Error en comparación: {e}")
     
+    if figure_jobs:
+        print(f"\n{'='*60}")
+        print("   GENERANDO VISUALIZACIONES")
+        print(f"{'='*60}\n")
+        
+        # Los gráficos solo se guardan en archivos: no se necesita ventana
+        os.environ.setdefault('MPLBACKEND', 'Agg')
+        from visualizations import PAESVisualizer
+        
+        visualizer = PAESVisualizer(profile=args.plot_profile)
+        visualizer.render_batch(figure_jobs, workers=args.workers)
+    
+    if args.profile:
+        write_profile(analyzers, os.path.join(args.output_dir, f'perfil_paes_{args.year}.json'))
+    
     print(f"\n{'='*60}")
     print("   ✓ ANÁLISIS COMPLETADO")
     print(f"{'='*60}\n")
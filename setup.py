@@ -39,6 +39,7 @@ setup(
     entry_points={
         "console_scripts": [
             "paes-ranking=main:main",
+            "paes-serve=src.server:main",
         ],
     },
     include_package_data=True,
@@ -7,6 +7,14 @@ __author__ = 'Tu Nombre'
 __license__ = 'MIT'
 
 from .paes_analyzer import PAESAnalyzer
-from .visualizations import PAESVisualizer
 
 __all__ = ['PAESAnalyzer', 'PAESVisualizer']
+
+
+def __getattr__(name):
+    # PAESVisualizer se importa solo cuando se usa: matplotlib y seaborn
+    # agregan más de un segundo al inicio de cada ejecución
+    if name == 'PAESVisualizer':
+        from .visualizations import PAESVisualizer
+        return PAESVisualizer
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,141 @@
+"""
+Agregados por establecimiento calculados en una sola pasada
+Conteos, sumas y sumas de cuadrados por RBD para todas las columnas de puntaje
+"""
+
+import pandas as pd
+import numpy as np
+from typing import List, Optional
+
+
+class SchoolAggregates:
+    """
+    Estadísticos suficientes por establecimiento (RBD).
+
+    Guarda, para cada RBD y cada columna de puntaje, el número de valores
+    no nulos, la suma y la suma de cuadrados, además del total de estudiantes.
+    Promedios, desviaciones y rankings se derivan de estos arreglos sin
+    volver a recorrer los datos de estudiantes.
+    """
+
+    def __init__(self, rbd: np.ndarray, sizes: np.ndarray, counts: np.ndarray,
+                 sums: np.ndarray, sumsq: np.ndarray, columns: List[str]):
+        """
+        Inicializa los agregados.
+
+        Args:
+            rbd: Códigos RBD ordenados (n_establecimientos,)
+            sizes: Estudiantes por RBD (n_establecimientos,)
+            counts: Valores no nulos por RBD y columna (n_establecimientos, n_columnas)
+            sums: Suma por RBD y columna
+            sumsq: Suma de cuadrados por RBD y columna
+            columns: Nombres de las columnas de puntaje
+        """
+        self.rbd = rbd
+        self.sizes = sizes
+        self.counts = counts
+        self.sums = sums
+        self.sumsq = sumsq
+        self.columns = list(columns)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: List[str],
+                   key: str = 'RBD', rows: Optional[np.ndarray] = None) -> 'SchoolAggregates':
+        """
+        Calcula los agregados factorizando el RBD una sola vez.
+
+        Args:
+            df: DataFrame a nivel de estudiante
+            columns: Columnas de puntaje a agregar
+            key: Columna del establecimiento
+            rows: Posiciones de las filas a considerar (por defecto, todas).
+                 Cada columna se extrae por separado, sin copiar el DataFrame.
+
+        Returns:
+            SchoolAggregates con una fila por RBD
+        """
+        def column(name):
+            # Se seleccionan las filas antes de convertir a float64
+            values = df[name].array if rows is None else df[name].array.take(rows)
+            return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        keys = df[key] if rows is None else pd.Series(df[key].array.take(rows), copy=False)
+        codes, uniques = pd.factorize(keys, sort=True)
+        n_groups = len(uniques)
+        valid = codes >= 0
+        all_valid = valid.all()
+        if not all_valid:
+            codes = codes[valid]
+
+        sizes = np.bincount(codes, minlength=n_groups)
+        counts = np.zeros((n_groups, len(columns)), dtype=np.int64)
+        sums = np.zeros((n_groups, len(columns)), dtype=np.float64)
+        sumsq = np.zeros((n_groups, len(columns)), dtype=np.float64)
+
+        for j, col in enumerate(columns):
+            values = column(col)
+            if not all_valid:
+                values = values[valid]
+            # Los nulos aportan peso cero en lugar de filtrarse (evita copias)
+            present = ~np.isnan(values)
+            values = np.where(present, values, 0.0)
+            counts[:, j] = np.bincount(codes, weights=present, minlength=n_groups)
+            sums[:, j] = np.bincount(codes, weights=values, minlength=n_groups)
+            sumsq[:, j] = np.bincount(codes, weights=values * values,
+                                      minlength=n_groups)
+
+        return cls(np.asarray(uniques), sizes, counts, sums, sumsq, columns)
+
+    def merge(self, other: 'SchoolAggregates') -> 'SchoolAggregates':
+        """
+        Combina dos agregados (por ejemplo, de bloques distintos de un archivo).
+
+        Args:
+            other: Agregados con las mismas columnas
+
+        Returns:
+            Nuevos agregados con la unión de los RBD
+        """
+        if other.columns != self.columns:
+            raise ValueError("Los agregados deben tener las mismas columnas")
+
+        rbd = np.union1d(self.rbd, other.rbd)
+        merged = SchoolAggregates(
+            rbd,
+            np.zeros(len(rbd), dtype=np.int64),
+            np.zeros((len(rbd), len(self.columns)), dtype=np.int64),
+            np.zeros((len(rbd), len(self.columns)), dtype=np.float64),
+            np.zeros((len(rbd), len(self.columns)), dtype=np.float64),
+            self.columns
+        )
+        for part in (self, other):
+            pos = np.searchsorted(rbd, part.rbd)
+            merged.sizes[pos] += part.sizes
+            merged.counts[pos] += part.counts
+            merged.sums[pos] += part.sums
+            merged.sumsq[pos] += part.sumsq
+        return merged
+
+    @property
+    def index(self) -> pd.Index:
+        """Índice de RBD."""
+        return pd.Index(self.rbd, name='RBD')
+
+    def student_counts(self) -> pd.Series:
+        """Número de estudiantes por RBD."""
+        return pd.Series(self.sizes, index=self.index)
+
+    def means(self) -> pd.DataFrame:
+        """Promedio por RBD y columna (NaN si no hay valores)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values = self.sums / np.where(self.counts > 0, self.counts, np.nan)
+        return pd.DataFrame(values, index=self.index, columns=self.columns)
+
+    def std(self, ddof: int = 1) -> pd.DataFrame:
+        """Desviación estándar por RBD y columna."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            n = np.where(self.counts > ddof, self.counts, np.nan)
+            mean = self.sums / n
+            var = (self.sumsq - n * mean * mean) / (n - ddof)
+        return pd.DataFrame(np.sqrt(np.clip(var, 0, None)),
+                            index=self.index, columns=self.columns)
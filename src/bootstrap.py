@@ -0,0 +1,239 @@
+"""
+Incertidumbre del ranking PAES por bootstrap
+Remuestrea estudiantes dentro de cada RBD con kernels vectorizados (bincount)
+y entrega intervalos de confianza del promedio y rangos probables de posición
+"""
+
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Réplicas por defecto y nivel de confianza de los intervalos
+DEFAULT_REPLICATES = 1000
+DEFAULT_CONFIDENCE = 0.95
+
+# Réplicas por bloque: cada bloque usa su propia semilla derivada, por lo que
+# el resultado no depende del número de procesos
+BLOCK_REPLICATES = 10
+
+# Datos de cada proceso del pool (se envían una sola vez, en el inicializador)
+_worker_scores = None
+
+
+class StudentScores:
+    """
+    Puntajes de estudiantes ordenados por establecimiento, listos para remuestrear.
+
+    Los estudiantes de cada RBD quedan contiguos: un remuestreo dentro del
+    establecimiento es inicio[g] + entero(U * tamaño[g]) para cada estudiante.
+    """
+
+    def __init__(self, rbd: np.ndarray, codes: np.ndarray, values: np.ndarray):
+        """
+        Inicializa los datos (usar from_frame).
+
+        Args:
+            rbd: Códigos RBD ordenados (n_establecimientos,)
+            codes: Índice del establecimiento de cada estudiante, ordenado
+            values: Puntajes (n_estudiantes, n_columnas), NaN si falta
+        """
+        self.rbd = rbd
+        self.codes = codes
+        self.n_groups = len(rbd)
+        self.sizes = np.bincount(codes, minlength=self.n_groups)
+        starts = np.cumsum(self.sizes) - self.sizes
+        self.student_sizes = self.sizes[codes].astype(np.float64)
+        self.student_starts = starts[codes]
+        # Una fila contigua por columna: cada extracción lee memoria seguida
+        present = ~np.isnan(values.T)
+        self.values = np.ascontiguousarray(np.where(present, values.T, 0.0))
+        self.present = [None if mask.all() else mask for mask in present]
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: List[str],
+                   key: str = 'RBD') -> 'StudentScores':
+        """
+        Prepara los puntajes de un DataFrame a nivel de estudiante.
+
+        Args:
+            df: Estudiantes (por ejemplo, egresados regulares)
+            columns: Columnas cuyo promedio simple forma el puntaje del ranking
+            key: Columna del establecimiento
+
+        Returns:
+            StudentScores
+        """
+        codes, uniques = pd.factorize(df[key], sort=True)
+        valid = codes >= 0
+        order = np.argsort(codes[valid], kind='stable')
+        values = np.column_stack([
+            df[col].to_numpy(dtype=np.float64, na_value=np.nan)[valid][order]
+            for col in columns
+        ])
+        return cls(np.asarray(uniques).astype(np.int64), codes[valid][order], values)
+
+    def point_estimate(self) -> np.ndarray:
+        """Puntaje de cada establecimiento con los datos originales."""
+        return self._scores(np.arange(len(self.codes)), 1)[0]
+
+    def _scores(self, index: np.ndarray, n_replicates: int) -> np.ndarray:
+        """
+        Promedio por columna y luego entre columnas, por réplica y RBD.
+
+        Args:
+            index: Estudiantes elegidos (n_replicates, n_estudiantes); el
+                   estudiante i de cada fila pertenece al establecimiento codes[i]
+            n_replicates: Filas de index
+        """
+        n = n_replicates * self.n_groups
+        flat_codes = (self.codes + self.n_groups * np.arange(n_replicates)[:, None]).ravel()
+        flat_index = index.ravel()
+        means = np.empty((len(self.values), n))
+        for j, values in enumerate(self.values):
+            sums = np.bincount(flat_codes, weights=values[flat_index], minlength=n)
+            if self.present[j] is None:
+                # Sin faltantes: el conteo es el tamaño del establecimiento
+                counts = np.tile(self.sizes, n_replicates)
+            else:
+                counts = np.bincount(flat_codes, weights=self.present[j][flat_index],
+                                     minlength=n)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                means[j] = sums / np.where(counts > 0, counts, np.nan)
+        # Igual que el ranking: promedio de las pruebas disponibles
+        with np.errstate(invalid='ignore'):
+            available = (~np.isnan(means)).sum(axis=0)
+            scores = np.nansum(means, axis=0) / np.where(available > 0, available, np.nan)
+        return scores.reshape(n_replicates, self.n_groups)
+
+    def replicate_block(self, n_replicates: int,
+                        seed: np.random.SeedSequence) -> np.ndarray:
+        """
+        Réplicas bootstrap remuestreando estudiantes dentro de cada RBD.
+
+        Args:
+            n_replicates: Número de réplicas del bloque
+            seed: Semilla del bloque
+
+        Returns:
+            Matriz (n_replicates, n_establecimientos) de puntajes
+        """
+        rng = np.random.default_rng(seed)
+        draws = rng.random((n_replicates, len(self.codes)))
+        draws *= self.student_sizes
+        index = draws.astype(np.int32)
+        del draws
+        index += self.student_starts
+        return self._scores(index, n_replicates)
+
+
+def _init_worker(scores: StudentScores):
+    """Inicializador del pool: guarda los puntajes en el proceso."""
+    global _worker_scores
+    _worker_scores = scores
+
+
+def _replicate_block(n_replicates: int, seed: np.random.SeedSequence,
+                     scores: Optional[StudentScores] = None) -> np.ndarray:
+    """Un bloque de réplicas (función de nivel de módulo para el pool)."""
+    scores = scores if scores is not None else _worker_scores
+    return scores.replicate_block(n_replicates, seed).astype(np.float32)
+
+
+def bootstrap_replicates(scores: StudentScores, replicates: int = DEFAULT_REPLICATES,
+                         seed: int = 0, workers: Optional[int] = None) -> np.ndarray:
+    """
+    Calcula las réplicas bootstrap del puntaje de cada establecimiento.
+
+    Args:
+        scores: Puntajes de estudiantes por RBD
+        replicates: Número de réplicas
+        seed: Semilla aleatoria
+        workers: Procesos (por defecto, en este proceso; None o 1 no usan pool)
+
+    Returns:
+        Matriz float32 (replicates, n_establecimientos)
+    """
+    blocks = [min(BLOCK_REPLICATES, replicates - start)
+              for start in range(0, replicates, BLOCK_REPLICATES)]
+    seeds = np.random.SeedSequence(seed).spawn(len(blocks))
+
+    if workers is None or workers <= 1:
+        parts = [_replicate_block(n, s, scores) for n, s in zip(blocks, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, os.cpu_count() or 1),
+                                 initializer=_init_worker,
+                                 initargs=(scores,)) as executor:
+            parts = list(executor.map(_replicate_block, blocks, seeds))
+    return np.vstack(parts)
+
+
+def replicate_ranks(replicates: np.ndarray) -> np.ndarray:
+    """
+    Posición de cada establecimiento en cada réplica (1 = mejor).
+
+    Los empates reciben la menor posición del grupo, como
+    rank(method='min') en create_ranking, de modo que un establecimiento
+    empatado tiene en cada réplica la misma posición que en RANK.
+
+    Args:
+        replicates: Matriz (réplicas, establecimientos) de puntajes
+
+    Returns:
+        Matriz float32 de posiciones (NaN sin puntaje)
+    """
+    # argsort deja los NaN al final
+    order = np.argsort(-replicates, axis=1, kind='stable')
+    ordered = np.take_along_axis(replicates, order, axis=1)
+    # Cada puntaje toma la posición del primero de su grupo de empate
+    columns = np.arange(replicates.shape[1])
+    group_start = np.ones(replicates.shape, dtype=bool)
+    group_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    positions = np.maximum.accumulate(np.where(group_start, columns, 0), axis=1) + 1
+    ranks = np.empty(replicates.shape, dtype=np.float32)
+    np.put_along_axis(ranks, order, positions.astype(np.float32), axis=1)
+    ranks[np.isnan(replicates)] = np.nan
+    return ranks
+
+
+def uncertainty_table(scores: StudentScores, replicates: np.ndarray,
+                      confidence: float = DEFAULT_CONFIDENCE) -> pd.DataFrame:
+    """
+    Intervalos de confianza y rango probable de posición por establecimiento.
+
+    Args:
+        scores: Puntajes de estudiantes por RBD
+        replicates: Réplicas de bootstrap_replicates
+        confidence: Nivel de confianza (por ejemplo, 0.95)
+
+    Returns:
+        DataFrame indexado por RBD con PAES_EE, PAES_IC_INF, PAES_IC_SUP,
+        RANK_IC_INF (mejor posición probable), RANK_IC_SUP (peor) e
+        IC_UN_ESTUDIANTE (True si el establecimiento tiene un solo estudiante:
+        todas las réplicas repiten su puntaje y el intervalo del puntaje no
+        mide su incertidumbre)
+    """
+    tail = (1 - confidence) / 2 * 100
+    quantiles = [tail, 100 - tail]
+    ranks = replicate_ranks(replicates)
+
+    # Establecimientos sin puntaje en todas las réplicas quedan en NaN
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        score_low, score_high = np.nanpercentile(replicates, quantiles, axis=0)
+        rank_low, rank_high = np.nanpercentile(ranks, quantiles, axis=0)
+        std_error = np.nanstd(replicates, axis=0, ddof=1)
+
+    table = pd.DataFrame({
+        'PAES_EE': std_error,
+        'PAES_IC_INF': score_low,
+        'PAES_IC_SUP': score_high,
+        'RANK_IC_INF': np.floor(rank_low),
+        'RANK_IC_SUP': np.ceil(rank_high),
+        'IC_UN_ESTUDIANTE': scores.sizes == 1
+    }, index=pd.Index(scores.rbd, name='RBD'))
+    return table.astype({'RANK_IC_INF': 'Int64', 'RANK_IC_SUP': 'Int64'})
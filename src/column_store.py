@@ -0,0 +1,150 @@
+"""
+Almacén columnar mapeado en memoria de datos de estudiantes PAES
+Cada columna es un archivo binario de ancho fijo; un manifiesto JSON describe
+tipos y filas. Las columnas se abren con np.memmap: sin copia, con arranque
+inmediato y compartidas entre procesos a través del caché de páginas del SO
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Versión del formato del almacén
+STORE_VERSION = 1
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def is_store(path: str) -> bool:
+    """Indica si una ruta es un directorio de almacén columnar."""
+    return os.path.isfile(os.path.join(path, MANIFEST_NAME))
+
+
+def _column_array(values: pd.Series) -> np.ndarray:
+    """
+    Arreglo de ancho fijo para una columna.
+
+    Las categorías numéricas se guardan como sus valores (int32, o float32 si
+    hay nulos); las demás columnas conservan su tipo numérico.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        values = values.astype('float64')
+        if not values.isna().any() and (values % 1 == 0).all():
+            return values.to_numpy(dtype=np.int32)
+        return values.to_numpy(dtype=np.float32)
+    if values.dtype == object:
+        raise ValueError(f"La columna {values.name} no es numérica")
+    return np.ascontiguousarray(values.to_numpy())
+
+
+def write_store(df: pd.DataFrame, output_dir: str, year: int,
+                source: Optional[str] = None, extra: Optional[Dict] = None) -> Dict:
+    """
+    Escribe un DataFrame como almacén columnar.
+
+    Args:
+        df: DataFrame a nivel de estudiante con columnas numéricas o categorías
+            numéricas (por ejemplo, el de load_data(fast=True))
+        output_dir: Directorio del almacén (se crea si no existe)
+        year: Año de la admisión
+        source: Archivo de origen, para el manifiesto
+        extra: Campos adicionales del manifiesto
+
+    Returns:
+        Manifiesto escrito
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    columns = {}
+    for col in df.columns:
+        array = _column_array(df[col])
+        file_name = f"{col}.bin"
+        array.tofile(os.path.join(output_dir, file_name))
+        columns[col] = {'archivo': file_name, 'dtype': array.dtype.str}
+
+    manifest = {
+        'version': STORE_VERSION,
+        'year': year,
+        'filas': len(df),
+        'origen': source,
+        'creado': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'columnas': columns,
+        **(extra or {})
+    }
+    # El manifiesto se escribe al final: un almacén incompleto no se reconoce
+    tmp_path = os.path.join(output_dir, MANIFEST_NAME + '.tmp')
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, os.path.join(output_dir, MANIFEST_NAME))
+    return manifest
+
+
+class ColumnStore:
+    """
+    Almacén columnar abierto con np.memmap.
+
+    Abrirlo solo lee el manifiesto; cada columna se mapea al pedirla y las
+    páginas se leen del disco (o del caché del SO) al accederlas.
+    """
+
+    def __init__(self, path: str):
+        """
+        Abre un almacén.
+
+        Args:
+            path: Directorio con manifest.json y los archivos de columnas
+        """
+        with open(os.path.join(path, MANIFEST_NAME), encoding='utf-8') as f:
+            self.manifest = json.load(f)
+        if self.manifest.get('version') != STORE_VERSION:
+            raise ValueError(f"Versión de almacén no soportada en {path}: "
+                             f"{self.manifest.get('version')} (se espera {STORE_VERSION})")
+        self.path = path
+        self.year = self.manifest['year']
+        self.rows = self.manifest['filas']
+        self.columns = list(self.manifest['columnas'])
+        self._arrays = {}
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Columna mapeada en memoria (solo lectura).
+
+        Args:
+            name: Nombre de la columna
+
+        Returns:
+            np.memmap de largo rows
+        """
+        if name not in self._arrays:
+            if name not in self.manifest['columnas']:
+                raise KeyError(f"Columna no disponible: {name}. Use una de {self.columns}")
+            info = self.manifest['columnas'][name]
+            file_path = os.path.join(self.path, info['archivo'])
+            if self.rows == 0:
+                self._arrays[name] = np.empty(0, dtype=info['dtype'])
+            else:
+                self._arrays[name] = np.memmap(file_path, dtype=info['dtype'],
+                                               mode='r', shape=(self.rows,))
+        return self._arrays[name]
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        DataFrame sobre las columnas mapeadas, sin copiarlas.
+
+        Args:
+            columns: Columnas a incluir (por defecto, todas)
+
+        Returns:
+            DataFrame de solo lectura respaldado por los archivos del almacén
+        """
+        columns = self.columns if columns is None else columns
+        return pd.DataFrame({col: self.column(col) for col in columns}, copy=False)
+
+    def nbytes(self) -> int:
+        """Tamaño total de las columnas en disco."""
+        return sum(np.dtype(info['dtype']).itemsize * self.rows
+                   for info in self.manifest['columnas'].values())
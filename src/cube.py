@@ -0,0 +1,210 @@
+"""
+Cubo de agregación territorial PAES
+Conteos y sumas por nivel (nacional -> región -> comuna -> RBD) calculados una vez
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+
+try:
+    from .aggregates import SchoolAggregates
+except ImportError:
+    from aggregates import SchoolAggregates
+
+
+# Dimensiones del cubo, de la más general a la más específica.
+# Solo se usan las que existen en los datos.
+CUBE_LEVELS = ['CODIGO_REGION', 'CODIGO_COMUNA']
+
+# Dimensiones adicionales (no jerárquicas) si el archivo las incluye
+CUBE_EXTRA_DIMENSIONS = ['GRUPO_DEPENDENCIA']
+
+# Columnas que forman el promedio PAES de cada nivel
+PAES_COLUMNS = ['CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL']
+
+
+def school_attributes(df: pd.DataFrame, key: str = 'RBD') -> Optional[pd.DataFrame]:
+    """
+    Región, comuna y demás dimensiones de cada establecimiento.
+
+    Args:
+        df: DataFrame a nivel de estudiante
+        key: Columna del establecimiento
+
+    Returns:
+        DataFrame indexado por RBD con el primer valor no nulo de cada
+        dimensión disponible (códigos no numéricos quedan como NaN), o None
+        si no hay ninguna
+    """
+    dimensions = [col for col in CUBE_LEVELS + CUBE_EXTRA_DIMENSIONS if col in df.columns]
+    if not dimensions:
+        return None
+    attributes = df.groupby(key, observed=True)[dimensions].first()
+    attributes.index = attributes.index.astype('int64')
+    return attributes.apply(pd.to_numeric, errors='coerce').astype('float64')
+
+
+def _as_codes(values: pd.Series) -> pd.Series:
+    """Códigos territoriales como enteros (nullable) si no tienen decimales."""
+    if (values.dropna() % 1 == 0).all():
+        return values.astype('Int64')
+    return values
+
+
+class AggregationCube:
+    """
+    Conteos y sumas por columna de puntaje en cada nivel territorial.
+
+    El nivel más fino son los agregados por RBD (SchoolAggregates); región,
+    comuna y dependencia se obtienen sumando esos arreglos, sin volver a
+    recorrer los datos de estudiantes. Todas las tablas se calculan al crear
+    el cubo y las consultas solo las leen.
+    """
+
+    def __init__(self, aggregates: SchoolAggregates, attributes: pd.DataFrame):
+        """
+        Construye el cubo.
+
+        Args:
+            aggregates: Agregados por RBD (de filtered_data o por bloques)
+            attributes: Dimensiones por RBD (ver school_attributes)
+        """
+        self.aggregates = aggregates
+        self.columns = list(aggregates.columns)
+        self.attributes = attributes.reindex(aggregates.index)
+        self.dimensions = list(self.attributes.columns)
+        self.schools = self._school_table()
+        self.tables = {'nacional': self._rollup(None)}
+        for dimension in self.dimensions:
+            self.tables[dimension] = self._rollup(dimension)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Optional[List[str]] = None,
+                   key: str = 'RBD') -> 'AggregationCube':
+        """
+        Construye el cubo desde datos de estudiantes ya filtrados.
+
+        Args:
+            df: DataFrame a nivel de estudiante
+            columns: Columnas de puntaje (por defecto, las de PAES_COLUMNS)
+            key: Columna del establecimiento
+
+        Returns:
+            AggregationCube
+        """
+        columns = columns or [col for col in PAES_COLUMNS if col in df.columns]
+        attributes = school_attributes(df, key)
+        if attributes is None:
+            raise ValueError("Los datos no tienen columnas territoriales "
+                             f"({', '.join(CUBE_LEVELS)})")
+        aggregates = SchoolAggregates.from_frame(df, columns, key)
+        aggregates.rbd = aggregates.rbd.astype('int64')
+        return cls(aggregates, attributes)
+
+    def _school_table(self) -> pd.DataFrame:
+        """Nivel RBD: dimensiones, estudiantes, promedios y PAES_PROMEDIO."""
+        means = self.aggregates.means()
+        table = self.attributes.copy()
+        table['N_ESTUDIANTES'] = self.aggregates.sizes
+        for col in self.columns:
+            table[col] = means[col].to_numpy()
+        paes = [col for col in PAES_COLUMNS if col in self.columns]
+        table['PAES_PROMEDIO'] = table[paes].mean(axis=1) if paes else np.nan
+        return table
+
+    def _rollup(self, dimension: Optional[str]) -> pd.DataFrame:
+        """
+        Suma los agregados por RBD dentro de cada valor de una dimensión.
+
+        Los promedios por prueba se ponderan por estudiante (suma / conteo);
+        PAES_PROMEDIO_ESTABLECIMIENTOS es el promedio simple de los
+        establecimientos (metodología, sección 7.1).
+        """
+        if dimension is None:
+            codes = np.zeros(len(self.schools), dtype=np.intp)
+            keys = pd.Index(['nacional'], name='NIVEL')
+        else:
+            codes, keys = pd.factorize(self.attributes[dimension], sort=True)
+            keys = pd.Index(keys, name=dimension)
+        valid = codes >= 0
+        codes = codes[valid]
+        n = len(keys)
+
+        counts = self.aggregates.counts[valid]
+        sums = self.aggregates.sums[valid]
+        table = pd.DataFrame(index=keys)
+        table['N_ESTABLECIMIENTOS'] = np.bincount(codes, minlength=n)
+        table['N_ESTUDIANTES'] = np.bincount(codes, weights=self.aggregates.sizes[valid],
+                                             minlength=n).astype('int64')
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for j, col in enumerate(self.columns):
+                total = np.bincount(codes, weights=counts[:, j], minlength=n)
+                table[col] = np.bincount(codes, weights=sums[:, j], minlength=n) / total
+
+        paes = [col for col in PAES_COLUMNS if col in self.columns]
+        table['PAES_PROMEDIO'] = table[paes].mean(axis=1) if paes else np.nan
+
+        school_paes = self.schools['PAES_PROMEDIO'].to_numpy()[valid]
+        ranked = ~np.isnan(school_paes)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            table['PAES_PROMEDIO_ESTABLECIMIENTOS'] = (
+                np.bincount(codes[ranked], weights=school_paes[ranked], minlength=n)
+                / np.bincount(codes[ranked], minlength=n)
+            )
+        return table
+
+    def rollup(self, level: str = 'CODIGO_REGION') -> pd.DataFrame:
+        """
+        Tabla agregada de un nivel.
+
+        Args:
+            level: 'nacional', 'CODIGO_REGION', 'CODIGO_COMUNA' u otra dimensión
+
+        Returns:
+            DataFrame con N_ESTABLECIMIENTOS, N_ESTUDIANTES, promedio por prueba,
+            PAES_PROMEDIO y PAES_PROMEDIO_ESTABLECIMIENTOS, ordenado por PAES_PROMEDIO
+        """
+        if level not in self.tables:
+            raise KeyError(f"Nivel no disponible: {level}. Use uno de {list(self.tables)}")
+        table = (self.tables[level]
+                 .sort_values('PAES_PROMEDIO', ascending=False)
+                 .reset_index())
+        if level != 'nacional':
+            table[level] = _as_codes(table[level])
+        return table
+
+    def national(self) -> Dict:
+        """Totales y promedios nacionales."""
+        return self.tables['nacional'].iloc[0].to_dict()
+
+    def ranking_within(self, level: str = 'CODIGO_REGION') -> pd.DataFrame:
+        """
+        Ranking de cada establecimiento dentro de su región (o comuna).
+
+        Args:
+            level: Dimensión dentro de la cual se rankea
+
+        Returns:
+            DataFrame por RBD con la dimensión, PAES_PROMEDIO, RANK_{level},
+            TOTAL_{level} y PERCENTIL_{level}, ordenado por dimensión y ranking
+        """
+        if level not in self.dimensions:
+            raise KeyError(f"Nivel no disponible: {level}. Use uno de {self.dimensions}")
+
+        table = self.schools[[level, 'N_ESTUDIANTES', 'PAES_PROMEDIO']].dropna()
+        groups = table.groupby(level)['PAES_PROMEDIO']
+        rank = groups.rank(method='min', ascending=False).astype('int64')
+        total = groups.transform('size')
+
+        result = table.assign(**{
+            f'RANK_{level}': rank,
+            f'TOTAL_{level}': total,
+            f'PERCENTIL_{level}': ((1 - rank / total) * 100).round(1)
+        })
+        result = (result
+                  .reset_index()
+                  .sort_values([level, f'RANK_{level}', 'RBD'])
+                  .reset_index(drop=True))
+        result[level] = _as_codes(result[level])
+        return result
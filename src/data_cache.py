@@ -0,0 +1,236 @@
+"""
+Caché columnar de archivos ArchivoC ya procesados
+Guarda el DataFrame leído en formato Parquet para reutilizarlo en cargas posteriores
+"""
+
+import os
+import glob
+import hashlib
+import json
+import pandas as pd
+from typing import Dict, Optional
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+try:
+    from .data_source import split_source
+except ImportError:
+    from data_source import split_source
+
+
+# Directorio de caché por defecto, creado junto al archivo de datos
+DEFAULT_CACHE_DIRNAME = '.paes_cache'
+
+# Directorio de caché cuando el del archivo de datos no admite escritura
+USER_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'paes_ranking'
+)
+
+# Tamaño de los bloques leídos para el hash de contenido
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def cache_available() -> bool:
+    """Indica si el caché puede usarse (requiere pyarrow)."""
+    return pyarrow is not None
+
+
+def content_hash(file_path: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Hash de todo el contenido de un archivo en disco, recalculado solo si
+    cambian su tamaño o su fecha de modificación.
+
+    El último hash de cada archivo se guarda junto a su tamaño y fecha en
+    un archivo .hash.json del directorio de caché. Mientras ambos coincidan,
+    el hash se reutiliza sin leer el archivo; si cambian, se lee completo,
+    de modo que un archivo solo 'tocado' conserva su caché y uno editado no.
+
+    Args:
+        file_path: Ruta al archivo en disco (sin miembro)
+        cache_dir: Directorio de caché (por defecto default_cache_dir)
+
+    Returns:
+        Hash hexadecimal
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir(file_path)
+    stat = os.stat(file_path)
+    memo_path = os.path.join(cache_dir, f"{_entry_name(file_path)}.hash.json")
+    try:
+        with open(memo_path, encoding='utf-8') as f:
+            memo = json.load(f)
+        if memo['tamano'] == stat.st_size and memo['mtime_ns'] == stat.st_mtime_ns:
+            return memo['hash']
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    value = digest.hexdigest()
+
+    tmp_path = f"{memo_path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'tamano': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+                       'hash': value}, f)
+        os.replace(tmp_path, memo_path)
+    except OSError:
+        # Sin directorio de caché escribible el hash se recalcula cada vez
+        pass
+    return value
+
+
+def file_fingerprint(file_path: str, schema_key: str, year: Optional[int] = None,
+                     renames: Optional[Dict[str, str]] = None,
+                     cache_dir: Optional[str] = None) -> str:
+    """
+    Calcula la huella de un archivo de datos.
+
+    Combina el tamaño, el hash del contenido (ver content_hash), el miembro
+    del .zip, el año, los renombres de columnas y la versión del esquema del
+    lector. Para archivos comprimidos se usa el archivo en disco, sin
+    descomprimir.
+
+    Args:
+        file_path: Ruta al archivo de datos; para .zip, con el miembro ya
+                  elegido (ver data_source.resolve_source)
+        schema_key: Identificador del modo de carga y versión del esquema
+        year: Año de la admisión
+        renames: Nombre en el archivo -> nombre canónico aplicados al cargar
+        cache_dir: Directorio de caché (por defecto default_cache_dir)
+
+    Returns:
+        Huella hexadecimal
+    """
+    file_path, member = split_source(file_path)
+    renamed = ','.join(f"{old}>{new}" for old, new in sorted((renames or {}).items()))
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{os.path.getsize(file_path)}:{schema_key}:{member}:{year}:"
+                  f"{renamed}:{content_hash(file_path, cache_dir)}".encode())
+    return digest.hexdigest()
+
+
+def _entry_name(file_path: str) -> str:
+    """Nombre base de las entradas de un archivo: nombre y hash de la ruta absoluta."""
+    file_path, member = split_source(file_path)
+    source = os.path.abspath(file_path)
+    base = os.path.basename(file_path)
+    if member is not None:
+        source = f"{source}::{member}"
+        base = f"{base}-{os.path.basename(member)}"
+    source_key = hashlib.blake2b(source.encode(), digest_size=6).hexdigest()
+    return f"{base}-{source_key}"
+
+
+def default_cache_dir(file_path: str) -> str:
+    """
+    Directorio de caché por defecto de un archivo de datos.
+
+    Es .paes_cache junto al archivo si ese directorio admite escritura y,
+    si no (datos de solo lectura), USER_CACHE_DIR.
+
+    Args:
+        file_path: Ruta al archivo de datos (sin miembro)
+
+    Returns:
+        Ruta del directorio de caché
+    """
+    data_dir = os.path.dirname(os.path.abspath(file_path))
+    local_dir = os.path.join(data_dir, DEFAULT_CACHE_DIRNAME)
+    if os.access(local_dir if os.path.isdir(local_dir) else data_dir, os.W_OK):
+        return local_dir
+    return USER_CACHE_DIR
+
+
+def cache_path(file_path: str, fingerprint: str, schema_key: str,
+               cache_dir: Optional[str] = None) -> str:
+    """
+    Ruta del archivo de caché para una huella dada.
+
+    El nombre incluye un hash de la ruta absoluta del archivo, de modo que
+    archivos con el mismo nombre en distintos directorios no comparten
+    entradas aunque usen el mismo cache_dir.
+
+    Args:
+        file_path: Ruta al archivo de datos (para .zip, con el miembro ya elegido)
+        fingerprint: Huella calculada con file_fingerprint
+        schema_key: Identificador del modo de carga y versión del esquema
+        cache_dir: Directorio de caché (por defecto default_cache_dir)
+
+    Returns:
+        Ruta del archivo Parquet
+    """
+    if cache_dir is None:
+        cache_dir = default_cache_dir(split_source(file_path)[0])
+    return os.path.join(cache_dir,
+                        f"{_entry_name(file_path)}.{schema_key}.{fingerprint}.parquet")
+
+
+def read_cache(path: str) -> Optional[pd.DataFrame]:
+    """
+    Lee un DataFrame desde el caché.
+
+    Args:
+        path: Ruta del archivo Parquet
+
+    Returns:
+        DataFrame o None si no existe o no se puede leer
+    """
+    if not cache_available() or not os.path.exists(path):
+        return None
+    try:
+        return pd.read_parquet(path)
+    except Exception as e:
+        print(f"⚠ Caché ilegible, se reconstruirá: {e}")
+        return None
+
+
+def write_cache(df: pd.DataFrame, path: str) -> bool:
+    """
+    Escribe un DataFrame en el caché y elimina versiones anteriores del mismo archivo.
+
+    Si el directorio de caché no se puede crear o escribir, se informa y el
+    análisis continúa sin caché.
+
+    Args:
+        df: DataFrame a guardar
+        path: Ruta del archivo Parquet (de cache_path)
+
+    Returns:
+        True si el caché se escribió correctamente
+    """
+    if not cache_available():
+        return False
+
+    cache_dir = os.path.dirname(path)
+    tmp_path = path + '.tmp'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+
+        # Las entradas obsoletas del mismo archivo (misma ruta absoluta) y
+        # modo de carga se descartan
+        source_name = os.path.basename(path).rsplit('.', 2)[0]
+        for old in glob.glob(os.path.join(glob.escape(cache_dir),
+                                          glob.escape(source_name) + '.*.parquet')):
+            if old != path:
+                os.remove(old)
+
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        if os.path.exists(tmp_path):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+        print(f"⚠ No se pudo escribir el caché, se continúa sin él: {e}")
+        return False
+
+    return True
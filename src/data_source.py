@@ -0,0 +1,180 @@
+"""
+Fuentes de datos PAES comprimidas
+Abre archivos ArchivoC en .csv, .gz, .bz2, .zst o dentro de un .zip,
+descomprimiendo en streaming hacia el lector CSV (sin archivos temporales)
+"""
+
+import bz2
+import gzip
+import os
+import zipfile
+from contextlib import contextmanager
+from typing import IO, Optional, Tuple, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+# Separador para indicar el archivo dentro de un .zip: 'datos.zip::ArchivoC_Adm2025.csv'
+MEMBER_SEPARATOR = '::'
+
+# Extensiones reconocidas como datos dentro de un .zip
+DATA_EXTENSIONS = ('.csv', '.txt')
+
+# Extensión -> formato de compresión
+COMPRESSIONS = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.zst': 'zstd',
+    '.zip': 'zip'
+}
+
+
+def split_source(file_path: str) -> Tuple[str, Optional[str]]:
+    """
+    Separa la ruta del archivo y el miembro del .zip, si se indicó.
+
+    Args:
+        file_path: Ruta, opcionalmente con '::miembro' para archivos .zip
+
+    Returns:
+        Tupla (ruta en disco, miembro o None)
+    """
+    if MEMBER_SEPARATOR in file_path:
+        path, member = file_path.split(MEMBER_SEPARATOR, 1)
+        return path, member or None
+    return file_path, None
+
+
+def compression(file_path: str) -> Optional[str]:
+    """
+    Formato de compresión según la extensión del archivo.
+
+    Args:
+        file_path: Ruta al archivo de datos
+
+    Returns:
+        'gzip', 'bz2', 'zstd', 'zip' o None si no está comprimido
+    """
+    path, _ = split_source(file_path)
+    return COMPRESSIONS.get(os.path.splitext(path)[1].lower())
+
+
+def zip_member(archive: zipfile.ZipFile, member: Optional[str] = None,
+               year: Optional[int] = None) -> str:
+    """
+    Elige el archivo de datos dentro de un .zip.
+
+    Sin miembro explícito se consideran los archivos .csv/.txt; si hay más de
+    uno, se prefiere el que contiene 'ArchivoC' y el año en su nombre.
+
+    Args:
+        archive: Archivo .zip abierto
+        member: Nombre (o nombre base) del archivo dentro del .zip
+        year: Año de la admisión, para desempatar entre varios archivos
+
+    Returns:
+        Nombre completo del miembro
+    """
+    names = [name for name in archive.namelist()
+             if not name.endswith('/') and not name.startswith('__MACOSX/')]
+
+    if member is not None:
+        matches = [name for name in names
+                   if name == member or os.path.basename(name) == member]
+        if not matches:
+            raise ValueError(f"'{member}' no existe en {archive.filename}. "
+                             f"Archivos disponibles: {', '.join(names)}")
+        return matches[0]
+
+    candidates = [name for name in names if name.lower().endswith(DATA_EXTENSIONS)]
+    if len(candidates) > 1:
+        candidates = [name for name in candidates
+                      if 'archivoc' in os.path.basename(name).lower()] or candidates
+    if len(candidates) > 1 and year is not None:
+        candidates = [name for name in candidates
+                      if str(year) in os.path.basename(name)] or candidates
+
+    if len(candidates) != 1:
+        available = ', '.join(candidates or names)
+        raise ValueError(f"No se pudo elegir el archivo de datos en {archive.filename} "
+                         f"({available}). Indíquelo como "
+                         f"'{archive.filename}{MEMBER_SEPARATOR}<archivo>'")
+    return candidates[0]
+
+
+def resolve_source(file_path: str, year: Optional[int] = None) -> str:
+    """
+    Ruta con el miembro del .zip ya elegido (ver zip_member).
+
+    Así dos años dentro del mismo .zip se identifican por separado, por
+    ejemplo en el caché.
+
+    Args:
+        file_path: Ruta al archivo de datos (opcionalmente 'ruta.zip::miembro')
+        year: Año de la admisión, para elegir el archivo dentro de un .zip
+
+    Returns:
+        'ruta.zip::miembro' para archivos .zip; la misma ruta en otro caso
+    """
+    path, member = split_source(file_path)
+    if compression(path) != 'zip':
+        return file_path
+    with zipfile.ZipFile(path) as archive:
+        return f"{path}{MEMBER_SEPARATOR}{zip_member(archive, member, year)}"
+
+
+def _open_zstd(path: str) -> IO[bytes]:
+    """Abre un archivo .zst como flujo descomprimido."""
+    if zstandard is not None:
+        raw = open(path, 'rb')
+        # closefd: cerrar el lector también cierra el archivo
+        return zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    try:
+        from compression import zstd  # Python >= 3.14
+    except ImportError:
+        raise ImportError("Para leer archivos .zst instale zstandard: "
+                          "pip install zstandard") from None
+    return zstd.open(path, 'rb')
+
+
+@contextmanager
+def open_source(file_path: str, year: Optional[int] = None) -> Union[str, IO[bytes]]:
+    """
+    Abre una fuente de datos para pd.read_csv.
+
+    Los archivos sin comprimir se entregan como ruta, para que pandas y
+    pyarrow los lean directamente. Los comprimidos se entregan como un flujo
+    binario que se descomprime a medida que el lector avanza, por lo que
+    también sirven para la lectura por bloques (chunksize).
+
+    Args:
+        file_path: Ruta a .csv, .gz, .bz2, .zst o .zip (opcionalmente 'ruta.zip::miembro')
+        year: Año de la admisión, para elegir el archivo dentro de un .zip
+
+    Yields:
+        Ruta o flujo binario
+    """
+    path, member = split_source(file_path)
+    kind = compression(path)
+
+    if kind is None:
+        yield path
+        return
+
+    if kind == 'zip':
+        with zipfile.ZipFile(path) as archive:
+            with archive.open(zip_member(archive, member, year)) as stream:
+                yield stream
+        return
+
+    if kind == 'gzip':
+        stream = gzip.open(path, 'rb')
+    elif kind == 'bz2':
+        stream = bz2.open(path, 'rb')
+    else:
+        stream = _open_zstd(path)
+    with stream:
+        yield stream
@@ -0,0 +1,197 @@
+"""
+Instrumentación de etapas del análisis PAES
+Mide tiempo de reloj, tiempo de CPU, filas y memoria de cada etapa y los envía a sinks
+"""
+
+import functools
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# Un sink es cualquier función que recibe el registro de una etapa
+Sink = Callable[[Dict], None]
+
+_PROC_STATUS = '/proc/self/status'
+
+
+def _read_proc_status() -> Optional[Dict[str, float]]:
+    """RSS actual y pico (VmRSS, VmHWM) en MB desde /proc (solo Linux)."""
+    try:
+        with open(_PROC_STATUS) as f:
+            values = {}
+            for line in f:
+                if line.startswith(('VmRSS:', 'VmHWM:')):
+                    key, value = line.split(':', 1)
+                    values[key] = int(value.split()[0]) / 1024
+            return values if len(values) == 2 else None
+    except OSError:
+        return None
+
+
+def current_memory() -> Dict[str, Optional[float]]:
+    """
+    Memoria residente del proceso.
+
+    Returns:
+        Diccionario con 'rss_mb' (actual, None si no está disponible) y
+        'rss_pico_mb' (pico del proceso)
+    """
+    status = _read_proc_status()
+    if status is not None:
+        return {'rss_mb': status['VmRSS'], 'rss_pico_mb': status['VmHWM']}
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+        return {'rss_mb': None, 'rss_pico_mb': peak / divisor}
+    return {'rss_mb': None, 'rss_pico_mb': None}
+
+
+@contextmanager
+def measure_stage(stage: str):
+    """
+    Mide una etapa: tiempo de reloj, tiempo de CPU y memoria.
+
+    Solo lee contadores del proceso, sin modificarlos, por lo que las etapas
+    pueden anidarse y medirse desde varios hilos. 'memoria_delta_mb' es la
+    memoria al terminar menos la del inicio. 'memoria_pico_delta_mb' es el
+    pico menos la memoria al inicio, y solo se informa si la etapa elevó el
+    pico del proceso (si no, el pico de la etapa no se puede conocer).
+
+    Args:
+        stage: Nombre de la etapa
+
+    Yields:
+        Diccionario del registro, completado al salir del bloque
+    """
+    record = {'etapa': stage}
+    start_memory = current_memory()
+    start_wall = time.perf_counter()
+    start_cpu = time.process_time()
+    try:
+        yield record
+    finally:
+        wall = time.perf_counter() - start_wall
+        cpu = time.process_time() - start_cpu
+        end_memory = current_memory()
+
+        start_rss, end_rss = start_memory['rss_mb'], end_memory['rss_mb']
+        start_peak, peak = start_memory['rss_pico_mb'], end_memory['rss_pico_mb']
+        new_peak = (peak is not None and start_peak is not None and peak > start_peak)
+        record.update({
+            'segundos': round(wall, 4),
+            'cpu_segundos': round(cpu, 4),
+            'rss_inicio_mb': None if start_rss is None else round(start_rss, 1),
+            'rss_pico_mb': None if peak is None else round(peak, 1),
+            'memoria_delta_mb': (
+                round(end_rss - start_rss, 1)
+                if start_rss is not None and end_rss is not None else None
+            ),
+            'memoria_pico_delta_mb': (
+                round(peak - start_rss, 1) if new_peak and start_rss is not None else None
+            )
+        })
+
+
+def instrumented(stage: str, rows_in: Optional[Callable] = None,
+                 rows_out: Optional[Callable] = None):
+    """
+    Decorador para métodos de PAESAnalyzer que emite un registro por llamada.
+
+    Args:
+        stage: Nombre de la etapa
+        rows_in: Función (analizador) -> filas de entrada, evaluada al terminar
+        rows_out: Función (analizador, resultado) -> filas de salida
+                  (por defecto, len del resultado)
+
+    Returns:
+        Decorador
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            with measure_stage(stage) as record:
+                result = method(self, *args, **kwargs)
+
+            record['year'] = self.year
+            record['filas_entrada'] = rows_in(self) if rows_in else None
+            if rows_out is not None:
+                record['filas_salida'] = rows_out(self, result)
+            else:
+                record['filas_salida'] = len(result) if hasattr(result, '__len__') else None
+            self._emit_stage(record)
+            return result
+        return wrapper
+    return decorator
+
+
+def logging_sink(logger: Optional[logging.Logger] = None,
+                 level: int = logging.INFO) -> Sink:
+    """
+    Sink que escribe cada registro en un logger.
+
+    Args:
+        logger: Logger de destino (por defecto 'paes_ranking')
+        level: Nivel de logging
+
+    Returns:
+        Sink
+    """
+    logger = logger or logging.getLogger('paes_ranking')
+
+    def sink(record: Dict):
+        logger.log(level, "etapa=%s year=%s segundos=%.4f cpu=%.4f filas=%s->%s "
+                          "memoria_delta_mb=%s memoria_pico_delta_mb=%s",
+                   record['etapa'], record.get('year'), record['segundos'],
+                   record['cpu_segundos'], record.get('filas_entrada'),
+                   record.get('filas_salida'), record.get('memoria_delta_mb'),
+                   record.get('memoria_pico_delta_mb'))
+    return sink
+
+
+class JSONLinesSink:
+    """
+    Sink que agrega cada registro como una línea JSON a un archivo.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Ruta del archivo .jsonl
+        """
+        self.path = path
+
+    def __call__(self, record: Dict):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+
+def format_report(records: List[Dict]) -> str:
+    """
+    Tabla de texto con los registros de etapas.
+
+    Args:
+        records: Registros emitidos por las etapas
+
+    Returns:
+        Texto del reporte
+    """
+    lines = [f"{'Etapa':<28}{'Año':>6}{'Seg':>10}{'CPU':>10}"
+             f"{'Filas entrada':>15}{'Filas salida':>14}{'Δ Mem MB':>10}{'Δ Pico MB':>11}"]
+    for r in records:
+        rows_in = '' if r.get('filas_entrada') is None else f"{r['filas_entrada']:,}"
+        rows_out = '' if r.get('filas_salida') is None else f"{r['filas_salida']:,}"
+        delta = '' if r.get('memoria_delta_mb') is None else r['memoria_delta_mb']
+        peak = '' if r.get('memoria_pico_delta_mb') is None else r['memoria_pico_delta_mb']
+        lines.append(f"{r['etapa']:<28}{r.get('year', ''):>6}{r['segundos']:>10.3f}"
+                     f"{r['cpu_segundos']:>10.3f}{rows_in:>15}{rows_out:>14}{delta:>10}"
+                     f"{peak:>11}")
+    return '\n'.join(lines)
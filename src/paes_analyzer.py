@@ -3,45 +3,596 @@ PAES Analyzer - Módulo principal para análisis de resultados PAES
 Analiza los resultados de la Prueba de Acceso a la Educación Superior en Chile
 """
 
+import gc
+import sys
 import pandas as pd
 import numpy as np
 from typing import Optional, List, Dict
+import time
 import warnings
 warnings.filterwarnings('ignore')
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from . import data_cache
+    from .column_store import ColumnStore, is_store, write_store
+    from .aggregates import SchoolAggregates
+    from .bootstrap import (DEFAULT_CONFIDENCE, DEFAULT_REPLICATES, StudentScores,
+                            bootstrap_replicates, uncertainty_table)
+    from .cube import CUBE_LEVELS, CUBE_EXTRA_DIMENSIONS, AggregationCube, school_attributes
+    from .data_source import open_source, resolve_source
+    from .instrumentation import Sink, current_memory, instrumented
+    from .quantiles import DEFAULT_QUANTILES, QuantileSketch
+    from .ranking_store import RankingStore
+    from .scenarios import Scenario, rank_scenarios
+    from .schema import SAMPLE_ROWS, validate_source
+    from .summary import RankingSummary
+except ImportError:
+    import data_cache
+    from column_store import ColumnStore, is_store, write_store
+    from aggregates import SchoolAggregates
+    from bootstrap import (DEFAULT_CONFIDENCE, DEFAULT_REPLICATES, StudentScores,
+                           bootstrap_replicates, uncertainty_table)
+    from cube import CUBE_LEVELS, CUBE_EXTRA_DIMENSIONS, AggregationCube, school_attributes
+    from data_source import open_source, resolve_source
+    from instrumentation import Sink, current_memory, instrumented
+    from quantiles import DEFAULT_QUANTILES, QuantileSketch
+    from ranking_store import RankingStore
+    from scenarios import Scenario, rank_scenarios
+    from schema import SAMPLE_ROWS, validate_source
+    from summary import RankingSummary
+
+
+# Columnas de puntaje estándar PAES
+SCORE_COLUMNS = [
+    'CLEC_REG_ACTUAL',
+    'MATE1_REG_ACTUAL',
+    'MATE2_REG_ACTUAL',
+    'HCSOC_REG_ACTUAL',
+    'CIEN_REG_ACTUAL'
+]
+
+# Nombre corto de cada prueba en el ranking por asignatura
+SUBJECT_NAMES = {col: col.split('_')[0] for col in SCORE_COLUMNS}
+
+# Columnas territoriales que se guardan por establecimiento
+CUBE_DIMENSIONS = CUBE_LEVELS + CUBE_EXTRA_DIMENSIONS
+
+# Columnas que componen el promedio PAES del ranking
+PAES_COLUMNS = ['CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL']
+
+# Esquema declarado para la carga rápida (columna -> dtype).
+# Incrementar SCHEMA_VERSION cada vez que cambie el esquema.
+SCHEMA_VERSION = 3
+FAST_SCHEMA = {
+    'RBD': 'int32',
+    'SITUACION_EGRESO': 'uint8',
+    'CODIGO_REGION': 'category',
+    'CODIGO_COMUNA': 'category',
+    'GRUPO_DEPENDENCIA': 'category',
+    **{col: 'float32' for col in SCORE_COLUMNS}
+}
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Memoria residente máxima del proceso en MB (None si no está disponible)."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS reporta bytes
+    divisor = 1024 ** 2 if sys.platform == 'darwin' else 1024
+    return round(peak / divisor, 1)
+
+
+def read_header(file_path: str, year: Optional[int] = None) -> pd.Index:
+    """
+    Columnas de un archivo ArchivoC (comprimido o no), sin leer los datos.
+    
+    Args:
+        file_path: Ruta al archivo (ver data_source.open_source)
+        year: Año de la admisión, para elegir el archivo dentro de un .zip
+        
+    Returns:
+        Nombres de columnas
+    """
+    with open_source(file_path, year) as source:
+        return pd.read_csv(source, sep=';', nrows=0).columns
+
+
+def read_typed_csv(file_path: str, engine: str = 'c', year: Optional[int] = None,
+                   renames: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+    """
+    Lee un archivo ArchivoC usando solo las columnas de FAST_SCHEMA.
+    
+    Args:
+        file_path: Ruta al archivo CSV (también .gz, .bz2, .zst o .zip)
+        engine: Motor de lectura de pandas ('c' o 'pyarrow')
+        year: Año de la admisión, para elegir el archivo dentro de un .zip
+        renames: Nombre en el archivo -> nombre canónico (ver schema.column_renames)
+        
+    Returns:
+        DataFrame con tipos compactos
+    """
+    renames = renames or {}
+    header = read_header(file_path, year)
+    usecols = [col for col in header if renames.get(col, col) in FAST_SCHEMA]
+    dtype = {col: FAST_SCHEMA[renames.get(col, col)] for col in usecols}
+    
+    try:
+        with open_source(file_path, year) as source:
+            df = pd.read_csv(source, sep=';', usecols=usecols, dtype=dtype, engine=engine)
+    except ValueError:
+        # Columnas enteras con valores faltantes: se leen con el tipo entero
+        # nullable equivalente (Int32, UInt8) y solo las que tienen faltantes
+        # lo conservan; las demás vuelven a su tipo compacto
+        integer_dtype = {col: t for col, t in dtype.items() if t.startswith(('int', 'uint'))}
+        nullable = {col: ('UInt' + t[4:] if t.startswith('uint') else 'Int' + t[3:])
+                    for col, t in integer_dtype.items()}
+        with open_source(file_path, year) as source:
+            df = pd.read_csv(source, sep=';', usecols=usecols,
+                             dtype={**dtype, **nullable}, engine=engine)
+        complete = {col: t for col, t in integer_dtype.items() if not df[col].hasnans}
+        if complete:
+            df = df.astype(complete)
+    
+    if renames:
+        df = df.rename(columns=renames)
+    
+    # El motor C deja las categorías como texto; se normalizan a números y
+    # los códigos no numéricos quedan como faltantes (como en streaming)
+    for col in df.select_dtypes('category').columns:
+        categories = pd.to_numeric(df[col].cat.categories, errors='coerce')
+        invalid = categories.isna()
+        if invalid.any():
+            df[col] = df[col].cat.remove_categories(df[col].cat.categories[invalid])
+            categories = categories[~invalid]
+        if not categories.duplicated().any():
+            df[col] = df[col].cat.rename_categories(categories)
+    
+    return df
+
+
+def build_ranking(school_means: pd.DataFrame, student_counts: pd.Series) -> pd.DataFrame:
+    """
+    Construye el ranking a partir de los promedios por establecimiento.
+    
+    Args:
+        school_means: Promedios de PAES_COLUMNS indexados por RBD
+        student_counts: Número de estudiantes por RBD
+        
+    Returns:
+        DataFrame con el ranking ordenado
+    """
+    ranking_df = school_means.copy()
+    
+    # Calcular promedio entre ambas pruebas
+    ranking_df['PAES_PROMEDIO'] = ranking_df.mean(axis=1)
+    
+    # Agregar información adicional
+    ranking_df['N_ESTUDIANTES'] = student_counts
+    
+    # Crear ranking
+    ranking_df['RANK'] = ranking_df['PAES_PROMEDIO'].rank(
+        ascending=False, 
+        method='min'
+    )
+    
+    # Ordenar y resetear índice
+    return (
+        ranking_df
+        .sort_values('PAES_PROMEDIO', ascending=False)
+        .reset_index()
+    )
+
+
+def build_subject_ranking(aggregates: SchoolAggregates, min_students: int = 1) -> pd.DataFrame:
+    """
+    Ranking de los establecimientos en cada prueba, en una sola pasada.
+    
+    Todas las pruebas se rankean juntas sobre la matriz de promedios por RBD.
+    Como las pruebas electivas tienen distinta participación, cada prueba 
+    tiene su propio N y su propio total de establecimientos rankeados.
+    
+    Args:
+        aggregates: Agregados por RBD con las columnas de puntaje
+        min_students: Mínimo de estudiantes con puntaje en la prueba para 
+                     rankear al establecimiento en ella
+        
+    Returns:
+        DataFrame por RBD con N_ESTUDIANTES y, por prueba, el promedio, 
+        N_{prueba}, RANK_{prueba} y PERCENTIL_{prueba}
+    """
+    means = aggregates.means()
+    eligible = (aggregates.counts >= max(min_students, 1)) & means.notna().to_numpy()
+    ranks = means.where(eligible).rank(ascending=False, method='min')
+    totals = eligible.sum(axis=0)
+    
+    result = pd.DataFrame({'N_ESTUDIANTES': aggregates.sizes}, index=means.index)
+    for j, col in enumerate(aggregates.columns):
+        name = SUBJECT_NAMES.get(col, col)
+        result[col] = means[col]
+        result[f'N_{name}'] = aggregates.counts[:, j]
+        result[f'RANK_{name}'] = ranks[col].astype('Int64')
+        result[f'PERCENTIL_{name}'] = ((1 - ranks[col] / totals[j]) * 100).round(1)
+    return result.reset_index()
+
+
+def trend_labels(score_change) -> np.ndarray:
+    """
+    Etiqueta de tendencia para cada cambio de puntaje.
+    
+    Args:
+        score_change: Serie o arreglo de cambios de puntaje
+        
+    Returns:
+        Arreglo con 'mejora', 'baja', 'estable' o None si falta el dato
+    """
+    score_change = np.asarray(score_change, dtype=np.float64)
+    return np.select(
+        [score_change > 0, score_change < 0, score_change == 0],
+        ['mejora', 'baja', 'estable'],
+        default=None
+    )
+
+
+def compare_rankings(rankings: Dict[int, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Compara todos los establecimientos entre dos o más años en una sola operación.
+    
+    Los rankings se unen por RBD. Para cada año se incluyen ranking, promedio,
+    número de estudiantes y presencia; para cada año desde el segundo, el cambio
+    respecto del año anterior. Los cambios globales comparan el último año con
+    el primero. Como en compare_years, todo cambio es año posterior menos año
+    anterior (cambio_ranking negativo = subió en el ranking).
+    
+    Args:
+        rankings: Diccionario año -> DataFrame de ranking
+        
+    Returns:
+        DataFrame con una fila por RBD presente en al menos un año
+    """
+    if len(rankings) < 2:
+        raise ValueError("Se requieren al menos dos rankings para comparar")
+    
+    years = sorted(rankings)
+    columns = {'RANK': 'rank', 'PAES_PROMEDIO': 'paes_promedio', 
+               'N_ESTUDIANTES': 'n_estudiantes'}
+    
+    result = pd.concat(
+        [
+            rankings[year]
+            .set_index('RBD')[list(columns)]
+            .rename(columns=lambda col: f"{columns[col]}_{year}")
+            for year in years
+        ],
+        axis=1,
+        join='outer'
+    )
+    result = result.sort_index()
+    result.index.name = 'rbd'
+    
+    for year in years:
+        result[f'presente_{year}'] = result[f'rank_{year}'].notna()
+        result[f'rank_{year}'] = result[f'rank_{year}'].astype('Int64')
+        result[f'n_estudiantes_{year}'] = result[f'n_estudiantes_{year}'].astype('Int64')
+    
+    # Igual que compare_years, los cambios se calculan sobre promedios redondeados
+    rounded = {year: result[f'paes_promedio_{year}'].round(2) for year in years}
+    for previous, year in zip(years, years[1:]):
+        result[f'cambio_ranking_{year}'] = result[f'rank_{year}'] - result[f'rank_{previous}']
+        result[f'cambio_puntaje_{year}'] = (rounded[year] - rounded[previous]).round(2)
+    
+    first, last = years[0], years[-1]
+    score_change = (rounded[last] - rounded[first]).round(2)
+    result['cambio_ranking'] = result[f'rank_{last}'] - result[f'rank_{first}']
+    result['cambio_puntaje'] = score_change
+    result['tendencia'] = trend_labels(score_change)
+    result['nuevo'] = ~result[f'presente_{first}'] & result[f'presente_{last}']
+    result['ausente'] = result[f'presente_{first}'] & ~result[f'presente_{last}']
+    
+    return result.reset_index()
+
+
+def _chronological(first: 'PAESAnalyzer', second: 'PAESAnalyzer') -> tuple:
+    """Ordena dos analizadores por año; los años deben ser distintos."""
+    if first.year == second.year:
+        raise ValueError(f"No se puede comparar el año {first.year} consigo mismo")
+    return (first, second) if first.year < second.year else (second, first)
+
 
 class PAESAnalyzer:
     """
     Clase para analizar datos de PAES y generar rankings de establecimientos educacionales.
     """
     
-    def __init__(self, file_path: str, year: int):
+    def __init__(self, file_path: str, year: int, cache_dir: Optional[str] = None,
+                 verbose: bool = True, sinks: Optional[List[Sink]] = None):
         """
         Inicializa el analizador con un archivo de datos PAES.
         
         Args:
-            file_path: Ruta al archivo CSV con datos PAES
+            file_path: Ruta al archivo CSV con datos PAES. También acepta
+                      .gz, .bz2, .zst y .zip ('datos.zip::ArchivoC_Adm2025.csv'
+                      para elegir el archivo dentro del .zip) o un directorio
+                      de almacén columnar (ver export_store)
             year: Año de la admisión (2023, 2024, 2025, etc.)
+            cache_dir: Directorio del caché Parquet 
+                      (por defecto .paes_cache junto al archivo de datos o,
+                      si ese directorio es de solo lectura, ~/.cache/paes_ranking)
+            verbose: Si es False, no imprime mensajes de progreso
+            sinks: Funciones que reciben el registro de cada etapa 
+                  (ver instrumentation.logging_sink y JSONLinesSink)
         """
         self.file_path = file_path
         self.year = year
+        self.cache_dir = cache_dir
+        self.verbose = verbose
+        self.sinks = list(sinks or [])
+        self.stage_metrics = []
         self.df = None
         self.filtered_data = None
+        self.graduate_rows = None
+        self.n_graduates = None
+        self.school_aggregates = None
         self.rbd_averages = None
         self.ranking = None
+        self.subject_ranking = None
+        self.score_sketch = None
+        self.school_regions = None
+        self.school_attributes = None
+        self.cube = None
+        self.load_stats = None
+        self.memory_report = None
+        self.schema_report = None
+        self.column_renames = {}
+        self._rbd_index = None
+        self._rbd_index_source = None
+        self._summary = None
+        self._summary_source = None
+        self._streamed_rows = None
+        self._data_columns = None
+        self._released = False
+    
+    def _log(self, message: str):
+        """Imprime un mensaje de progreso si verbose está activo."""
+        if self.verbose:
+            print(message)
+    
+    def _emit_stage(self, record: Dict):
+        """Guarda el registro de una etapa y lo envía a los sinks."""
+        self.stage_metrics.append(record)
+        for sink in self.sinks:
+            sink(record)
+    
+    @classmethod
+    def from_store(cls, path: str, **kwargs) -> 'PAESAnalyzer':
+        """
+        Crea un analizador sobre un almacén columnar con los datos ya mapeados.
+        
+        Args:
+            path: Directorio del almacén (ver export_store)
+            **kwargs: Argumentos de PAESAnalyzer (cache_dir, verbose, sinks)
+            
+        Returns:
+            PAESAnalyzer con df respaldado por np.memmap
+        """
+        analyzer = cls(path, ColumnStore(path).year, **kwargs)
+        analyzer.load_data()
+        return analyzer
+    
+    def add_sink(self, sink: Sink):
+        """
+        Agrega un sink de instrumentación.
         
-    def load_data(self) -> pd.DataFrame:
+        Args:
+            sink: Función que recibe el registro (dict) de cada etapa
+        """
+        self.sinks.append(sink)
+        
+    def validate(self, sample_rows: int = SAMPLE_ROWS) -> Dict:
+        """
+        Valida el encabezado y una muestra del archivo antes de cargarlo.
+        
+        load_data y create_ranking_streaming la llaman automáticamente. Los 
+        renombres detectados (ver schema.SCHEMA_REGISTRY) se aplican al cargar.
+        
+        Args:
+            sample_rows: Filas de muestra para revisar tipos
+            
+        Returns:
+            Reporte de schema.validate_source
+            
+        Raises:
+            ValueError: Si faltan columnas requeridas o los tipos no corresponden
+        """
+        return self.set_schema_report(validate_source(self.file_path, self.year, sample_rows))
+    
+    def set_schema_report(self, report: Dict) -> Dict:
+        """
+        Usa un reporte de validación ya calculado (por ejemplo, en el proceso
+        principal de run_years), de modo que load_data y 
+        create_ranking_streaming no vuelvan a validar el archivo.
+        
+        Args:
+            report: Reporte de schema.validate_source para este archivo
+            
+        Returns:
+            El mismo reporte
+        """
+        self.schema_report = report
+        self.column_renames = report['renombres']
+        if self.column_renames:
+            renamed = ', '.join(f"{old} → {new}" for old, new in self.column_renames.items())
+            self._log(f"✓ Columnas renombradas: {renamed}")
+        for warning in self.schema_report['advertencias']:
+            self._log(f"⚠ {warning}")
+        return self.schema_report
+    
+    @instrumented('load_data')
+    def load_data(self, fast: bool = False, engine: str = 'c',
+                  use_cache: bool = True, refresh_cache: bool = False) -> pd.DataFrame:
         """
         Carga los datos desde el archivo CSV.
         
+        Si pyarrow está disponible, el resultado se guarda en un caché Parquet
+        identificado por la ruta absoluta, el tamaño y el hash del contenido
+        del archivo (que solo se recalcula si cambian tamaño o fecha de
+        modificación), el año, el miembro del .zip, los renombres de columnas,
+        el modo de carga y SCHEMA_VERSION.
+        
+        Si file_path es un almacén columnar, las columnas se mapean en memoria
+        sin leerlas ni copiarlas y las demás opciones no se usan.
+        
+        Args:
+            fast: Si es True, lee solo las columnas de FAST_SCHEMA con tipos
+                  compactos (int32, uint8, float32, category)
+            engine: Motor de lectura para el modo rápido ('c' o 'pyarrow')
+            use_cache: Si es False, no lee ni escribe el caché
+            refresh_cache: Si es True, ignora el caché existente y lo reconstruye
+        
         Returns:
             DataFrame con los datos cargados
         """
-        print(f"Cargando datos PAES {self.year}...")
-        self.df = pd.read_csv(self.file_path, sep=';', low_memory=False)
-        print(f"✓ Datos cargados: {len(self.df):,} registros")
+        self._log(f"Cargando datos PAES {self.year}...")
+        start = time.perf_counter()
+        self._released = False
+        if is_store(self.file_path):
+            return self._load_store(start)
+        if self.schema_report is None:
+            self.validate()
+        
+        mode = 'rapido' if fast else 'completo'
+        source = 'csv'
+        cached_path = None
+        self.df = None
+        
+        if use_cache and data_cache.cache_available():
+            schema_key = f"{mode}-v{SCHEMA_VERSION}"
+            # Miembro del .zip elegido para este año (varios años por .zip)
+            source_path = resolve_source(self.file_path, self.year)
+            fingerprint = data_cache.file_fingerprint(
+                source_path, schema_key, self.year, self.column_renames, self.cache_dir
+            )
+            cached_path = data_cache.cache_path(
+                source_path, fingerprint, schema_key, self.cache_dir
+            )
+            if not refresh_cache:
+                self.df = data_cache.read_cache(cached_path)
+                if self.df is not None:
+                    source = 'cache'
+                    if fast:
+                        # Parquet no conserva categorías numéricas
+                        self.df = self.df.astype({
+                            col: 'category' for col in self.df.columns
+                            if FAST_SCHEMA.get(col) == 'category'
+                        })
+        
+        if self.df is None:
+            if fast:
+                self.df = read_typed_csv(self.file_path, engine=engine, year=self.year,
+                                         renames=self.column_renames)
+            else:
+                with open_source(self.file_path, self.year) as data:
+                    self.df = pd.read_csv(data, sep=';', low_memory=False)
+                if self.column_renames:
+                    self.df = self.df.rename(columns=self.column_renames)
+                # Códigos territoriales no numéricos: faltantes, como en los demás modos
+                for col in CUBE_DIMENSIONS:
+                    if (col in self.df.columns and 
+                            not pd.api.types.is_numeric_dtype(self.df[col])):
+                        self.df[col] = pd.to_numeric(self.df[col], errors='coerce')
+            if cached_path is not None:
+                data_cache.write_cache(self.df, cached_path)
+        self._data_columns = list(self.df.columns)
+        
+        self.load_stats = {
+            'modo': mode,
+            'origen': source,
+            'motor': engine if fast else 'c',
+            'segundos': round(time.perf_counter() - start, 3),
+            'memoria_df_mb': round(self.df.memory_usage(deep=True).sum() / 1024 ** 2, 1),
+            'rss_pico_mb': _peak_rss_mb()
+        }
+        
+        self._log(f"✓ Datos cargados: {len(self.df):,} registros "
+              f"({source}, {self.load_stats['segundos']} s, "
+              f"{self.load_stats['memoria_df_mb']} MB, "
+              f"RSS pico {self.load_stats['rss_pico_mb']} MB)")
         return self.df
     
+    def _load_store(self, start: float) -> pd.DataFrame:
+        """Mapea las columnas de un almacén columnar (ver load_data)."""
+        store = ColumnStore(self.file_path)
+        if store.year != self.year:
+            self._log(f"⚠ El almacén corresponde al año {store.year}, no a {self.year}")
+        self.df = store.to_frame()
+        self._data_columns = list(self.df.columns)
+        
+        self.load_stats = {
+            'modo': 'memmap',
+            'origen': 'almacen',
+            'motor': None,
+            'segundos': round(time.perf_counter() - start, 3),
+            'memoria_df_mb': round(store.nbytes() / 1024 ** 2, 1),
+            'rss_pico_mb': _peak_rss_mb()
+        }
+        
+        self._log(f"✓ Datos mapeados: {len(self.df):,} registros "
+              f"(almacén, {self.load_stats['segundos']} s, "
+              f"{self.load_stats['memoria_df_mb']} MB en disco)")
+        return self.df
+    
+    def export_store(self, output_dir: str) -> Dict:
+        """
+        Convierte los datos del año en un almacén columnar mapeable en memoria.
+        
+        Guarda las columnas de FAST_SCHEMA (con los renombres del esquema ya
+        aplicados) como archivos binarios de ancho fijo y un manifest.json.
+        Luego PAESAnalyzer(output_dir, year) o PAESAnalyzer.from_store(output_dir)
+        abren los datos al instante y sin copiarlos.
+        
+        Args:
+            output_dir: Directorio del almacén
+            
+        Returns:
+            Manifiesto del almacén
+        """
+        if self.df is None:
+            self.load_data(fast=True)
+        columns = [col for col in self.df.columns if col in FAST_SCHEMA]
+        manifest = write_store(
+            self.df[columns], output_dir, self.year,
+            source=self.file_path, extra={'schema_version': SCHEMA_VERSION}
+        )
+        self._log(f"✓ Almacén columnar creado en: {output_dir} "
+              f"({manifest['filas']:,} filas, {len(columns)} columnas)")
+        return manifest
+    
+    def _graduate_mask(self) -> np.ndarray:
+        """Máscara de egresados regulares; carga los datos si hace falta."""
+        if self.df is None:
+            if self._released:
+                raise ValueError(
+                    f"Los datos de estudiantes de {self.year} fueron liberados "
+                    "(release_raw_data). Llame a load_data() para volver a cargarlos."
+                )
+            self.load_data()
+        return (self.df['SITUACION_EGRESO'] == 1).to_numpy(dtype=bool, na_value=False)
+    
+    def _reset_graduate_tables(self):
+        """Descarta las tablas derivadas del filtro de egresados."""
+        self.school_aggregates = None
+        self.subject_ranking = None
+        self.score_sketch = None
+        self.school_regions = None
+        self.school_attributes = None
+        self.cube = None
+    
+    @instrumented('filter_graduates', rows_in=lambda self: len(self.df))
     def filter_graduates(self) -> pd.DataFrame:
         """
         Filtra estudiantes que egresaron regularmente (SITUACION_EGRESO = 1).
@@ -49,13 +600,107 @@ class PAESAnalyzer:
         Returns:
             DataFrame filtrado con egresados regulares
         """
-        if self.df is None:
-            self.load_data()
-            
-        self.filtered_data = self.df[self.df['SITUACION_EGRESO'] == 1].copy()
-        print(f"✓ Estudiantes egresados regulares: {len(self.filtered_data):,}")
+        mask = self._graduate_mask()
+        self.filtered_data = self.df[mask].copy()
+        self.graduate_rows = None
+        self.n_graduates = len(self.filtered_data)
+        self._reset_graduate_tables()
+        self._log(f"✓ Estudiantes egresados regulares: {self.n_graduates:,}")
         return self.filtered_data
     
+    @instrumented('index_graduates', rows_in=lambda self: len(self.df))
+    def index_graduates(self) -> np.ndarray:
+        """
+        Selecciona los egresados regulares sin copiar sus filas.
+        
+        Guarda solo sus posiciones (graduate_rows, 4 bytes por egresado) y 
+        cada agregación extrae las columnas que necesita; filtered_data queda
+        en None. Los egresados se obtienen con graduates(columnas).
+        
+        Returns:
+            Arreglo de posiciones de las filas de egresados en df
+        """
+        rows = np.flatnonzero(self._graduate_mask())
+        self.graduate_rows = rows.astype(np.int32) if len(rows) < 2 ** 31 else rows
+        self.filtered_data = None
+        self.n_graduates = len(self.graduate_rows)
+        self._reset_graduate_tables()
+        self._log(f"✓ Estudiantes egresados regulares: {self.n_graduates:,}")
+        return self.graduate_rows
+    
+    def _ensure_graduates(self):
+        """Aplica filter_graduates si todavía no hay filtro."""
+        if self.filtered_data is None and self.graduate_rows is None:
+            self.filter_graduates()
+    
+    def _available_columns(self) -> List[str]:
+        """Columnas de los datos de estudiantes (aunque ya se hayan liberado)."""
+        if self._data_columns is None:
+            self._ensure_graduates()
+        if self._data_columns is None:
+            # filtered_data asignado directamente
+            return list(self.filtered_data.columns)
+        return self._data_columns
+    
+    def graduates(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Egresados regulares, con todas o algunas columnas.
+        
+        Con index_graduates las filas se extraen en cada llamada, por lo que
+        conviene pedir solo las columnas necesarias.
+        
+        Args:
+            columns: Columnas a incluir (por defecto, todas)
+            
+        Returns:
+            DataFrame de egresados regulares
+        """
+        self._ensure_graduates()
+        if self.filtered_data is not None:
+            return self.filtered_data if columns is None else self.filtered_data[columns]
+        frame = self.df if columns is None else self.df[columns]
+        return frame.take(self.graduate_rows)
+    
+    def aggregate_schools(self, columns: Optional[List[str]] = None) -> SchoolAggregates:
+        """
+        Calcula conteos, sumas y sumas de cuadrados por establecimiento.
+        
+        El RBD se factoriza una sola vez y todas las columnas de puntaje se
+        agregan en la misma pasada. El resultado queda guardado y es
+        compartido por calculate_school_averages y create_ranking.
+        
+        Args:
+            columns: Columnas de puntaje a agregar. 
+                    Si es None, usa columnas estándar PAES.
+        
+        Returns:
+            SchoolAggregates con una fila por RBD
+        """
+        if columns is None:
+            columns = SCORE_COLUMNS
+        
+        data_columns = self._available_columns()
+        available_columns = [col for col in columns if col in data_columns]
+        
+        if (self.school_aggregates is None or 
+                not set(available_columns) <= set(self.school_aggregates.columns)):
+            if self.school_aggregates is not None:
+                available_columns = list(dict.fromkeys(
+                    self.school_aggregates.columns + available_columns
+                ))
+            self._ensure_graduates()
+            if self.filtered_data is not None:
+                self.school_aggregates = SchoolAggregates.from_frame(
+                    self.filtered_data, available_columns
+                )
+            else:
+                self.school_aggregates = SchoolAggregates.from_frame(
+                    self.df, available_columns, rows=self.graduate_rows
+                )
+        
+        return self.school_aggregates
+    
+    @instrumented('calculate_school_averages', rows_in=lambda self: self.n_graduates)
     def calculate_school_averages(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Calcula promedios por establecimiento (RBD).
@@ -67,31 +712,19 @@ class PAESAnalyzer:
         Returns:
             DataFrame con promedios por RBD
         """
-        if self.filtered_data is None:
-            self.filter_graduates()
-        
         if columns is None:
-            columns = [
-                'CLEC_REG_ACTUAL', 
-                'MATE1_REG_ACTUAL', 
-                'MATE2_REG_ACTUAL', 
-                'HCSOC_REG_ACTUAL', 
-                'CIEN_REG_ACTUAL'
-            ]
+            columns = SCORE_COLUMNS
         
         # Verificar qué columnas existen
-        available_columns = [col for col in columns if col in self.filtered_data.columns]
+        available_columns = [col for col in columns if col in self._available_columns()]
         
-        self.rbd_averages = (
-            self.filtered_data
-            .groupby('RBD')[available_columns]
-            .mean()
-            .reset_index()
-        )
+        aggregates = self.aggregate_schools(available_columns)
+        self.rbd_averages = aggregates.means()[available_columns].reset_index()
         
-        print(f"✓ Promedios calculados para {len(self.rbd_averages):,} establecimientos")
+        self._log(f"✓ Promedios calculados para {len(self.rbd_averages):,} establecimientos")
         return self.rbd_averages
     
+    @instrumented('create_ranking', rows_in=lambda self: self.n_graduates)
     def create_ranking(self) -> pd.DataFrame:
         """
         Crea ranking basado en el promedio de Comprensión Lectora y Matemática 1.
@@ -99,42 +732,282 @@ class PAESAnalyzer:
         Returns:
             DataFrame con el ranking ordenado
         """
-        if self.filtered_data is None:
-            self.filter_graduates()
+        # Los agregados incluyen todas las columnas estándar, así
+        # calculate_school_averages reutiliza la misma pasada
+        aggregates = self.aggregate_schools()
         
         # Calcular promedio PAES (CLEC + MATE1)
-        paes_columns = ['CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL']
+        ranking_df = aggregates.means()[PAES_COLUMNS]
         
-        ranking_df = (
-            self.filtered_data
-            .groupby('RBD')[paes_columns]
-            .mean()
-        )
+        self.ranking = build_ranking(ranking_df, aggregates.student_counts())
         
-        # Calcular promedio entre ambas pruebas
-        ranking_df['PAES_PROMEDIO'] = ranking_df.mean(axis=1)
+        self._log(f"✓ Ranking creado con {len(self.ranking):,} establecimientos")
+        return self.ranking
+    
+    @instrumented('create_ranking_streaming', rows_in=lambda self: self._streamed_rows)
+    def create_ranking_streaming(self, chunksize: int = 250_000) -> pd.DataFrame:
+        """
+        Crea el ranking leyendo el archivo por bloques, sin cargarlo completo.
         
-        # Agregar información adicional
-        # Contar estudiantes por establecimiento
-        student_counts = self.filtered_data.groupby('RBD').size()
-        ranking_df['N_ESTUDIANTES'] = student_counts
+        Cada bloque se filtra por SITUACION_EGRESO = 1 y sus agregados por RBD
+        se combinan con los de los bloques anteriores. La memoria máxima depende del tamaño del bloque y no
+        del tamaño del archivo. El resultado es idéntico al de create_ranking
+        y también deja calculado rbd_averages.
         
-        # Crear ranking
-        ranking_df['RANK'] = ranking_df['PAES_PROMEDIO'].rank(
-            ascending=False, 
-            method='min'
-        )
+        Args:
+            chunksize: Número de filas leídas por bloque
+            
+        Returns:
+            DataFrame con el ranking ordenado
+        """
+        if is_store(self.file_path):
+            raise ValueError("Un almacén columnar se abre con load_data (memmap), "
+                             "no requiere procesamiento por bloques")
+        self._log(f"Procesando datos PAES {self.year} por bloques de {chunksize:,} filas...")
+        
+        if self.schema_report is None:
+            self.validate()
+        renames = self.column_renames
+        header = [renames.get(col, col) for col in read_header(self.file_path, self.year)]
+        self._data_columns = header
+        score_columns = [col for col in SCORE_COLUMNS if col in header]
+        usecols = ['RBD', 'SITUACION_EGRESO'] + score_columns
+        dimensions = [col for col in CUBE_DIMENSIONS if col in header]
+        usecols += dimensions
+        # Nombres tal como aparecen en el archivo
+        original = {new: old for old, new in renames.items()}
+        file_usecols = [original.get(col, col) for col in usecols]
+        
+        aggregates = None
+        attributes = None
+        sketch = None
+        sketch_key = 'CODIGO_REGION' if 'CODIGO_REGION' in header else None
+        total_rows = 0
+        
+        # Los códigos territoriales se leen como texto y se convierten a
+        # números en cada bloque; los que no son numéricos quedan como NaN
+        dtype = {original.get(col, col): ('str' if col in dimensions else 'float32')
+                 for col in usecols}
         
-        # Ordenar y resetear índice
-        self.ranking = (
-            ranking_df
-            .sort_values('PAES_PROMEDIO', ascending=False)
-            .reset_index()
+        # Los archivos comprimidos se descomprimen a medida que se leen los bloques
+        with open_source(self.file_path, self.year) as data:
+            reader = pd.read_csv(
+                data, sep=';', usecols=file_usecols, chunksize=chunksize, dtype=dtype
+            )
+            for chunk in reader:
+                if renames:
+                    chunk = chunk.rename(columns=renames)
+                for col in dimensions:
+                    chunk[col] = pd.to_numeric(chunk[col], errors='coerce')
+                total_rows += len(chunk)
+                graduates = chunk[chunk['SITUACION_EGRESO'] == 1]
+                chunk_aggregates = SchoolAggregates.from_frame(graduates, score_columns)
+                
+                chunk_sketch = QuantileSketch.from_frame(graduates, score_columns, sketch_key)
+                
+                if aggregates is None:
+                    aggregates = chunk_aggregates
+                    sketch = chunk_sketch
+                else:
+                    aggregates = aggregates.merge(chunk_aggregates)
+                    sketch = sketch.merge(chunk_sketch)
+                
+                if dimensions:
+                    chunk_attributes = school_attributes(graduates)
+                    attributes = (chunk_attributes if attributes is None 
+                                  else attributes.combine_first(chunk_attributes))
+        
+        if aggregates is None:
+            # Archivo sin filas: ranking vacío, igual que un archivo sin egresados
+            empty = pd.DataFrame({col: pd.Series(dtype='float32') for col in usecols})
+            aggregates = SchoolAggregates.from_frame(empty, score_columns)
+            sketch = QuantileSketch.from_frame(empty, score_columns, sketch_key)
+        
+        aggregates.rbd = aggregates.rbd.astype('int64')
+        self.school_aggregates = aggregates
+        self.subject_ranking = None
+        self.score_sketch = sketch
+        self.school_attributes = attributes
+        self.school_regions = None
+        self.cube = None
+        
+        self.rbd_averages = aggregates.means().reset_index()
+        self.ranking = build_ranking(
+            aggregates.means()[PAES_COLUMNS], 
+            aggregates.student_counts()
         )
         
-        print(f"✓ Ranking creado con {len(self.ranking):,} establecimientos")
+        self._streamed_rows = total_rows
+        self.n_graduates = int(aggregates.sizes.sum())
+        self._log(f"✓ Registros procesados: {total_rows:,}")
+        self._log(f"✓ Estudiantes egresados regulares: {int(aggregates.sizes.sum()):,}")
+        self._log(f"✓ Ranking creado con {len(self.ranking):,} establecimientos")
         return self.ranking
     
+    @instrumented('subject_rankings', rows_in=lambda self: self.n_graduates)
+    def subject_rankings(self, min_students: int = 1) -> pd.DataFrame:
+        """
+        Ranking por asignatura (establecimiento × prueba) de las cinco pruebas.
+        
+        Args:
+            min_students: Mínimo de estudiantes con puntaje en una prueba para
+                         rankear al establecimiento en ella
+            
+        Returns:
+            DataFrame por RBD (ver build_subject_ranking)
+        """
+        self.subject_ranking = build_subject_ranking(self.aggregate_schools(), min_students)
+        return self.subject_ranking
+    
+    def get_subject_positions(self, rbds) -> pd.DataFrame:
+        """
+        Posición de uno o varios establecimientos en cada prueba.
+        
+        Args:
+            rbds: Código RBD o lista de códigos
+            
+        Returns:
+            DataFrame con una fila por RBD consultado (en el mismo orden), las
+            columnas de subject_rankings, year y 'encontrado'
+        """
+        if self.subject_ranking is None:
+            self.subject_rankings()
+        rbds = np.atleast_1d(np.asarray(rbds))
+        result = (self.subject_ranking
+                  .set_index('RBD')
+                  .reindex(rbds)
+                  .rename_axis('RBD')
+                  .reset_index())
+        result['year'] = self.year
+        result['encontrado'] = result['N_ESTUDIANTES'].notna().to_numpy()
+        return result
+    
+    def quantile_sketch(self) -> QuantileSketch:
+        """
+        Histogramas de puntajes de egresados por región y prueba.
+        
+        Se construye en una pasada (o bloque a bloque en 
+        create_ranking_streaming) y queda guardado. Los sketches de otros 
+        bloques, procesos o años se combinan con merge.
+        
+        Returns:
+            QuantileSketch agrupado por CODIGO_REGION (si está disponible)
+        """
+        if self.score_sketch is None:
+            self._build_quantile_sketch()
+        return self.score_sketch
+    
+    @instrumented('quantile_sketch', rows_in=lambda self: self.n_graduates)
+    def _build_quantile_sketch(self):
+        """Construye score_sketch desde los egresados (ver quantile_sketch)."""
+        data_columns = self._available_columns()
+        columns = [col for col in SCORE_COLUMNS if col in data_columns]
+        key = 'CODIGO_REGION' if 'CODIGO_REGION' in data_columns else None
+        if self.filtered_data is not None:
+            self.score_sketch = QuantileSketch.from_frame(self.filtered_data, columns, key)
+        else:
+            self.score_sketch = QuantileSketch.from_frame(
+                self.df, columns, key, rows=self.graduate_rows
+            )
+    
+    def score_percentiles(self, quantiles=DEFAULT_QUANTILES, 
+                          by_region: bool = False) -> pd.DataFrame:
+        """
+        Percentiles de puntaje de los estudiantes por prueba.
+        
+        Se obtienen del sketch (ver quantiles.py), sin ordenar los puntajes:
+        el error es a lo más medio punto.
+        
+        Args:
+            quantiles: Niveles entre 0 y 1 (por defecto P10, P50 y P90)
+            by_region: Si es True, una fila por región y prueba
+            
+        Returns:
+            DataFrame con [CODIGO_REGION,] PRUEBA, N y P{nivel} por percentil
+        """
+        table = self.quantile_sketch().quantiles(quantiles, by_group=by_region)
+        table['PRUEBA'] = table['PRUEBA'].map(SUBJECT_NAMES).fillna(table['PRUEBA'])
+        return table
+    
+    @instrumented('rank_scenarios', rows_in=lambda self: len(self.school_aggregates.rbd))
+    def rank_scenarios(self, scenarios: List) -> pd.DataFrame:
+        """
+        Rankings de varias fórmulas de ponderación en una sola operación.
+        
+        Todas se evalúan sobre los mismos agregados por RBD, sin volver a 
+        leer los datos de estudiantes (ver scenarios.rank_scenarios).
+        
+        Args:
+            scenarios: Lista de Scenario o de diccionarios 
+                      {'nombre', 'pesos', 'min_estudiantes', 'requiere_todas'}
+            
+        Returns:
+            DataFrame por RBD con N_ESTUDIANTES, PUNTAJE_{nombre} y RANK_{nombre}
+        """
+        scenarios = [scenario if isinstance(scenario, Scenario) else Scenario.from_dict(scenario)
+                     for scenario in scenarios]
+        columns = list(dict.fromkeys(col for scenario in scenarios for col in scenario.weights))
+        if self.school_aggregates is None or not set(columns) <= set(self.school_aggregates.columns):
+            self.aggregate_schools(columns)
+        return rank_scenarios(self.school_aggregates, scenarios)
+    
+    @instrumented('bootstrap_ranking', rows_in=lambda self: self.n_graduates)
+    def bootstrap_ranking(self, replicates: int = DEFAULT_REPLICATES,
+                          confidence: float = DEFAULT_CONFIDENCE, seed: int = 0,
+                          workers: Optional[int] = None) -> pd.DataFrame:
+        """
+        Agrega al ranking intervalos de confianza y rango probable de posición.
+        
+        Remuestrea con reemplazo los estudiantes de cada establecimiento 
+        (ver bootstrap.py). Un colegio con pocos estudiantes obtiene un 
+        intervalo amplio y un rango de posiciones largo. Requiere los datos 
+        de estudiantes: no está disponible en el modo por bloques (que no los
+        guarda) ni tras release_raw_data.
+        
+        Args:
+            replicates: Número de réplicas bootstrap
+            confidence: Nivel de confianza de los intervalos
+            seed: Semilla aleatoria (el resultado no depende de workers)
+            workers: Procesos para calcular las réplicas (por defecto, este proceso)
+            
+        Returns:
+            Ranking con PAES_EE, PAES_IC_INF, PAES_IC_SUP, RANK_IC_INF, RANK_IC_SUP
+            e IC_UN_ESTUDIANTE (ver bootstrap.uncertainty_table)
+        """
+        if self.df is None and self.filtered_data is None and self._streamed_rows is not None:
+            raise ValueError("El bootstrap necesita los datos de estudiantes y el modo por "
+                             "bloques no los guarda: use load_data() en lugar de "
+                             "create_ranking_streaming()")
+        if self.ranking is None:
+            self.create_ranking()
+        
+        start = time.perf_counter()
+        scores = StudentScores.from_frame(self.graduates(['RBD'] + PAES_COLUMNS), PAES_COLUMNS)
+        samples = bootstrap_replicates(scores, replicates, seed=seed, workers=workers)
+        table = uncertainty_table(scores, samples, confidence)
+        
+        ranking = self.ranking.drop(columns=table.columns, errors='ignore')
+        self.ranking = ranking.join(table, on='RBD')
+        self._log(f"✓ Intervalos bootstrap ({replicates:,} réplicas, "
+                  f"{confidence:.0%}) en {time.perf_counter() - start:.1f} s")
+        return self.ranking
+    
+    def _ranking_index(self) -> pd.Index:
+        """
+        Índice hash RBD -> fila del ranking, construido una vez por ranking.
+        
+        Returns:
+            pd.Index con los RBD en el orden del ranking
+        """
+        if self.ranking is None:
+            self.create_ranking()
+        
+        if self._rbd_index is None or self._rbd_index_source is not self.ranking:
+            self._rbd_index = pd.Index(self.ranking['RBD'])
+            self._rbd_index_source = self.ranking
+        
+        return self._rbd_index
+    
     def get_school_position(self, rbd: int) -> Dict:
         """
         Consulta la posición de un establecimiento en el ranking.
@@ -143,31 +1016,82 @@ class PAESAnalyzer:
             rbd: Código RBD del establecimiento
             
         Returns:
-            Diccionario con información del establecimiento o mensaje de error
+            Diccionario con información del establecimiento o mensaje de error.
+            Un establecimiento sin puntajes (sin posición) se entrega con
+            rank, percentil y promedios en None
         """
-        if self.ranking is None:
-            self.create_ranking()
+        index = self._ranking_index()
         
-        result = self.ranking[self.ranking['RBD'] == rbd]
+        def rounded(value, digits):
+            return None if pd.isna(value) else round(float(value), digits)
         
-        if result.empty:
+        try:
+            position = index.get_loc(rbd)
+        except (KeyError, TypeError):
             return {
                 'error': f'El RBD {rbd} no se encuentra en el ranking',
                 'year': self.year
             }
         
-        row = result.iloc[0]
+        row = self.ranking.iloc[position]
+        ranked = pd.notna(row['RANK'])
         return {
             'rbd': int(row['RBD']),
-            'rank': int(row['RANK']),
-            'paes_promedio': round(row['PAES_PROMEDIO'], 2),
-            'clec': round(row['CLEC_REG_ACTUAL'], 2),
-            'mate1': round(row['MATE1_REG_ACTUAL'], 2),
+            'rank': int(row['RANK']) if ranked else None,
+            'paes_promedio': rounded(row['PAES_PROMEDIO'], 2),
+            'clec': rounded(row['CLEC_REG_ACTUAL'], 2),
+            'mate1': rounded(row['MATE1_REG_ACTUAL'], 2),
             'n_estudiantes': int(row['N_ESTUDIANTES']),
             'year': self.year,
-            'percentil': round((1 - row['RANK'] / len(self.ranking)) * 100, 1)
+            'percentil': (round((1 - row['RANK'] / len(self.ranking)) * 100, 1)
+                          if ranked else None)
         }
     
+    def get_school_positions(self, rbds) -> pd.DataFrame:
+        """
+        Consulta la posición de muchos establecimientos en una sola operación.
+        
+        Args:
+            rbds: Lista o arreglo de códigos RBD
+            
+        Returns:
+            DataFrame con una fila por RBD consultado (en el mismo orden) y las
+            mismas claves que get_school_position, más la columna 'encontrado'
+        """
+        index = self._ranking_index()
+        rbds = np.asarray(rbds)
+        positions = index.get_indexer(rbds)
+        found = positions >= 0
+        rows = self.ranking.iloc[positions[found]]
+        
+        result = pd.DataFrame({
+            'rbd': rbds,
+            'encontrado': found,
+            'year': self.year
+        })
+        columns = {
+            'rank': 'RANK',
+            'paes_promedio': 'PAES_PROMEDIO',
+            'clec': 'CLEC_REG_ACTUAL',
+            'mate1': 'MATE1_REG_ACTUAL',
+            'n_estudiantes': 'N_ESTUDIANTES'
+        }
+        for key, col in columns.items():
+            values = np.full(len(rbds), np.nan)
+            values[found] = rows[col].to_numpy(dtype=np.float64)
+            result[key] = values
+        
+        result['percentil'] = ((1 - result['rank'] / len(self.ranking)) * 100).round(1)
+        result[['paes_promedio', 'clec', 'mate1']] = (
+            result[['paes_promedio', 'clec', 'mate1']].round(2)
+        )
+        result[['rank', 'n_estudiantes']] = (
+            result[['rank', 'n_estudiantes']].astype('Int64')
+        )
+        
+        return result[['rbd', 'rank', 'paes_promedio', 'clec', 'mate1',
+                       'n_estudiantes', 'year', 'percentil', 'encontrado']]
+    
     def get_top_schools(self, n: int = 10) -> pd.DataFrame:
         """
         Obtiene los mejores n establecimientos del ranking.
@@ -190,29 +1114,194 @@ class PAESAnalyzer:
         Returns:
             Diccionario con estadísticas descriptivas
         """
+        stats = self.get_summary().to_statistics()
+        
+        # Percentiles de estudiantes, si hay datos o un sketch disponible
+        if (self.score_sketch is not None or self.df is not None or
+                self.filtered_data is not None):
+            percentiles = self.score_percentiles()
+            # Las pruebas sin puntajes (N = 0) no tienen percentiles: se omiten
+            # para que el JSON no lleve NaN
+            percentiles = percentiles[percentiles['N'] > 0]
+            stats['percentiles_estudiantes'] = {
+                row.pop('PRUEBA'): row 
+                for row in percentiles.round(1).to_dict('records')
+            }
+        return stats
+    
+    def get_summary(self) -> RankingSummary:
+        """
+        Resumen del ranking (momentos, cuantiles, histogramas y top 20).
+        
+        Se calcula una vez por ranking y lo usan get_statistics y los 
+        gráficos de PAESVisualizer (argumento summary).
+        
+        Returns:
+            RankingSummary del ranking actual
+        """
         if self.ranking is None:
             self.create_ranking()
         
+        if self._summary_source is not self.ranking:
+            self._summary = RankingSummary.from_ranking(self.ranking, self.year)
+            self._summary_source = self.ranking
+        return self._summary
+    
+    def get_school_attributes(self) -> Optional[pd.DataFrame]:
+        """
+        Región, comuna y dependencia de cada establecimiento.
+        
+        Returns:
+            DataFrame indexado por RBD (ver cube.school_attributes), o None 
+            si los datos no tienen columnas territoriales
+        """
+        if self.school_attributes is None and (self.filtered_data is not None or
+                                               self.graduate_rows is not None):
+            dimensions = [col for col in CUBE_DIMENSIONS if col in self._available_columns()]
+            if dimensions:
+                self.school_attributes = school_attributes(
+                    self.graduates(['RBD'] + dimensions)
+                )
+        return self.school_attributes
+    
+    def get_school_regions(self) -> Optional[pd.Series]:
+        """
+        Región de cada establecimiento según los datos de estudiantes.
+        
+        Returns:
+            Serie RBD -> CODIGO_REGION, o None si la columna no está disponible
+        """
+        if self.school_regions is None:
+            attributes = self.get_school_attributes()
+            if attributes is not None and 'CODIGO_REGION' in attributes.columns:
+                self.school_regions = attributes['CODIGO_REGION']
+        return self.school_regions
+    
+    def release_raw_data(self):
+        """
+        Libera los datos de estudiantes (df y filtro) una vez calculadas las
+        tablas derivadas: agregados por RBD, promedios, ranking y dimensiones
+        territoriales. Consultas, estadísticas, exportaciones, cubo y gráficos
+        siguen funcionando. Lo que necesite de nuevo a los estudiantes (por 
+        ejemplo, agregar otras columnas) lanza ValueError hasta llamar a 
+        load_data().
+        """
+        if self.df is None and self.filtered_data is None:
+            return
+        
+        self.aggregate_schools()
+        if self.rbd_averages is None:
+            self.calculate_school_averages()
+        if self.ranking is None:
+            self.create_ranking()
+        self.get_school_regions()
+        self.quantile_sketch()
+        
+        self.df = None
+        self.filtered_data = None
+        self.graduate_rows = None
+        self._released = True
+        gc.collect()
+        self._log("✓ Datos de estudiantes liberados")
+    
+    def memory_usage(self) -> Dict:
+        """
+        Memoria de los datos del analizador y del proceso.
+        
+        Returns:
+            Diccionario con datos_mb (df), egresados_mb (filtered_data o 
+            graduate_rows), rss_actual_mb (memoria estable) y rss_pico_mb
+        """
+        def frame_mb(df):
+            return 0.0 if df is None else round(float(df.memory_usage(deep=True).sum()) / 1024 ** 2, 1)
+        
+        graduates_mb = frame_mb(self.filtered_data)
+        if self.graduate_rows is not None:
+            graduates_mb = round(self.graduate_rows.nbytes / 1024 ** 2, 1)
+        
+        process = current_memory()
+        # El pico del proceso solo crece; se incluyen los registros de etapas
+        # por si vienen de otro proceso (pipeline con pool)
+        peaks = [record['rss_pico_mb'] for record in self.stage_metrics
+                 if record.get('rss_pico_mb') is not None]
+        if process['rss_pico_mb'] is not None:
+            peaks.append(process['rss_pico_mb'])
         return {
-            'year': self.year,
-            'total_establecimientos': len(self.ranking),
-            'total_estudiantes': int(self.ranking['N_ESTUDIANTES'].sum()),
-            'promedio_nacional': round(self.ranking['PAES_PROMEDIO'].mean(), 2),
-            'mediana_nacional': round(self.ranking['PAES_PROMEDIO'].median(), 2),
-            'desviacion_estandar': round(self.ranking['PAES_PROMEDIO'].std(), 2),
-            'puntaje_maximo': round(self.ranking['PAES_PROMEDIO'].max(), 2),
-            'puntaje_minimo': round(self.ranking['PAES_PROMEDIO'].min(), 2),
-            'promedio_clec': round(self.ranking['CLEC_REG_ACTUAL'].mean(), 2),
-            'promedio_mate1': round(self.ranking['MATE1_REG_ACTUAL'].mean(), 2)
+            'datos_mb': frame_mb(self.df),
+            'egresados_mb': graduates_mb,
+            'rss_actual_mb': None if process['rss_mb'] is None else round(process['rss_mb'], 1),
+            'rss_pico_mb': round(max(peaks), 1) if peaks else None
         }
     
-    def export_ranking(self, output_path: str, format: str = 'csv') -> str:
+    @instrumented('build_cube', rows_in=lambda self: len(self.ranking))
+    def build_cube(self) -> AggregationCube:
+        """
+        Construye el cubo de agregación nacional -> región -> comuna -> RBD.
+        
+        Reutiliza los agregados por RBD del ranking (aggregate_schools o 
+        create_ranking_streaming), así que no vuelve a recorrer los datos de
+        estudiantes.
+        
+        Returns:
+            AggregationCube con tablas por región, comuna y dependencia
+        """
+        if self.cube is not None:
+            return self.cube
+        if self.ranking is None:
+            self.create_ranking()
+        
+        attributes = self.get_school_attributes()
+        if attributes is None:
+            raise ValueError("Los datos no tienen columnas territoriales "
+                             "(CODIGO_REGION, CODIGO_COMUNA)")
+        
+        aggregates = self.school_aggregates
+        if aggregates is None:
+            aggregates = self.aggregate_schools()
+        self.cube = AggregationCube(aggregates, attributes)
+        
+        self._log(f"✓ Cubo territorial creado: "
+                  + ", ".join(f"{len(table):,} {level}" 
+                              for level, table in self.cube.tables.items()
+                              if level != 'nacional'))
+        return self.cube
+    
+    def get_regional_summary(self, level: str = 'CODIGO_REGION') -> pd.DataFrame:
+        """
+        Promedios y conteos por región o comuna, leídos del cubo.
+        
+        Args:
+            level: 'CODIGO_REGION', 'CODIGO_COMUNA' o 'GRUPO_DEPENDENCIA'
+            
+        Returns:
+            DataFrame ordenado por PAES_PROMEDIO
+        """
+        return self.build_cube().rollup(level)
+    
+    def get_regional_ranking(self, level: str = 'CODIGO_REGION') -> pd.DataFrame:
+        """
+        Ranking y percentil de cada establecimiento dentro de su región o comuna.
+        
+        Args:
+            level: 'CODIGO_REGION' o 'CODIGO_COMUNA'
+            
+        Returns:
+            DataFrame por RBD con RANK_{level}, TOTAL_{level} y PERCENTIL_{level}
+        """
+        return self.build_cube().ranking_within(level)
+    
+    @instrumented('export_ranking', rows_in=lambda self: len(self.ranking),
+                  rows_out=lambda self, path: len(self.ranking))
+    def export_ranking(self, output_path: str, format: str = 'csv',
+                       include_averages: bool = False) -> str:
         """
         Exporta el ranking a un archivo.
         
         Args:
             output_path: Ruta donde guardar el archivo
-            format: Formato de exportación ('csv', 'excel', 'json')
+            format: Formato de exportación ('csv', 'excel', 'json', 'sqlite')
+            include_averages: En formato 'sqlite', guardar también los 
+                             promedios por asignatura de cada establecimiento
             
         Returns:
             Ruta del archivo generado
@@ -220,7 +1309,22 @@ class PAESAnalyzer:
         if self.ranking is None:
             self.create_ranking()
         
-        if format == 'csv':
+        if format == 'sqlite':
+            ranking = self.ranking
+            regions = self.get_school_regions()
+            if regions is not None:
+                ranking = ranking.assign(CODIGO_REGION=ranking['RBD'].map(regions))
+            
+            averages = None
+            if include_averages:
+                if self.rbd_averages is None:
+                    self.calculate_school_averages()
+                averages = self.rbd_averages
+            
+            # Reemplaza las filas del año en una sola transacción
+            with RankingStore(output_path) as store:
+                store.write_year(self.year, ranking, averages)
+        elif format == 'csv':
             self.ranking.to_csv(output_path, index=False, encoding='utf-8-sig')
         elif format == 'excel':
             self.ranking.to_excel(output_path, index=False)
@@ -229,13 +1333,16 @@ class PAESAnalyzer:
         else:
             raise ValueError(f"Formato no soportado: {format}")
         
-        print(f"✓ Ranking exportado a: {output_path}")
+        self._log(f"✓ Ranking exportado a: {output_path}")
         return output_path
     
     def compare_years(self, other_analyzer: 'PAESAnalyzer', rbd: int) -> Dict:
         """
         Compara el desempeño de un establecimiento entre dos años.
         
+        Los cambios son año posterior menos año anterior, sin importar cuál 
+        de los dos analizadores es self.
+        
         Args:
             other_analyzer: Otro analizador PAES para comparar
             rbd: Código RBD del establecimiento
@@ -243,8 +1350,9 @@ class PAESAnalyzer:
         Returns:
             Diccionario con comparación entre años
         """
-        year1_data = self.get_school_position(rbd)
-        year2_data = other_analyzer.get_school_position(rbd)
+        earlier, later = _chronological(self, other_analyzer)
+        year1_data = earlier.get_school_position(rbd)
+        year2_data = later.get_school_position(rbd)
         
         if 'error' in year1_data or 'error' in year2_data:
             return {
@@ -253,16 +1361,80 @@ class PAESAnalyzer:
                 'year2': other_analyzer.year
             }
         
-        rank_change = year1_data['rank'] - year2_data['rank']
-        score_change = year1_data['paes_promedio'] - year2_data['paes_promedio']
+        if year1_data['rank'] is None or year2_data['rank'] is None:
+            # Sin puntajes en alguno de los años: no hay cambio que medir
+            return {
+                'rbd': rbd,
+                'comparison': {
+                    earlier.year: year1_data,
+                    later.year: year2_data
+                },
+                'cambio_ranking': None,
+                'cambio_puntaje': None,
+                'tendencia': 'sin ranking'
+            }
+        
+        rank_change = year2_data['rank'] - year1_data['rank']
+        score_change = year2_data['paes_promedio'] - year1_data['paes_promedio']
         
         return {
             'rbd': rbd,
             'comparison': {
-                self.year: year1_data,
-                other_analyzer.year: year2_data
+                earlier.year: year1_data,
+                later.year: year2_data
             },
             'cambio_ranking': rank_change,
             'cambio_puntaje': round(score_change, 2),
             'tendencia': 'mejora' if score_change > 0 else 'baja' if score_change < 0 else 'estable'
         }
+    
+    def compare_years_batch(self, other_analyzer: 'PAESAnalyzer', rbds) -> pd.DataFrame:
+        """
+        Compara muchos establecimientos entre dos años en una sola operación.
+        
+        Los cambios son año posterior menos año anterior (ver compare_years).
+        
+        Args:
+            other_analyzer: Otro analizador PAES para comparar
+            rbds: Lista o arreglo de códigos RBD
+            
+        Returns:
+            DataFrame con posición y puntaje en ambos años, cambios y tendencia
+        """
+        earlier, later = _chronological(self, other_analyzer)
+        year1_data = earlier.get_school_positions(rbds)
+        year2_data = later.get_school_positions(rbds)
+        
+        result = pd.DataFrame({'rbd': year1_data['rbd']})
+        for year, data in ((earlier.year, year1_data), (later.year, year2_data)):
+            for key in ['rank', 'paes_promedio', 'n_estudiantes', 'percentil']:
+                result[f'{key}_{year}'] = data[key]
+        
+        score_change = (year2_data['paes_promedio'] - year1_data['paes_promedio']).round(2)
+        result['cambio_ranking'] = year2_data['rank'] - year1_data['rank']
+        result['cambio_puntaje'] = score_change
+        result['tendencia'] = trend_labels(score_change)
+        result['encontrado'] = year1_data['encontrado'] & year2_data['encontrado']
+        
+        return result
+    
+    def compare_all_schools(self, *other_analyzers: 'PAESAnalyzer') -> pd.DataFrame:
+        """
+        Compara todos los establecimientos de este año con uno o más años.
+        
+        Args:
+            other_analyzers: Otros analizadores PAES (con ranking calculado o calculable)
+            
+        Returns:
+            DataFrame de compare_rankings con una fila por RBD
+        """
+        analyzers = (self,) + other_analyzers
+        years = [analyzer.year for analyzer in analyzers]
+        duplicated = sorted({year for year in years if years.count(year) > 1})
+        if duplicated:
+            raise ValueError(f"Años repetidos en la comparación: {duplicated}")
+        for analyzer in analyzers:
+            if analyzer.ranking is None:
+                analyzer.create_ranking()
+        
+        return compare_rankings({analyzer.year: analyzer.ranking for analyzer in analyzers})
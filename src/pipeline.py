@@ -0,0 +1,173 @@
+"""
+Pipeline multi-año - Procesa varios años PAES en paralelo
+Cada año se carga, filtra y rankea en su propio proceso
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from .paes_analyzer import PAESAnalyzer
+    from .schema import validate_source
+except ImportError:
+    from paes_analyzer import PAESAnalyzer
+    from schema import validate_source
+
+
+def parse_year_source(value: str) -> Tuple[str, int]:
+    """
+    Interpreta un par 'ruta,año'.
+
+    Args:
+        value: Texto con formato ruta,año
+
+    Returns:
+        Tupla (ruta, año)
+
+    Raises:
+        ValueError: Si el texto no tiene el formato ruta,año
+    """
+    file_path, _, year = value.rpartition(',')
+    if not file_path or not year.strip().isdigit():
+        raise ValueError(f"Formato inválido '{value}': se espera ruta,año "
+                         "(ej: data/ArchivoC_Adm2025.csv,2025)")
+    return file_path, int(year)
+
+
+def process_year(file_path: str, year: int, stream: bool = False,
+                 chunksize: int = 250_000,
+                 load_options: Optional[Dict] = None,
+                 low_memory: bool = False, bootstrap: int = 0,
+                 schema_report: Optional[Dict] = None) -> Dict:
+    """
+    Carga, filtra y rankea un año. Se ejecuta dentro de un proceso del pool.
+
+    Solo se devuelven las tablas compactas (ranking, promedios, agregados,
+    sketch de percentiles y dimensiones territoriales por RBD), no los datos
+    de estudiantes.
+
+    Args:
+        file_path: Ruta al archivo CSV con datos PAES
+        year: Año de la admisión
+        stream: Si es True, usa create_ranking_streaming
+        chunksize: Filas por bloque en modo streaming
+        load_options: Argumentos para load_data
+        low_memory: Si es True, filtra egresados sin copiar filas y libera
+                   los datos de estudiantes al terminar
+        bootstrap: Réplicas para los intervalos del ranking (0 = no calcular)
+        schema_report: Reporte de schema.validate_source ya calculado; si se
+                      entrega, el archivo no se vuelve a validar
+
+    Returns:
+        Diccionario con year, file_path, ranking, rbd_averages,
+        school_aggregates, score_sketch, school_attributes, load_stats, stage_metrics
+        y memoria (ver PAESAnalyzer.memory_usage)
+    """
+    analyzer = PAESAnalyzer(file_path, year)
+    if schema_report is not None:
+        analyzer.set_schema_report(schema_report)
+
+    if stream:
+        analyzer.create_ranking_streaming(chunksize)
+    else:
+        analyzer.load_data(**(load_options or {}))
+        if low_memory:
+            analyzer.index_graduates()
+        else:
+            analyzer.filter_graduates()
+        analyzer.calculate_school_averages()
+        analyzer.create_ranking()
+    
+    if bootstrap:
+        analyzer.bootstrap_ranking(bootstrap)
+    if low_memory and not stream:
+        analyzer.release_raw_data()
+
+    return {
+        'year': year,
+        'file_path': file_path,
+        'ranking': analyzer.ranking,
+        'rbd_averages': analyzer.rbd_averages,
+        'school_aggregates': analyzer.school_aggregates,
+        'score_sketch': analyzer.quantile_sketch(),
+        'school_attributes': analyzer.get_school_attributes(),
+        'load_stats': analyzer.load_stats,
+        'stage_metrics': analyzer.stage_metrics,
+        'memoria': analyzer.memory_usage()
+    }
+
+
+def run_years(sources: List[Tuple[str, int]], workers: Optional[int] = None,
+              stream: bool = False, chunksize: int = 250_000,
+              load_options: Optional[Dict] = None,
+              low_memory: bool = False, bootstrap: int = 0) -> List[PAESAnalyzer]:
+    """
+    Procesa varios años en paralelo con un pool de procesos.
+
+    Antes de iniciar el pool se valida el encabezado y una muestra de cada
+    archivo, de modo que un archivo inválido se detecta antes de cargar
+    los demás. Los reportes (con los renombres de columnas) se entregan a
+    cada proceso, que no vuelve a validar.
+
+    Con un solo proceso los años se procesan uno tras otro en el proceso 
+    actual; con low_memory, los datos de cada año se liberan antes de 
+    cargar el siguiente.
+
+    Args:
+        sources: Lista de pares (ruta, año)
+        workers: Número de procesos (por defecto, uno por año hasta el número de CPU)
+        stream: Si es True, cada año se procesa por bloques
+        chunksize: Filas por bloque en modo streaming
+        load_options: Argumentos para load_data
+        low_memory: Ver process_year
+        bootstrap: Ver process_year
+
+    Returns:
+        Lista de PAESAnalyzer con ranking y rbd_averages ya calculados,
+        en el mismo orden que sources
+        
+    Raises:
+        ValueError: Si algún archivo no tiene el esquema esperado, o si se
+                   pide bootstrap con stream
+    """
+    if stream and bootstrap:
+        raise ValueError("bootstrap necesita los datos de estudiantes; no se puede "
+                         "usar con stream")
+    reports = [validate_source(file_path, year) for file_path, year in sources]
+
+    if workers is None:
+        workers = min(len(sources), os.cpu_count() or 1)
+
+    if workers <= 1:
+        results = [
+            process_year(file_path, year, stream, chunksize, load_options,
+                         low_memory, bootstrap, report)
+            for (file_path, year), report in zip(sources, reports)
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(process_year, file_path, year, stream,
+                                chunksize, load_options, low_memory, bootstrap,
+                                report)
+                for (file_path, year), report in zip(sources, reports)
+            ]
+            results = [future.result() for future in futures]
+
+    analyzers = []
+    for result, report in zip(results, reports):
+        analyzer = PAESAnalyzer(result['file_path'], result['year'])
+        analyzer.schema_report = report
+        analyzer.column_renames = report['renombres']
+        analyzer.ranking = result['ranking']
+        analyzer.rbd_averages = result['rbd_averages']
+        analyzer.school_aggregates = result['school_aggregates']
+        analyzer.score_sketch = result['score_sketch']
+        analyzer.school_attributes = result['school_attributes']
+        analyzer.load_stats = result['load_stats']
+        analyzer.stage_metrics = result['stage_metrics']
+        analyzer.memory_report = result['memoria']
+        analyzers.append(analyzer)
+
+    return analyzers
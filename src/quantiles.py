@@ -0,0 +1,189 @@
+"""
+Percentiles de puntajes de estudiantes con sketches combinables
+Un histograma de ancho fijo sobre la escala PAES por grupo (por ejemplo, región)
+y prueba: se construye en una pasada, se combina sumando conteos (bloques,
+procesos o años) y entrega percentiles con error acotado sin ordenar los datos
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .schema import SCORE_RANGE
+except ImportError:
+    from schema import SCORE_RANGE
+
+
+# Ancho de cada celda en puntos: un percentil difiere a lo más en la mitad
+# de este valor del puntaje que ocupa esa posición. Con 1 punto, los
+# puntajes enteros de la PAES se recuperan exactos.
+DEFAULT_RESOLUTION = 1.0
+
+# Percentiles informados por defecto
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+class QuantileSketch:
+    """
+    Histogramas de puntajes por grupo y columna.
+
+    Para cada grupo y columna se guarda cuántos puntajes caen en cada celda
+    de la escala. El percentil q es el centro de la celda donde la frecuencia
+    acumulada alcanza q * n (como np.quantile con method='inverted_cdf'), y
+    difiere a lo más en resolution / 2 del valor exacto. Los puntajes fuera
+    de la escala se asignan a la primera o a la última celda.
+    """
+
+    def __init__(self, groups: np.ndarray, counts: np.ndarray, columns: List[str],
+                 key: Optional[str] = None, resolution: float = DEFAULT_RESOLUTION):
+        """
+        Inicializa el sketch (usar from_frame).
+
+        Args:
+            groups: Valores del grupo (n_grupos,); [0] si no se agrupa
+            counts: Conteos (n_grupos, n_columnas, n_celdas)
+            columns: Columnas de puntaje
+            key: Columna de agrupación (None = solo nacional)
+            resolution: Ancho de las celdas en puntos
+        """
+        self.groups = groups
+        self.counts = counts
+        self.columns = list(columns)
+        self.key = key
+        self.resolution = resolution
+
+    @staticmethod
+    def n_bins(resolution: float) -> int:
+        """Número de celdas para cubrir SCORE_RANGE con centros en sus extremos."""
+        low, high = SCORE_RANGE
+        return int(round((high - low) / resolution)) + 1
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: List[str], key: Optional[str] = None,
+                   rows: Optional[np.ndarray] = None,
+                   resolution: float = DEFAULT_RESOLUTION) -> 'QuantileSketch':
+        """
+        Construye el sketch con un np.bincount por columna.
+
+        Args:
+            df: DataFrame a nivel de estudiante
+            columns: Columnas de puntaje
+            key: Columna de agrupación (por ejemplo, CODIGO_REGION). Los
+                estudiantes sin valor forman su propio grupo (NaN), de modo
+                que el total nacional los incluye.
+            rows: Posiciones de las filas a considerar (por defecto, todas)
+            resolution: Ancho de las celdas en puntos
+
+        Returns:
+            QuantileSketch
+        """
+        def column(name):
+            values = df[name].array if rows is None else df[name].array.take(rows)
+            return values.to_numpy(dtype=np.float64, na_value=np.nan)
+
+        n_rows = len(df) if rows is None else len(rows)
+        if key is None:
+            codes, groups = np.zeros(n_rows, dtype=np.intp), np.array([0])
+        else:
+            keys = df[key] if rows is None else pd.Series(df[key].array.take(rows), copy=False)
+            codes, groups = pd.factorize(keys, sort=True, use_na_sentinel=False)
+            groups = np.asarray(groups)
+
+        low, _ = SCORE_RANGE
+        n_bins = cls.n_bins(resolution)
+        counts = np.zeros((len(groups), len(columns), n_bins), dtype=np.int64)
+        for j, col in enumerate(columns):
+            values = column(col)
+            present = ~np.isnan(values)
+            bins = np.rint((values[present] - low) / resolution)
+            bins = np.clip(bins, 0, n_bins - 1).astype(np.intp)
+            flat = codes[present] * n_bins + bins
+            counts[:, j] = np.bincount(flat, minlength=len(groups) * n_bins).reshape(
+                len(groups), n_bins
+            )
+
+        return cls(groups, counts, columns, key, resolution)
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """
+        Combina dos sketches (bloques de un archivo, procesos o años).
+
+        Las columnas que falten en uno de ellos (por ejemplo, una prueba que
+        no existía ese año) se combinan con conteos en cero. Si la agrupación
+        difiere (un año sin CODIGO_REGION), se combinan los totales nacionales.
+
+        Args:
+            other: Sketch con la misma resolución
+
+        Returns:
+            Nuevo sketch con la unión de los grupos y de las columnas
+        """
+        if other.resolution != self.resolution:
+            raise ValueError("Los sketches deben tener la misma resolución: "
+                             f"{self.resolution} y {other.resolution}")
+        if other.key != self.key:
+            return self.total().merge(other.total())
+
+        columns = list(dict.fromkeys(self.columns + other.columns))
+        groups = pd.Index(self.groups).union(pd.Index(other.groups))
+        counts = np.zeros((len(groups), len(columns), self.counts.shape[2]), dtype=np.int64)
+        for part in (self, other):
+            rows = groups.get_indexer(part.groups)
+            cols = [columns.index(col) for col in part.columns]
+            counts[np.ix_(rows, cols)] += part.counts
+        return QuantileSketch(groups.to_numpy(), counts, columns, self.key,
+                              self.resolution)
+
+    def total(self) -> 'QuantileSketch':
+        """Sketch nacional: suma de todos los grupos."""
+        return QuantileSketch(np.array([0]), self.counts.sum(axis=0, keepdims=True),
+                              self.columns, None, self.resolution)
+
+    def nbytes(self) -> int:
+        """Memoria de los conteos."""
+        return self.counts.nbytes
+
+    def quantiles(self, quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                  by_group: bool = False) -> pd.DataFrame:
+        """
+        Percentiles por columna (y por grupo).
+
+        Args:
+            quantiles: Niveles entre 0 y 1 (por ejemplo, 0.1, 0.5, 0.9)
+            by_group: Si es True, una fila por grupo y columna; si no, el
+                     total nacional
+
+        Returns:
+            DataFrame con [key,] PRUEBA, N y una columna P{nivel} por
+            percentil (NaN si no hay puntajes)
+        """
+        quantiles = np.asarray(quantiles, dtype=np.float64)
+        if ((quantiles < 0) | (quantiles > 1)).any():
+            raise ValueError(f"Los percentiles deben estar entre 0 y 1: {quantiles.tolist()}")
+
+        sketch = self if by_group and self.key is not None else self.total()
+        cumulative = sketch.counts.cumsum(axis=2)
+        n = cumulative[:, :, -1]
+
+        # Primera celda cuya frecuencia acumulada alcanza q * n (al menos 1)
+        # (se redondea q * n para que 0.1 * 240000 no pase a 24001)
+        targets = np.maximum(np.ceil(np.round(quantiles[None, None, :] * n[:, :, None], 6)), 1)
+        values = np.empty(n.shape + (len(quantiles),))
+        for g in range(n.shape[0]):
+            for j in range(n.shape[1]):
+                values[g, j] = np.searchsorted(cumulative[g, j], targets[g, j])
+        low, _ = SCORE_RANGE
+        values = low + values * self.resolution
+        values[n == 0] = np.nan
+
+        labels = [f"P{q * 100:g}" for q in quantiles]
+        table = pd.DataFrame({
+            'PRUEBA': np.tile(self.columns, n.shape[0]),
+            'N': n.ravel(),
+            **{label: values[:, :, i].ravel() for i, label in enumerate(labels)}
+        })
+        if sketch.key is not None:
+            table.insert(0, sketch.key, np.repeat(sketch.groups, n.shape[1]))
+        return table
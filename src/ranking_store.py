@@ -0,0 +1,217 @@
+"""
+Almacén SQLite de rankings PAES
+Guarda los rankings de cada año en una base local con índices para consultas rápidas
+"""
+
+import sqlite3
+import pandas as pd
+import numpy as np
+from typing import Dict, List, Optional
+
+
+RANKING_COLUMNS = [
+    'RBD', 'RANK', 'PAES_PROMEDIO', 'CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL',
+    'N_ESTUDIANTES', 'CODIGO_REGION'
+]
+
+AVERAGE_COLUMNS = [
+    'RBD', 'CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL', 'MATE2_REG_ACTUAL',
+    'HCSOC_REG_ACTUAL', 'CIEN_REG_ACTUAL'
+]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ranking (
+    YEAR INTEGER NOT NULL,
+    RBD INTEGER NOT NULL,
+    RANK INTEGER,
+    PAES_PROMEDIO REAL,
+    CLEC_REG_ACTUAL REAL,
+    MATE1_REG_ACTUAL REAL,
+    N_ESTUDIANTES INTEGER,
+    CODIGO_REGION INTEGER,
+    PRIMARY KEY (YEAR, RBD)
+);
+CREATE INDEX IF NOT EXISTS idx_ranking_year_rank ON ranking (YEAR, RANK);
+CREATE INDEX IF NOT EXISTS idx_ranking_region ON ranking (CODIGO_REGION, YEAR, RANK);
+CREATE INDEX IF NOT EXISTS idx_ranking_rbd ON ranking (RBD, YEAR);
+CREATE TABLE IF NOT EXISTS promedios (
+    YEAR INTEGER NOT NULL,
+    RBD INTEGER NOT NULL,
+    CLEC_REG_ACTUAL REAL,
+    MATE1_REG_ACTUAL REAL,
+    MATE2_REG_ACTUAL REAL,
+    HCSOC_REG_ACTUAL REAL,
+    CIEN_REG_ACTUAL REAL,
+    PRIMARY KEY (YEAR, RBD)
+);
+"""
+
+
+def _rows(df: pd.DataFrame, year: int, columns: List[str]) -> List[tuple]:
+    """Convierte un DataFrame en tuplas para SQLite (NaN -> NULL)."""
+    table = df.reindex(columns=columns).astype(object)
+    table = table.where(table.notna(), None)
+    return [
+        (year,) + tuple(v.item() if isinstance(v, np.generic) else v for v in row)
+        for row in table.itertuples(index=False, name=None)
+    ]
+
+
+def _round(value: Optional[float], digits: int) -> Optional[float]:
+    """Redondea un valor de SQLite; NULL (promedio faltante) queda en None."""
+    return None if value is None else round(value, digits)
+
+
+class RankingStore:
+    """
+    Base SQLite con los rankings y promedios por establecimiento de cada año.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Abre (o crea) la base de datos.
+
+        Args:
+            db_path: Ruta al archivo SQLite
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        """Cierra la conexión."""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write_year(self, year: int, ranking: pd.DataFrame,
+                   averages: Optional[pd.DataFrame] = None):
+        """
+        Reemplaza el ranking (y opcionalmente los promedios) de un año.
+
+        Todo se hace en una sola transacción: si algo falla, la base queda
+        como estaba.
+
+        Args:
+            year: Año de la admisión
+            ranking: DataFrame de ranking (puede incluir CODIGO_REGION)
+            averages: DataFrame de promedios por RBD (opcional)
+        """
+        placeholders = ', '.join('?' * (len(RANKING_COLUMNS) + 1))
+        with self.conn:
+            self.conn.execute("DELETE FROM ranking WHERE YEAR = ?", (year,))
+            self.conn.executemany(
+                f"INSERT INTO ranking (YEAR, {', '.join(RANKING_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                _rows(ranking, year, RANKING_COLUMNS)
+            )
+            if averages is not None:
+                placeholders = ', '.join('?' * (len(AVERAGE_COLUMNS) + 1))
+                self.conn.execute("DELETE FROM promedios WHERE YEAR = ?", (year,))
+                self.conn.executemany(
+                    f"INSERT INTO promedios (YEAR, {', '.join(AVERAGE_COLUMNS)}) "
+                    f"VALUES ({placeholders})",
+                    _rows(averages, year, AVERAGE_COLUMNS)
+                )
+
+    def years(self) -> List[int]:
+        """Años disponibles en la base."""
+        rows = self.conn.execute("SELECT DISTINCT YEAR FROM ranking ORDER BY YEAR")
+        return [row['YEAR'] for row in rows]
+
+    def get_school_position(self, year: int, rbd: int) -> Dict:
+        """
+        Posición de un establecimiento, con las mismas claves que
+        PAESAnalyzer.get_school_position.
+
+        Args:
+            year: Año de la admisión
+            rbd: Código RBD del establecimiento
+
+        Returns:
+            Diccionario con información del establecimiento o mensaje de error
+        """
+        row = self.conn.execute(
+            "SELECT r.*, (SELECT COUNT(*) FROM ranking WHERE YEAR = r.YEAR) AS TOTAL "
+            "FROM ranking r WHERE r.YEAR = ? AND r.RBD = ?",
+            (year, rbd)
+        ).fetchone()
+
+        if row is None:
+            return {
+                'error': f'El RBD {rbd} no se encuentra en el ranking',
+                'year': year
+            }
+
+        return {
+            'rbd': row['RBD'],
+            'rank': row['RANK'],
+            'paes_promedio': _round(row['PAES_PROMEDIO'], 2),
+            'clec': _round(row['CLEC_REG_ACTUAL'], 2),
+            'mate1': _round(row['MATE1_REG_ACTUAL'], 2),
+            'n_estudiantes': row['N_ESTUDIANTES'],
+            'year': year,
+            'percentil': (None if row['RANK'] is None
+                          else round((1 - row['RANK'] / row['TOTAL']) * 100, 1))
+        }
+
+    def get_top_schools(self, year: int, n: int = 10,
+                        region: Optional[int] = None) -> List[Dict]:
+        """
+        Mejores n establecimientos de un año, opcionalmente de una región.
+
+        Args:
+            year: Año de la admisión
+            n: Número de establecimientos
+            region: Código de región (opcional)
+
+        Returns:
+            Lista de filas como diccionarios
+        """
+        if region is None:
+            rows = self.conn.execute(
+                "SELECT * FROM ranking WHERE YEAR = ? ORDER BY RANK IS NULL, RANK LIMIT ?",
+                (year, n)
+            )
+        else:
+            rows = self.conn.execute(
+                "SELECT * FROM ranking WHERE CODIGO_REGION = ? AND YEAR = ? "
+                "ORDER BY RANK IS NULL, RANK LIMIT ?",
+                (region, year, n)
+            )
+        return [dict(row) for row in rows]
+
+    def get_school_history(self, rbd: int) -> List[Dict]:
+        """
+        Ranking de un establecimiento en todos los años guardados.
+
+        Args:
+            rbd: Código RBD del establecimiento
+
+        Returns:
+            Lista de filas (una por año) ordenadas por año
+        """
+        rows = self.conn.execute(
+            "SELECT * FROM ranking WHERE RBD = ? ORDER BY YEAR", (rbd,)
+        )
+        return [dict(row) for row in rows]
+
+    def read_ranking(self, year: int) -> pd.DataFrame:
+        """
+        Lee el ranking completo de un año como DataFrame.
+
+        Args:
+            year: Año de la admisión
+
+        Returns:
+            DataFrame ordenado por ranking (establecimientos sin ranking al final)
+        """
+        return pd.read_sql_query(
+            "SELECT * FROM ranking WHERE YEAR = ? ORDER BY RANK IS NULL, RANK",
+            self.conn, params=(year,)
+        ).drop(columns='YEAR')
@@ -0,0 +1,166 @@
+"""
+Rankings por escenarios de ponderación PAES
+Evalúa muchas fórmulas ponderadas sobre la misma matriz de promedios por RBD
+con un solo producto matricial
+"""
+
+import json
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .aggregates import SchoolAggregates
+except ImportError:
+    from aggregates import SchoolAggregates
+
+
+class Scenario:
+    """
+    Fórmula de puntaje: promedio ponderado de los promedios por prueba de
+    cada establecimiento, con filtros opcionales.
+
+    Como en el ranking oficial, si a un establecimiento le falta el promedio
+    de alguna prueba, el puntaje se calcula con las pruebas disponibles
+    (los pesos se renormalizan), salvo que require_all sea True.
+    """
+
+    def __init__(self, name: str, weights: Dict[str, float], min_students: int = 0,
+                 require_all: bool = False):
+        """
+        Define un escenario.
+
+        Args:
+            name: Nombre del escenario (sufijo de sus columnas)
+            weights: Columna de puntaje -> peso
+            min_students: Mínimo de estudiantes para entrar al ranking
+            require_all: Si es True, se excluyen establecimientos sin
+                        promedio en alguna de las pruebas con peso
+        """
+        if not weights:
+            raise ValueError(f"El escenario {name} no tiene pesos")
+        invalid = sorted(col for col, weight in weights.items()
+                         if isinstance(weight, bool) or not isinstance(weight, (int, float))
+                         or not np.isfinite(weight))
+        if invalid:
+            raise ValueError(f"El escenario {name} tiene pesos no numéricos: "
+                             f"{', '.join(invalid)}")
+        if not any(weight > 0 for weight in weights.values()):
+            raise ValueError(f"El escenario {name} no tiene pesos positivos")
+        self.name = name
+        self.weights = dict(weights)
+        self.min_students = min_students
+        self.require_all = require_all
+
+    @classmethod
+    def from_dict(cls, spec: Dict) -> 'Scenario':
+        """
+        Crea un escenario desde un diccionario (formato JSON).
+
+        Args:
+            spec: {'nombre': ..., 'pesos': {columna: peso},
+                   'min_estudiantes': 0, 'requiere_todas': False}
+
+        Returns:
+            Scenario
+
+        Raises:
+            ValueError: Si faltan 'nombre' o 'pesos', o los pesos no son válidos
+        """
+        if not isinstance(spec, dict):
+            raise ValueError(f"Cada escenario debe ser un objeto JSON, no {spec!r}")
+        missing = [key for key in ('nombre', 'pesos') if key not in spec]
+        if missing:
+            raise ValueError(f"Escenario {spec.get('nombre', spec)!r} sin "
+                             f"{', '.join(missing)}")
+        if not isinstance(spec['pesos'], dict):
+            raise ValueError(f"Los pesos del escenario {spec['nombre']} deben ser "
+                             f"un objeto {{columna: peso}}")
+        return cls(spec['nombre'], spec['pesos'],
+                   min_students=spec.get('min_estudiantes', 0),
+                   require_all=spec.get('requiere_todas', False))
+
+
+# Escenario equivalente al ranking de create_ranking
+BASE_SCENARIO = Scenario('PAES_PROMEDIO', {'CLEC_REG_ACTUAL': 1, 'MATE1_REG_ACTUAL': 1})
+
+
+def load_scenarios(path: str) -> List[Scenario]:
+    """
+    Lee escenarios desde un archivo JSON con una lista de especificaciones.
+
+    Args:
+        path: Ruta al archivo JSON (ver Scenario.from_dict)
+
+    Returns:
+        Lista de escenarios
+
+    Raises:
+        ValueError: Si el archivo no es JSON válido o algún escenario no lo es
+    """
+    with open(path, encoding='utf-8') as f:
+        specs = json.load(f)
+    if not isinstance(specs, list) or not specs:
+        raise ValueError("El archivo debe contener una lista no vacía de escenarios")
+    scenarios = [Scenario.from_dict(spec) for spec in specs]
+    names = [scenario.name for scenario in scenarios]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Escenarios con nombre repetido: {', '.join(duplicated)}")
+    return scenarios
+
+
+def rank_scenarios(aggregates: SchoolAggregates, scenarios: List[Scenario]) -> pd.DataFrame:
+    """
+    Puntaje y posición de cada establecimiento en todos los escenarios.
+
+    Con M la matriz de promedios (RBD x prueba, 0 donde falta), D la matriz
+    de disponibilidad (1 si hay promedio) y W la matriz de pesos
+    (prueba x escenario), el puntaje es (M @ W) / (D @ W).
+
+    Args:
+        aggregates: Agregados por RBD con las columnas usadas en los pesos
+        scenarios: Escenarios a evaluar
+
+    Returns:
+        DataFrame por RBD con N_ESTUDIANTES y, por escenario, PUNTAJE_{nombre}
+        y RANK_{nombre} (NaN si el establecimiento no cumple los filtros)
+    """
+    names = [scenario.name for scenario in scenarios]
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Escenarios con nombre repetido: {', '.join(duplicated)}")
+    missing = sorted({col for scenario in scenarios for col in scenario.weights
+                      if col not in aggregates.columns})
+    if missing:
+        raise ValueError(f"Columnas no disponibles: {', '.join(missing)}. "
+                         f"Use {aggregates.columns}")
+
+    columns = aggregates.columns
+    weights = np.array([[scenario.weights.get(col, 0.0) for scenario in scenarios]
+                        for col in columns], dtype=np.float64)
+    available = aggregates.counts > 0
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(available, aggregates.sums / np.where(available, aggregates.counts, 1), 0.0)
+        scores = (means @ weights) / (available @ weights)
+
+    # Filtros: pruebas faltantes y mínimo de estudiantes
+    exclude = np.zeros(scores.shape, dtype=bool)
+    require_all = np.array([scenario.require_all for scenario in scenarios])
+    if require_all.any():
+        lacking = (~available).astype(np.float64) @ (weights != 0)
+        exclude |= (lacking > 0) & require_all
+    min_students = np.array([scenario.min_students for scenario in scenarios])
+    exclude |= aggregates.sizes[:, None] < min_students
+    scores[exclude | ~np.isfinite(scores)] = np.nan
+
+    index = aggregates.index
+    score_table = pd.DataFrame(scores, index=index, columns=names)
+    ranks = score_table.rank(ascending=False, method='min')
+
+    result = pd.DataFrame({'N_ESTUDIANTES': aggregates.sizes}, index=index)
+    for name in names:
+        result[f'PUNTAJE_{name}'] = score_table[name]
+        result[f'RANK_{name}'] = ranks[name].astype('Int64')
+    return result.reset_index()
@@ -0,0 +1,198 @@
+"""
+Validación previa del esquema de archivos ArchivoC
+Lee solo el encabezado y una muestra de filas para detectar columnas faltantes,
+renombradas o con tipos inesperados antes de cargar el archivo completo
+"""
+
+import difflib
+import time
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+try:
+    from .column_store import ColumnStore, is_store
+    from .data_source import open_source
+except ImportError:
+    from column_store import ColumnStore, is_store
+    from data_source import open_source
+
+
+# Columnas sin las cuales no se puede construir el ranking
+REQUIRED_COLUMNS = ['RBD', 'SITUACION_EGRESO', 'CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL']
+
+# Tipo esperado de cada columna conocida: 'entero' o 'puntaje'
+COLUMN_KINDS = {
+    'RBD': 'entero',
+    'SITUACION_EGRESO': 'entero',
+    'CLEC_REG_ACTUAL': 'puntaje',
+    'MATE1_REG_ACTUAL': 'puntaje',
+    'MATE2_REG_ACTUAL': 'puntaje',
+    'HCSOC_REG_ACTUAL': 'puntaje',
+    'CIEN_REG_ACTUAL': 'puntaje',
+    'CODIGO_REGION': 'entero',
+    'CODIGO_COMUNA': 'entero',
+    'GRUPO_DEPENDENCIA': 'entero'
+}
+
+# Códigos territoriales opcionales: al cargar, los valores no numéricos quedan
+# como faltantes (ver cube.school_attributes), por lo que en la muestra solo
+# generan advertencias
+CODE_COLUMNS = ['CODIGO_REGION', 'CODIGO_COMUNA', 'GRUPO_DEPENDENCIA']
+
+# Rango válido de puntajes PAES (0 = sin puntaje en algunos archivos)
+SCORE_RANGE = (0, 1000)
+
+# Nombres alternativos por año de admisión (nombre en el archivo -> nombre canónico).
+# La clave None aplica a todos los años. Agregar aquí los cambios de formato de DEMRE.
+SCHEMA_REGISTRY: Dict[Optional[int], Dict[str, str]] = {
+    None: {
+        'SITUACION_EGRESO_ACTUAL': 'SITUACION_EGRESO',
+        'COD_REGION': 'CODIGO_REGION',
+        'COD_COMUNA': 'CODIGO_COMUNA'
+    },
+    2023: {
+        'CLEC_ACTUAL': 'CLEC_REG_ACTUAL',
+        'MATE1_ACTUAL': 'MATE1_REG_ACTUAL',
+        'MATE2_ACTUAL': 'MATE2_REG_ACTUAL',
+        'HCSOC_ACTUAL': 'HCSOC_REG_ACTUAL',
+        'CIEN_ACTUAL': 'CIEN_REG_ACTUAL'
+    },
+    2024: {},
+    2025: {}
+}
+
+# Filas leídas para revisar tipos
+SAMPLE_ROWS = 1000
+
+
+def column_renames(header: Iterable[str], year: Optional[int] = None) -> Dict[str, str]:
+    """
+    Renombres necesarios para llevar un encabezado a los nombres canónicos.
+
+    Normaliza espacios y mayúsculas y aplica los nombres alternativos del
+    año (y los comunes a todos los años) de SCHEMA_REGISTRY. Un alias no se
+    usa si el archivo ya trae la columna canónica.
+
+    Args:
+        header: Nombres de columnas del archivo
+        year: Año de la admisión
+
+    Returns:
+        Diccionario nombre en el archivo -> nombre canónico (solo los que cambian)
+    """
+    aliases = dict(SCHEMA_REGISTRY[None])
+    aliases.update(SCHEMA_REGISTRY.get(year, {}))
+
+    header = list(header)
+    present = {col.strip().upper() for col in header}
+    renames = {}
+    for col in header:
+        name = col.strip().upper()
+        canonical = aliases.get(name, name)
+        if canonical != name and canonical in present:
+            canonical = name
+        if canonical != col:
+            renames[col] = canonical
+    return renames
+
+
+def _check_column(name: str, kind: str, values: pd.Series) -> List[str]:
+    """Revisa los valores de muestra de una columna; devuelve los errores."""
+    present = values.dropna()
+    present = present[present.str.strip() != '']
+    numbers = pd.to_numeric(present, errors='coerce')
+
+    invalid = present[numbers.isna()]
+    if len(invalid):
+        return [f"{name}: {len(invalid)} valores no numéricos en la muestra "
+                f"(ej: {invalid.iloc[0]!r})"]
+    if kind == 'entero' and (numbers % 1 != 0).any():
+        return [f"{name}: se esperaban enteros (ej: {numbers[numbers % 1 != 0].iloc[0]})"]
+    if kind == 'puntaje':
+        low, high = SCORE_RANGE
+        outside = numbers[(numbers < low) | (numbers > high)]
+        if len(outside):
+            return [f"{name}: puntajes fuera de rango {SCORE_RANGE} (ej: {outside.iloc[0]})"]
+    return []
+
+
+def validate_source(file_path: str, year: Optional[int] = None,
+                    sample_rows: int = SAMPLE_ROWS, strict: bool = True) -> Dict:
+    """
+    Valida un archivo ArchivoC leyendo solo el encabezado y una muestra.
+
+    Args:
+        file_path: Ruta al archivo (ver data_source.open_source)
+        year: Año de la admisión, para los renombres de SCHEMA_REGISTRY
+        sample_rows: Filas de muestra para revisar tipos
+        strict: Si es True, lanza ValueError cuando hay errores
+
+    Returns:
+        Diccionario con archivo, year, columnas, renombres, faltantes
+        (columnas conocidas opcionales ausentes), errores, advertencias,
+        filas_muestra y segundos
+    """
+    start = time.perf_counter()
+    errors, warnings_ = [], []
+
+    if is_store(file_path):
+        # Almacén columnar: tipos fijados al crearlo, solo se revisan columnas
+        sample = pd.DataFrame(columns=ColumnStore(file_path).columns, dtype=str)
+    else:
+        with open_source(file_path, year) as source:
+            sample = pd.read_csv(source, sep=';', nrows=sample_rows, dtype=str,
+                                 keep_default_na=False, na_values=[''])
+    header = list(sample.columns)
+
+    wrong_separator = len(header) == 1 and any(sep in header[0] for sep in (',', '\t', '|'))
+    if wrong_separator:
+        errors.append("El archivo no usa ';' como separador")
+
+    renames = column_renames(header, year)
+    columns = [renames.get(col, col) for col in header]
+    sample.columns = columns
+
+    duplicated = sorted({col for col in columns if columns.count(col) > 1})
+    if duplicated:
+        errors.append(f"Columnas duplicadas tras normalizar: {', '.join(duplicated)}")
+
+    # Sugerencias solo entre columnas que no son ya columnas conocidas
+    unknown = {new: old for old, new in zip(header, columns) if new not in COLUMN_KINDS}
+    for col in REQUIRED_COLUMNS:
+        if col not in columns and not wrong_separator:
+            similar = difflib.get_close_matches(col, list(unknown), n=1)
+            hint = f" (¿{unknown[similar[0]]}?)" if similar else ''
+            errors.append(f"Falta la columna requerida {col}{hint}")
+
+    if not duplicated:
+        for col, kind in COLUMN_KINDS.items():
+            if col not in columns:
+                continue
+            problems = _check_column(col, kind, sample[col])
+            if col in CODE_COLUMNS:
+                warnings_.extend(f"{problem}; se tratarán como faltantes"
+                                 for problem in problems)
+            else:
+                errors.extend(problems)
+
+    if 'SITUACION_EGRESO' in columns and not errors and len(sample):
+        if not (pd.to_numeric(sample['SITUACION_EGRESO'], errors='coerce') == 1).any():
+            warnings_.append("Ningún egresado regular (SITUACION_EGRESO = 1) en la muestra")
+
+    report = {
+        'archivo': file_path,
+        'year': year,
+        'columnas': len(header),
+        'renombres': renames,
+        'faltantes': [col for col in COLUMN_KINDS
+                      if col not in columns and col not in REQUIRED_COLUMNS],
+        'errores': errors,
+        'advertencias': warnings_,
+        'filas_muestra': len(sample),
+        'segundos': round(time.perf_counter() - start, 4)
+    }
+
+    if strict and errors:
+        raise ValueError(f"Esquema inválido en {file_path}:\n  - " + "\n  - ".join(errors))
+    return report
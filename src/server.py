@@ -0,0 +1,344 @@
+"""
+Servicio HTTP de consultas PAES
+Carga una vez los rankings precalculados de todos los años y responde consultas en JSON
+
+Uso:
+    python -m src.server --sqlite outputs/rankings.db --port 8000
+    python -m src.server --ranking outputs/ranking_paes_2024.csv,2024 outputs/ranking_paes_2025.csv,2025
+"""
+
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+try:
+    from .paes_analyzer import PAESAnalyzer
+    from .pipeline import parse_year_source
+    from .ranking_store import RankingStore
+except ImportError:
+    from paes_analyzer import PAESAnalyzer
+    from pipeline import parse_year_source
+    from ranking_store import RankingStore
+
+
+# Latencias guardadas por endpoint para calcular percentiles
+LATENCY_WINDOW = 10_000
+
+# Endpoints de consulta (los que se registran en las métricas)
+ENDPOINTS = ('years', 'position', 'top', 'statistics', 'compare')
+
+
+class InvalidParameter(ValueError):
+    """Parámetro de consulta con formato inválido (respuesta 400)."""
+
+
+def _int_param(params: Dict, key: str, default: Optional[int] = None) -> int:
+    """
+    Lee un parámetro entero de la consulta.
+
+    Raises:
+        KeyError: Si falta y no tiene valor por defecto
+        InvalidParameter: Si no es un entero
+    """
+    if key not in params and default is not None:
+        return default
+    try:
+        return int(params[key])
+    except ValueError:
+        raise InvalidParameter(f"{key}={params[key]!r} no es un entero") from None
+
+
+class LatencyMetrics:
+    """
+    Latencias recientes por endpoint (seguro entre hilos).
+    """
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        """
+        Args:
+            window: Número de mediciones recientes guardadas por endpoint
+        """
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._counts = {}
+
+    def record(self, endpoint: str, seconds: float):
+        """Registra la duración de una solicitud."""
+        with self._lock:
+            if endpoint not in self._samples:
+                self._samples[endpoint] = deque(maxlen=self.window)
+                self._counts[endpoint] = 0
+            self._samples[endpoint].append(seconds)
+            self._counts[endpoint] += 1
+
+    def summary(self) -> Dict:
+        """Solicitudes totales y latencias (ms) por endpoint."""
+        with self._lock:
+            snapshot = {name: np.array(values) for name, values in self._samples.items()}
+            counts = dict(self._counts)
+
+        summary = {}
+        for name, values in snapshot.items():
+            values_ms = values * 1000
+            summary[name] = {
+                'solicitudes': counts[name],
+                'promedio_ms': round(float(values_ms.mean()), 3),
+                'p50_ms': round(float(np.percentile(values_ms, 50)), 3),
+                'p99_ms': round(float(np.percentile(values_ms, 99)), 3),
+                'max_ms': round(float(values_ms.max()), 3)
+            }
+        return summary
+
+
+class RankingService:
+    """
+    Rankings de todos los años en memoria, consultados con los métodos de PAESAnalyzer.
+    """
+
+    def __init__(self, analyzers: List[PAESAnalyzer]):
+        """
+        Args:
+            analyzers: Analizadores con ranking ya calculado (uno por año)
+        """
+        self.analyzers = {analyzer.year: analyzer for analyzer in analyzers}
+        self.metrics = LatencyMetrics()
+
+        # Índices y estadísticas se calculan una vez al iniciar
+        self.statistics = {}
+        for year, analyzer in self.analyzers.items():
+            analyzer._ranking_index()
+            self.statistics[year] = analyzer.get_statistics()
+
+    @classmethod
+    def from_sqlite(cls, db_path: str) -> 'RankingService':
+        """
+        Carga todos los años de una base creada con export_ranking(format='sqlite').
+
+        Args:
+            db_path: Ruta al archivo SQLite
+
+        Returns:
+            RankingService con un analizador por año
+        """
+        analyzers = []
+        with RankingStore(db_path) as store:
+            for year in store.years():
+                analyzer = PAESAnalyzer(db_path, year)
+                analyzer.ranking = store.read_ranking(year)
+                analyzers.append(analyzer)
+        return cls(analyzers)
+
+    @classmethod
+    def from_csv(cls, sources: List[str]) -> 'RankingService':
+        """
+        Carga rankings exportados en CSV.
+
+        Args:
+            sources: Lista de pares 'ruta,año'
+
+        Returns:
+            RankingService con un analizador por año
+        """
+        analyzers = []
+        for source in sources:
+            file_path, year = parse_year_source(source)
+            analyzer = PAESAnalyzer(file_path, year)
+            analyzer.ranking = pd.read_csv(file_path, encoding='utf-8-sig')
+            analyzers.append(analyzer)
+        return cls(analyzers)
+
+    def _analyzer(self, params: Dict, key: str = 'year') -> PAESAnalyzer:
+        year = _int_param(params, key)
+        if year not in self.analyzers:
+            raise LookupError(f'Año {year} no disponible')
+        return self.analyzers[year]
+
+    def handle(self, endpoint: str, params: Dict) -> Dict:
+        """
+        Resuelve una consulta.
+
+        Args:
+            endpoint: Nombre del endpoint ('position', 'top', 'statistics', ...)
+            params: Parámetros de la consulta
+
+        Returns:
+            Respuesta serializable a JSON
+        """
+        if endpoint == 'years':
+            return {'years': sorted(self.analyzers)}
+        if endpoint == 'position':
+            return self._analyzer(params).get_school_position(_int_param(params, 'rbd'))
+        if endpoint == 'top':
+            n = _int_param(params, 'n', 10)
+            top = self._analyzer(params).get_top_schools(n)
+            return {'year': _int_param(params, 'year'), 'top': top.to_dict(orient='records')}
+        if endpoint == 'statistics':
+            return self.statistics[self._analyzer(params).year]
+        if endpoint == 'compare':
+            analyzer1 = self._analyzer(params, 'year1')
+            analyzer2 = self._analyzer(params, 'year2')
+            return analyzer1.compare_years(analyzer2, _int_param(params, 'rbd'))
+        if endpoint == 'metrics':
+            return self.metrics.summary()
+        raise LookupError(f'Endpoint no encontrado: {endpoint}')
+
+
+def _json_default(value):
+    """Convierte tipos numpy a tipos nativos para JSON."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'Tipo no serializable: {type(value).__name__}')
+
+
+def _json_safe(value):
+    """Reemplaza NaN, infinitos y pd.NA por None (null en JSON)."""
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if value is pd.NA:
+        return None
+    return value
+
+
+def make_handler(service: RankingService):
+    """
+    Crea la clase de handler HTTP asociada a un servicio.
+
+    Args:
+        service: Servicio de rankings
+
+    Returns:
+        Subclase de BaseHTTPRequestHandler
+    """
+
+    class RankingHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            start = time.perf_counter()
+            url = urlparse(self.path)
+            endpoint = url.path.strip('/') or 'years'
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+            try:
+                body = service.handle(endpoint, params)
+                status = 200
+            except KeyError as e:
+                body, status = {'error': f'Falta el parámetro {e}'}, 400
+            except LookupError as e:
+                body, status = {'error': str(e).strip("'")}, 404
+            except InvalidParameter as e:
+                body, status = {'error': f'Parámetro inválido: {e}'}, 400
+            except Exception as e:
+                body, status = {'error': f'Error interno: {type(e).__name__}: {e}'}, 500
+
+            # NaN no es JSON válido: los promedios faltantes se envían como null
+            payload = json.dumps(_json_safe(body), ensure_ascii=False, allow_nan=False,
+                                 default=_json_default).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+            if endpoint in ENDPOINTS:
+                service.metrics.record(endpoint, time.perf_counter() - start)
+
+        def log_message(self, format, *args):
+            # Las métricas reemplazan el log por solicitud
+            pass
+
+    return RankingHandler
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    Servidor HTTP que atiende cada conexión en un pool de hilos de tamaño fijo.
+    """
+
+    request_queue_size = 1024
+    daemon_threads = True
+
+    def __init__(self, address, handler, workers: int = 32):
+        super().__init__(address, handler)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def process_request(self, request, client_address):
+        self.executor.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self.executor.shutdown(wait=False)
+
+
+def serve(service: RankingService, host: str = '127.0.0.1', port: int = 8000,
+          workers: int = 32):
+    """
+    Inicia el servidor y atiende solicitudes hasta Ctrl+C.
+
+    Args:
+        service: Servicio de rankings
+        host: Dirección de escucha
+        port: Puerto
+        workers: Hilos del pool
+    """
+    server = PooledHTTPServer((host, port), make_handler(service), workers=workers)
+    print(f"✓ Servicio PAES escuchando en http://{host}:{port} "
+          f"(años: {', '.join(map(str, sorted(service.analyzers)))})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main(argv: Optional[List[str]] = None):
+    """Punto de entrada del servicio."""
+    parser = argparse.ArgumentParser(
+        description='Servicio HTTP de consultas de rankings PAES'
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--sqlite', type=str,
+                        help='Base SQLite con rankings (ver main.py --sqlite)')
+    source.add_argument('--ranking', type=str, nargs='+',
+                        help='Rankings exportados en CSV (formato: ruta,año)')
+    parser.add_argument('--host', type=str, default='127.0.0.1',
+                        help='Dirección de escucha (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8000,
+                        help='Puerto (default: 8000)')
+    parser.add_argument('--workers', type=int, default=32,
+                        help='Hilos para atender solicitudes (default: 32)')
+    args = parser.parse_args(argv)
+
+    if args.sqlite:
+        service = RankingService.from_sqlite(args.sqlite)
+    else:
+        service = RankingService.from_csv(args.ranking)
+
+    serve(service, args.host, args.port, args.workers)
+
+
+if __name__ == '__main__':
+    main()
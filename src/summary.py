@@ -0,0 +1,212 @@
+"""
+Resumen precalculado de un ranking PAES
+Momentos, cuantiles, histogramas y top N calculados una vez y compartidos
+por las estadísticas exportadas y todos los gráficos
+"""
+
+import pandas as pd
+import numpy as np
+from typing import Dict, Optional, Tuple
+
+
+# Sobre este número de valores la distribución acumulada se calcula desde un
+# histograma y los box plots no guardan puntos atípicos individuales
+LARGE_N_THRESHOLD = 50_000
+
+# Intervalos del histograma de puntajes y de la distribución acumulada
+HISTOGRAM_BINS = 50
+CDF_BINS = 1000
+
+# Columnas resumidas
+SUMMARY_COLUMNS = ['PAES_PROMEDIO', 'CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL']
+
+
+def _box_stats(values: np.ndarray, q1: float, median: float, q3: float,
+               keep_fliers: bool) -> Dict:
+    """Estadísticos de un box plot (bigotes a 1.5 IQR), en el formato de Axes.bxp."""
+    iqr = q3 - q1
+    low, high = q1 - 1.5 * iqr, q3 + 1.5 * iqr
+    inside = (values >= low) & (values <= high)
+    return {
+        'med': median, 'q1': q1, 'q3': q3,
+        'whislo': values[inside].min(), 'whishi': values[inside].max(),
+        'fliers': values[~inside] if keep_fliers else np.empty(0)
+    }
+
+
+class RankingSummary:
+    """
+    Resumen de un ranking calculado en una sola pasada por columna.
+
+    Contiene, para PAES_PROMEDIO, CLEC_REG_ACTUAL y MATE1_REG_ACTUAL, la media,
+    desviación estándar, mínimo, máximo, cuartiles y estadísticos de box plot;
+    además el histograma y la distribución acumulada de PAES_PROMEDIO y los
+    primeros establecimientos del ranking. get_statistics y PAESVisualizer
+    leen todos sus números de aquí, por lo que gráficos y JSON coinciden.
+    """
+
+    def __init__(self, year: Optional[int], n_schools: int, n_students: int,
+                 moments: Dict[str, Dict], boxes: Dict[str, Dict],
+                 histogram: Tuple[np.ndarray, np.ndarray],
+                 cdf: Tuple[np.ndarray, np.ndarray], top: pd.DataFrame,
+                 cdf_exact: bool = True):
+        """
+        Inicializa el resumen (usar from_ranking).
+
+        Args:
+            year: Año de la admisión
+            n_schools: Establecimientos en el ranking
+            n_students: Estudiantes considerados
+            moments: Por columna: n, media, desviacion, minimo, maximo, mediana
+            boxes: Por columna: estadísticos de box plot
+            histogram: (conteos, bordes) de PAES_PROMEDIO
+            cdf: (puntajes, percentil %) de PAES_PROMEDIO
+            top: Primeras filas del ranking
+            cdf_exact: True si cdf contiene todos los puntajes ordenados;
+                      False si son los bordes de un histograma de CDF_BINS
+        """
+        self.year = year
+        self.n_schools = n_schools
+        self.n_students = n_students
+        self.moments = moments
+        self.boxes = boxes
+        self.histogram = histogram
+        self.cdf = cdf
+        self.cdf_exact = cdf_exact
+        self.top = top
+
+    @classmethod
+    def from_ranking(cls, ranking: pd.DataFrame, year: Optional[int] = None,
+                     top_n: int = 20, bins: int = HISTOGRAM_BINS,
+                     large_n_threshold: int = LARGE_N_THRESHOLD) -> 'RankingSummary':
+        """
+        Calcula el resumen de un ranking (o de datos por estudiante con las
+        mismas columnas).
+
+        Args:
+            ranking: DataFrame con PAES_PROMEDIO, CLEC_REG_ACTUAL y
+                    MATE1_REG_ACTUAL, y N_ESTUDIANTES si es un ranking (sin
+                    esa columna, cada fila cuenta como un estudiante)
+            year: Año de la admisión
+            top_n: Filas del top guardadas
+            bins: Intervalos del histograma de PAES_PROMEDIO
+            large_n_threshold: Desde este tamaño la distribución acumulada se
+                              calcula con histograma y no se guardan atípicos
+
+        Returns:
+            RankingSummary
+        """
+        moments, boxes = {}, {}
+        paes = None
+        for column in SUMMARY_COLUMNS:
+            values = ranking[column].dropna().to_numpy(dtype='float64')
+            if len(values) == 0:
+                moments[column] = {'n': 0, 'media': np.nan, 'desviacion': np.nan,
+                                   'minimo': np.nan, 'maximo': np.nan,
+                                   'mediana': np.nan}
+                boxes[column] = None
+                continue
+            q1, median, q3 = np.percentile(values, [25, 50, 75])
+            moments[column] = {
+                'n': len(values),
+                'media': values.mean(),
+                'desviacion': values.std(ddof=1) if len(values) > 1 else np.nan,
+                'minimo': values.min(),
+                'maximo': values.max(),
+                'mediana': median
+            }
+            boxes[column] = _box_stats(values, q1, median, q3,
+                                       keep_fliers=len(values) <= large_n_threshold)
+            if column == 'PAES_PROMEDIO':
+                paes = values
+
+        if paes is None:
+            paes = np.empty(0)
+        histogram = np.histogram(paes, bins=bins)
+
+        cdf_exact = len(paes) <= large_n_threshold
+        if cdf_exact:
+            cdf = (np.sort(paes), np.arange(1, len(paes) + 1) / max(len(paes), 1) * 100)
+        else:
+            counts, edges = np.histogram(paes, bins=CDF_BINS)
+            cdf = (edges, np.concatenate([[0], np.cumsum(counts)]) / len(paes) * 100)
+
+        return cls(
+            year=year,
+            n_schools=len(ranking),
+            n_students=(int(ranking['N_ESTUDIANTES'].sum())
+                        if 'N_ESTUDIANTES' in ranking.columns else len(ranking)),
+            moments=moments,
+            boxes=boxes,
+            histogram=histogram,
+            cdf=cdf,
+            top=ranking.head(top_n).copy(),
+            cdf_exact=cdf_exact
+        )
+
+    def histogram_counts(self, edges: np.ndarray) -> np.ndarray:
+        """
+        Conteos de PAES_PROMEDIO en intervalos dados, desde la distribución
+        acumulada (sin volver a los datos), por ejemplo para que dos años
+        compartan los intervalos de un gráfico.
+
+        Con la distribución exacta el resultado es igual a np.histogram; con
+        la de CDF_BINS intervalos, se interpola dentro de cada intervalo fino.
+
+        Args:
+            edges: Bordes crecientes de los intervalos
+
+        Returns:
+            Conteo por intervalo (len(edges) - 1)
+        """
+        values, percent = self.cdf
+        n = self.moments['PAES_PROMEDIO']['n']
+        edges = np.asarray(edges, dtype='float64')
+        if n == 0:
+            return np.zeros(len(edges) - 1)
+        if self.cdf_exact:
+            # Como np.histogram: intervalos [a, b) y el último cerrado
+            below = np.searchsorted(values, edges, side='left').astype('float64')
+            below[-1] = np.searchsorted(values, edges[-1], side='right')
+        else:
+            below = np.interp(edges, values, percent) / 100 * n
+        return np.diff(below)
+
+    def box(self, column: str, label: str) -> Dict:
+        """
+        Estadísticos de box plot de una columna con su etiqueta.
+
+        Args:
+            column: Columna resumida
+            label: Etiqueta del eje
+
+        Returns:
+            Diccionario para Axes.bxp (con NaN si la columna no tiene valores,
+            de modo que la caja queda vacía)
+        """
+        box = self.boxes[column]
+        if box is None:
+            box = {'med': np.nan, 'q1': np.nan, 'q3': np.nan,
+                   'whislo': np.nan, 'whishi': np.nan, 'fliers': np.empty(0)}
+        return dict(box, label=label)
+
+    def to_statistics(self) -> Dict:
+        """
+        Estadísticas generales (formato de PAESAnalyzer.get_statistics).
+
+        Returns:
+            Diccionario con estadísticas descriptivas
+        """
+        paes = self.moments['PAES_PROMEDIO']
+        return {
+            'year': self.year,
+            'total_establecimientos': self.n_schools,
+            'total_estudiantes': self.n_students,
+            'promedio_nacional': round(float(paes['media']), 2),
+            'mediana_nacional': round(float(paes['mediana']), 2),
+            'desviacion_estandar': round(float(paes['desviacion']), 2),
+            'puntaje_maximo': round(float(paes['maximo']), 2),
+            'puntaje_minimo': round(float(paes['minimo']), 2),
+            'promedio_clec': round(float(self.moments['CLEC_REG_ACTUAL']['media']), 2),
+            'promedio_mate1': round(float(self.moments['MATE1_REG_ACTUAL']['media']), 2)
+        }
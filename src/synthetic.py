@@ -0,0 +1,119 @@
+"""
+Generador de datos sintéticos con la forma de ArchivoC (DEMRE)
+Permite probar y medir el rendimiento del análisis sin los datos reales
+"""
+
+import os
+import pandas as pd
+import numpy as np
+from typing import Optional
+
+
+# Proporción de estudiantes que rinde cada prueba
+PARTICIPATION = {
+    'CLEC_REG_ACTUAL': 0.97,
+    'MATE1_REG_ACTUAL': 0.96,
+    'MATE2_REG_ACTUAL': 0.20,
+    'HCSOC_REG_ACTUAL': 0.45,
+    'CIEN_REG_ACTUAL': 0.55
+}
+
+# Distribución de SITUACION_EGRESO (1 = egreso regular)
+EGRESO_CODES = [1, 2, 3, 4]
+EGRESO_WEIGHTS = [0.80, 0.12, 0.05, 0.03]
+
+N_REGIONS = 16
+
+
+def _school_table(n_schools: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Establecimientos con RBD, región, comuna y efecto sobre el puntaje."""
+    rbd = np.sort(rng.choice(np.arange(1, 40_000), size=n_schools, replace=False))
+    region = rng.integers(1, N_REGIONS + 1, size=n_schools)
+    comuna = region * 1000 + rng.integers(1, 60, size=n_schools)
+    # Tamaño relativo del establecimiento (cola larga, como los datos reales)
+    weight = rng.lognormal(mean=0.0, sigma=0.8, size=n_schools)
+    return pd.DataFrame({
+        'RBD': rbd,
+        'CODIGO_REGION': region,
+        'CODIGO_COMUNA': comuna,
+        'EFECTO': rng.normal(0, 70, size=n_schools),
+        'PESO': weight / weight.sum()
+    })
+
+
+def generate_frame(n_rows: int, n_schools: int = 3000, seed: int = 0,
+                   schools: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+    """
+    Genera un DataFrame de estudiantes con columnas de ArchivoC.
+
+    Args:
+        n_rows: Número de estudiantes
+        n_schools: Número de establecimientos
+        seed: Semilla aleatoria
+        schools: Tabla de establecimientos (para generar bloques consistentes)
+
+    Returns:
+        DataFrame con RBD, SITUACION_EGRESO, CODIGO_REGION, CODIGO_COMUNA
+        y los cinco puntajes *_REG_ACTUAL (con valores faltantes)
+    """
+    rng = np.random.default_rng(seed)
+    if schools is None:
+        schools = _school_table(n_schools, rng)
+
+    school_idx = rng.choice(len(schools), size=n_rows, p=schools['PESO'].to_numpy())
+    effect = schools['EFECTO'].to_numpy()[school_idx]
+
+    df = pd.DataFrame({
+        'MRUN': rng.integers(10_000_000, 99_999_999, size=n_rows),
+        'RBD': schools['RBD'].to_numpy()[school_idx],
+        'SITUACION_EGRESO': rng.choice(EGRESO_CODES, size=n_rows, p=EGRESO_WEIGHTS),
+        'CODIGO_REGION': schools['CODIGO_REGION'].to_numpy()[school_idx],
+        'CODIGO_COMUNA': schools['CODIGO_COMUNA'].to_numpy()[school_idx]
+    })
+
+    ability = rng.normal(0, 60, size=n_rows)
+    for col, participation in PARTICIPATION.items():
+        scores = 500 + effect + ability + rng.normal(0, 70, size=n_rows)
+        scores = np.clip(np.round(scores), 100, 1000)
+        scores[rng.random(n_rows) >= participation] = np.nan
+        df[col] = scores
+
+    return df
+
+
+def generate_archivo_c(output_path: str, n_rows: int, n_schools: int = 3000,
+                       seed: int = 0, chunksize: int = 1_000_000) -> str:
+    """
+    Escribe un archivo ArchivoC sintético separado por ';'.
+
+    Se genera por bloques, por lo que la memoria no depende del número de
+    filas (desde 10 mil hasta 30 millones).
+
+    Args:
+        output_path: Ruta del CSV a generar
+        n_rows: Número total de estudiantes
+        n_schools: Número de establecimientos
+        seed: Semilla aleatoria
+        chunksize: Filas generadas por bloque
+
+    Returns:
+        Ruta del archivo generado
+    """
+    rng = np.random.default_rng(seed)
+    schools = _school_table(n_schools, rng)
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    written = 0
+    while written < n_rows:
+        rows = min(chunksize, n_rows - written)
+        block_seed = int(rng.integers(2 ** 63))
+        chunk = generate_frame(rows, seed=block_seed, schools=schools)
+        chunk.to_csv(output_path, sep=';', index=False, float_format='%.0f',
+                     mode='w' if written == 0 else 'a', header=written == 0)
+        written += rows
+
+    print(f"✓ Archivo sintético generado: {output_path} ({n_rows:,} registros)")
+    return output_path
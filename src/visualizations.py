@@ -1,35 +1,239 @@
 """
 Módulo de visualizaciones para análisis PAES
 Genera gráficos y visualizaciones de los resultados
+
+Este módulo importa matplotlib y seaborn, por lo que solo debe importarse
+cuando se necesitan gráficos (main.py lo hace únicamente con --visualize).
 """
 
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from typing import Optional, List
-import numpy as np
+import matplotlib
+
+
+def _select_backend():
+    """
+    Usa el backend Agg (sin ventanas) cuando no hay pantalla disponible.
+    
+    Se respeta un backend elegido explícitamente con MPLBACKEND (por ejemplo,
+    el de Jupyter) o si pyplot ya fue importado.
+    """
+    if 'MPLBACKEND' in os.environ or 'matplotlib.pyplot' in sys.modules:
+        return
+    has_display = (sys.platform in ('win32', 'darwin') 
+                   or os.environ.get('DISPLAY') 
+                   or os.environ.get('WAYLAND_DISPLAY'))
+    if not has_display:
+        matplotlib.use('Agg')
+
+
+_select_backend()
+
+import matplotlib.pyplot as plt  # noqa: E402
+import seaborn as sns  # noqa: E402
+from typing import Dict, Optional, List, Tuple  # noqa: E402
+import numpy as np  # noqa: E402
+
+try:  # noqa: E402
+    from .cube import AggregationCube
+    from .summary import HISTOGRAM_BINS, LARGE_N_THRESHOLD, RankingSummary
+except ImportError:
+    from cube import AggregationCube
+    from summary import HISTOGRAM_BINS, LARGE_N_THRESHOLD, RankingSummary
 
 # Configuración de estilo
 plt.style.use('seaborn-v0_8-darkgrid')
 sns.set_palette("husl")
 
+# Perfiles de salida: calidad vs tiempo de renderizado
+OUTPUT_PROFILES = {
+    # Revisión rápida: baja resolución, sin recorte de bordes
+    'draft': {'format': 'png', 'dpi': 72, 'bbox_inches': None},
+    # Impresión: máxima calidad (comportamiento original)
+    'print': {'format': 'png', 'dpi': 300, 'bbox_inches': 'tight'},
+    # Web: resolución de pantalla, PNG ~4 veces más liviano que 'print'
+    # (la optimización de Pillow ahorra ~2% y cuesta ~50% más de tiempo)
+    'web': {'format': 'png', 'dpi': 110, 'bbox_inches': 'tight'},
+    # Web vectorial
+    'svg': {'format': 'svg', 'bbox_inches': 'tight'}
+}
+
+# Celdas por eje del histograma 2D rectangular (promedio del color en cada
+# celda) que reemplaza la dispersión sobre LARGE_N_THRESHOLD puntos
+# (ver summary.py para histogramas y cuantiles)
+HISTOGRAM2D_BINS = 150
+
+# Un trabajo de render_batch: (nombre del método, argumentos)
+FigureJob = Tuple[str, Dict]
+
+
+def _render_job(figsize: tuple, profile: str, job: FigureJob) -> Optional[str]:
+    """Genera una figura en un proceso del pool y devuelve la ruta guardada."""
+    # La figura solo se guarda: se cierra para no acumular memoria en el pool
+    visualizer = PAESVisualizer(figsize=figsize, profile=profile, close_figures=True)
+    method, kwargs = job
+    getattr(visualizer, method)(**kwargs)
+    return visualizer.last_saved
+
 
 class PAESVisualizer:
     """
     Clase para crear visualizaciones de datos PAES.
     """
     
-    def __init__(self, figsize: tuple = (12, 6)):
+    def __init__(self, figsize: tuple = (12, 6), profile: str = 'print',
+                 close_figures: bool = False, 
+                 large_n_threshold: int = LARGE_N_THRESHOLD):
         """
         Inicializa el visualizador.
         
         Args:
             figsize: Tamaño por defecto de las figuras
+            profile: Perfil de salida ('draft', 'print', 'web' o 'svg')
+            close_figures: Cerrar cada figura después de guardarla, para que
+                          la memoria no crezca en procesos de larga duración
+                          (render_batch siempre las cierra). Por defecto 
+                          quedan abiertas para plt.show() y notebooks
+            large_n_threshold: Número de puntos desde el cual los gráficos se
+                              agregan (histograma 2D de celdas rectangulares
+                              en lugar de dispersión, histogramas y cuantiles),
+                              para que el tiempo y el tamaño no crezcan con N
         """
+        if profile not in OUTPUT_PROFILES:
+            raise ValueError(f"Perfil no soportado: {profile}. "
+                             f"Use uno de {list(OUTPUT_PROFILES)}")
         self.figsize = figsize
+        self.profile = profile
+        self.close_figures = close_figures
+        self.large_n_threshold = large_n_threshold
+        self.last_saved = None
+    
+    def _is_large(self, n: int) -> bool:
+        """Indica si n puntos superan el umbral de gráficos agregados."""
+        return n > self.large_n_threshold
+    
+    def _scatter(self, ax, x: pd.Series, y: pd.Series, c: pd.Series, 
+                 alpha: float, s: float):
+        """
+        Dispersión coloreada por c. Sobre el umbral se dibuja un histograma 2D
+        rasterizado con el promedio de c en cada celda (tamaño fijo): alpha se
+        aplica a las celdas y s no se usa, porque el tamaño lo fija la celda.
+        
+        Returns:
+            Objeto para la barra de colores
+        """
+        if not self._is_large(len(x)):
+            return ax.scatter(x, y, c=c, cmap='viridis', alpha=alpha, s=s)
+        
+        valid = (x.notna() & y.notna() & c.notna()).to_numpy()
+        x, y, c = (col.to_numpy(dtype='float64')[valid] for col in (x, y, c))
+        if len(x) == 0:
+            # Sin puntos completos: ejes vacíos con su barra de colores
+            return ax.scatter(x, y, c=c, cmap='viridis', alpha=alpha, s=s)
+        x_range = (x.min(), x.max())
+        y_range = (y.min(), y.max())
+        
+        # Celda de cada punto y promedio de c por celda, en una pasada
+        def bin_index(values, lo, hi):
+            scaled = (values - lo) / ((hi - lo) or 1) * HISTOGRAM2D_BINS
+            return np.minimum(scaled.astype(np.intp), HISTOGRAM2D_BINS - 1)
+        
+        cells = (bin_index(y, *y_range) * HISTOGRAM2D_BINS 
+                 + bin_index(x, *x_range))
+        size = HISTOGRAM2D_BINS * HISTOGRAM2D_BINS
+        counts = np.bincount(cells, minlength=size)
+        sums = np.bincount(cells, weights=c, minlength=size)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            grid = np.where(counts > 0, sums / counts, np.nan)
+        
+        return ax.imshow(grid.reshape(HISTOGRAM2D_BINS, HISTOGRAM2D_BINS), origin='lower',
+                         extent=(*x_range, *y_range), aspect='auto',
+                         cmap='viridis', interpolation='nearest', alpha=alpha)
+    
+    def _summary(self, ranking_df: pd.DataFrame, 
+                 summary: Optional[RankingSummary]) -> RankingSummary:
+        """Usa el resumen recibido o lo calcula desde el DataFrame."""
+        if summary is not None:
+            return summary
+        return RankingSummary.from_ranking(ranking_df, 
+                                           large_n_threshold=self.large_n_threshold)
+    
+    def _histogram(self, ax, summary: RankingSummary, **kwargs):
+        """Histograma de PAES_PROMEDIO desde los conteos precalculados."""
+        counts, edges = summary.histogram
+        return ax.hist(edges[:-1], bins=edges, weights=counts, **kwargs)
+    
+    def _boxplot(self, ax, boxes: List[Dict], colors: List[str]):
+        """
+        Box plots rellenos con colores, desde estadísticos precalculados
+        (RankingSummary.box).
+        """
+        bp = ax.bxp(boxes, patch_artist=True)
+        for patch, color in zip(bp['boxes'], colors):
+            patch.set_facecolor(color)
+        return bp
+    
+    def _save(self, fig, save_path: str, label: str = 'Gráfico') -> str:
+        """
+        Guarda una figura según el perfil de salida y la cierra si corresponde.
+        
+        Args:
+            fig: Figura de matplotlib
+            save_path: Ruta del archivo (la extensión se ajusta al formato del perfil)
+            label: Texto del mensaje de confirmación
+            
+        Returns:
+            Ruta del archivo guardado
+        """
+        options = dict(OUTPUT_PROFILES[self.profile])
+        extension = '.' + options['format']
+        root, current = os.path.splitext(save_path)
+        if current.lower() != extension:
+            save_path = root + extension
+        
+        fig.savefig(save_path, **options)
+        if self.close_figures:
+            plt.close(fig)
+        
+        self.last_saved = save_path
+        print(f"✓ {label} guardado en: {save_path}")
+        return save_path
+    
+    def render_batch(self, jobs: List[FigureJob], 
+                     workers: Optional[int] = None) -> List[Optional[str]]:
+        """
+        Genera varias figuras independientes en un pool de procesos.
+        
+        Cada trabajo es un par (método, argumentos), por ejemplo
+        ('plot_top_schools', {'ranking_df': ranking, 'n': 20, 'save_path': 'top.png'}).
+        Las figuras se cierran en cada proceso después de guardarse.
+        
+        Args:
+            jobs: Lista de trabajos
+            workers: Número de procesos (por defecto, uno por trabajo hasta el 
+                    número de CPU). Con 1 se genera todo en este proceso.
+            
+        Returns:
+            Rutas guardadas, en el mismo orden que jobs
+        """
+        if workers is None:
+            workers = min(len(jobs), os.cpu_count() or 1)
+        
+        if workers <= 1 or len(jobs) <= 1:
+            return [_render_job(self.figsize, self.profile, job) for job in jobs]
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(_render_job, self.figsize, self.profile, job)
+                for job in jobs
+            ]
+            return [future.result() for future in futures]
         
     def plot_top_schools(self, ranking_df: pd.DataFrame, n: int = 20, 
-                        save_path: Optional[str] = None):
+                        save_path: Optional[str] = None,
+                        summary: Optional[RankingSummary] = None):
         """
         Grafica los mejores establecimientos.
         
@@ -37,8 +241,12 @@ class PAESVisualizer:
             ranking_df: DataFrame con el ranking
             n: Número de establecimientos a mostrar
             save_path: Ruta para guardar la figura (opcional)
+            summary: Resumen precalculado del ranking (opcional)
         """
-        top_schools = ranking_df.head(n)
+        if summary is not None and n <= len(summary.top):
+            top_schools = summary.top.head(n)
+        else:
+            top_schools = ranking_df.head(n)
         
         fig, ax = plt.subplots(figsize=(14, 8))
         
@@ -71,30 +279,34 @@ class PAESVisualizer:
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"✓ Gráfico guardado en: {save_path}")
+            self._save(fig, save_path)
         
         return fig
     
     def plot_score_distribution(self, ranking_df: pd.DataFrame, 
-                               save_path: Optional[str] = None):
+                               save_path: Optional[str] = None,
+                               summary: Optional[RankingSummary] = None):
         """
         Grafica la distribución de puntajes.
         
         Args:
             ranking_df: DataFrame con el ranking
             save_path: Ruta para guardar la figura (opcional)
+            summary: Resumen precalculado del ranking (opcional)
         """
+        summary = self._summary(ranking_df, summary)
+        paes = summary.moments['PAES_PROMEDIO']
+        
         fig, axes = plt.subplots(2, 2, figsize=(14, 10))
         fig.suptitle('Distribución de Puntajes PAES', fontsize=16, fontweight='bold')
         
         # Histograma del promedio PAES
         ax1 = axes[0, 0]
-        ax1.hist(ranking_df['PAES_PROMEDIO'], bins=50, 
-                color='steelblue', edgecolor='black', alpha=0.7)
-        ax1.axvline(ranking_df['PAES_PROMEDIO'].mean(), 
+        self._histogram(ax1, summary, 
+                        color='steelblue', edgecolor='black', alpha=0.7)
+        ax1.axvline(paes['media'], 
                    color='red', linestyle='--', linewidth=2, label='Media')
-        ax1.axvline(ranking_df['PAES_PROMEDIO'].median(), 
+        ax1.axvline(paes['mediana'], 
                    color='green', linestyle='--', linewidth=2, label='Mediana')
         ax1.set_xlabel('Promedio PAES')
         ax1.set_ylabel('Frecuencia')
@@ -104,23 +316,21 @@ class PAESVisualizer:
         
         # Box plot
         ax2 = axes[0, 1]
-        bp = ax2.boxplot([ranking_df['CLEC_REG_ACTUAL'], 
-                          ranking_df['MATE1_REG_ACTUAL']], 
-                         labels=['Comprensión\nLectora', 'Matemática 1'],
-                         patch_artist=True)
-        for patch, color in zip(bp['boxes'], ['lightblue', 'lightgreen']):
-            patch.set_facecolor(color)
+        self._boxplot(ax2, 
+                      [summary.box('CLEC_REG_ACTUAL', 'Comprensión\nLectora'),
+                       summary.box('MATE1_REG_ACTUAL', 'Matemática 1')],
+                      ['lightblue', 'lightgreen'])
         ax2.set_ylabel('Puntaje')
         ax2.set_title('Distribución por Prueba')
         ax2.grid(True, alpha=0.3)
         
         # Scatter plot CLEC vs MATE1
         ax3 = axes[1, 0]
-        scatter = ax3.scatter(
+        scatter = self._scatter(
+            ax3,
             ranking_df['CLEC_REG_ACTUAL'], 
             ranking_df['MATE1_REG_ACTUAL'],
-            c=ranking_df['PAES_PROMEDIO'],
-            cmap='viridis',
+            ranking_df['PAES_PROMEDIO'],
             alpha=0.6,
             s=50
         )
@@ -132,9 +342,7 @@ class PAESVisualizer:
         
         # Distribución acumulada
         ax4 = axes[1, 1]
-        sorted_scores = np.sort(ranking_df['PAES_PROMEDIO'])
-        cumulative = np.arange(1, len(sorted_scores) + 1) / len(sorted_scores) * 100
-        ax4.plot(sorted_scores, cumulative, linewidth=2, color='darkblue')
+        ax4.plot(*summary.cdf, linewidth=2, color='darkblue')
         ax4.set_xlabel('Promedio PAES')
         ax4.set_ylabel('Percentil (%)')
         ax4.set_title('Distribución Acumulada')
@@ -143,14 +351,15 @@ class PAESVisualizer:
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"✓ Gráfico guardado en: {save_path}")
+            self._save(fig, save_path)
         
         return fig
     
     def plot_year_comparison(self, year1_df: pd.DataFrame, year2_df: pd.DataFrame,
                             year1: int, year2: int, 
-                            save_path: Optional[str] = None):
+                            save_path: Optional[str] = None,
+                            summary1: Optional[RankingSummary] = None,
+                            summary2: Optional[RankingSummary] = None):
         """
         Compara distribuciones entre dos años.
         
@@ -160,17 +369,29 @@ class PAESVisualizer:
             year1: Año 1
             year2: Año 2
             save_path: Ruta para guardar la figura (opcional)
+            summary1: Resumen precalculado del primer año (opcional)
+            summary2: Resumen precalculado del segundo año (opcional)
         """
+        summary1 = self._summary(year1_df, summary1)
+        summary2 = self._summary(year2_df, summary2)
+        
         fig, axes = plt.subplots(1, 2, figsize=(14, 6))
         fig.suptitle(f'Comparación PAES {year1} vs {year2}', 
                     fontsize=16, fontweight='bold')
         
-        # Histogramas superpuestos
+        # Histogramas superpuestos, con los mismos intervalos para ambos años,
+        # calculados desde la distribución acumulada de cada resumen
         ax1 = axes[0]
-        ax1.hist(year1_df['PAES_PROMEDIO'], bins=40, alpha=0.6, 
-                label=f'{year1}', color='blue', edgecolor='black')
-        ax1.hist(year2_df['PAES_PROMEDIO'], bins=40, alpha=0.6, 
-                label=f'{year2}', color='red', edgecolor='black')
+        bounds = [summary['PAES_PROMEDIO'][key] for summary in (summary1.moments, summary2.moments)
+                  for key in ('minimo', 'maximo')]
+        if np.isfinite(bounds).any():
+            low, high = np.nanmin(bounds), np.nanmax(bounds)
+        else:
+            low, high = 0.0, 1.0
+        edges = np.linspace(low, high if high > low else low + 1, HISTOGRAM_BINS + 1)
+        for summary, year, color in ((summary1, year1, 'blue'), (summary2, year2, 'red')):
+            ax1.hist(edges[:-1], bins=edges, weights=summary.histogram_counts(edges),
+                     alpha=0.6, label=f'{year}', color=color, edgecolor='black')
         ax1.set_xlabel('Promedio PAES')
         ax1.set_ylabel('Frecuencia')
         ax1.set_title('Distribución de Puntajes')
@@ -179,56 +400,53 @@ class PAESVisualizer:
         
         # Box plots comparativos
         ax2 = axes[1]
-        bp = ax2.boxplot(
-            [year1_df['PAES_PROMEDIO'], year2_df['PAES_PROMEDIO']], 
-            labels=[str(year1), str(year2)],
-            patch_artist=True
-        )
-        for patch, color in zip(bp['boxes'], ['lightblue', 'lightcoral']):
-            patch.set_facecolor(color)
+        self._boxplot(ax2,
+                      [summary1.box('PAES_PROMEDIO', str(year1)),
+                       summary2.box('PAES_PROMEDIO', str(year2))],
+                      ['lightblue', 'lightcoral'])
         ax2.set_ylabel('Promedio PAES')
         ax2.set_title('Comparación de Distribuciones')
         ax2.grid(True, alpha=0.3)
         
         # Agregar estadísticas
-        stats_text = f"{year1}: μ={year1_df['PAES_PROMEDIO'].mean():.1f}, σ={year1_df['PAES_PROMEDIO'].std():.1f}\n"
-        stats_text += f"{year2}: μ={year2_df['PAES_PROMEDIO'].mean():.1f}, σ={year2_df['PAES_PROMEDIO'].std():.1f}"
+        paes1 = summary1.moments['PAES_PROMEDIO']
+        paes2 = summary2.moments['PAES_PROMEDIO']
+        stats_text = f"{year1}: μ={paes1['media']:.1f}, σ={paes1['desviacion']:.1f}\n"
+        stats_text += f"{year2}: μ={paes2['media']:.1f}, σ={paes2['desviacion']:.1f}"
         fig.text(0.5, 0.02, stats_text, ha='center', fontsize=10, 
                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
         
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"✓ Gráfico guardado en: {save_path}")
+            self._save(fig, save_path)
         
         return fig
     
-    def plot_regional_comparison(self, df: pd.DataFrame, 
-                                save_path: Optional[str] = None):
+    def plot_regional_comparison(self, df: Optional[pd.DataFrame] = None, 
+                                save_path: Optional[str] = None,
+                                cube: Optional[AggregationCube] = None):
         """
         Compara puntajes por región.
         
         Args:
-            df: DataFrame con datos incluyendo columna CODIGO_REGION
+            df: DataFrame de estudiantes con columna CODIGO_REGION 
+               (no se usa si se entrega cube)
             save_path: Ruta para guardar la figura (opcional)
+            cube: Cubo de agregación precalculado (PAESAnalyzer.build_cube)
         """
-        if 'CODIGO_REGION' not in df.columns:
+        if cube is None:
+            if df is None or 'CODIGO_REGION' not in df.columns:
+                print("⚠ Columna CODIGO_REGION no encontrada")
+                return None
+            cube = AggregationCube.from_frame(df)
+        
+        if 'CODIGO_REGION' not in cube.dimensions:
             print("⚠ Columna CODIGO_REGION no encontrada")
             return None
         
-        # Calcular promedios por región
-        regional_avg = df.groupby('CODIGO_REGION').agg({
-            'CLEC_REG_ACTUAL': 'mean',
-            'MATE1_REG_ACTUAL': 'mean'
-        }).reset_index()
-        
-        regional_avg['PAES_PROMEDIO'] = (
-            regional_avg['CLEC_REG_ACTUAL'] + 
-            regional_avg['MATE1_REG_ACTUAL']
-        ) / 2
-        
-        regional_avg = regional_avg.sort_values('PAES_PROMEDIO', ascending=False)
+        # Promedios por región (ponderados por estudiante) leídos del cubo
+        regional_avg = cube.rollup('CODIGO_REGION')
         
         fig, ax = plt.subplots(figsize=(12, 8))
         
@@ -251,13 +469,13 @@ class PAESVisualizer:
         plt.tight_layout()
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"✓ Gráfico guardado en: {save_path}")
+            self._save(fig, save_path)
         
         return fig
     
     def create_summary_dashboard(self, ranking_df: pd.DataFrame, year: int,
-                                 save_path: Optional[str] = None):
+                                 save_path: Optional[str] = None,
+                                 summary: Optional[RankingSummary] = None):
         """
         Crea un dashboard resumen con múltiples gráficos.
         
@@ -265,7 +483,10 @@ class PAESVisualizer:
             ranking_df: DataFrame con el ranking
             year: Año de los datos
             save_path: Ruta para guardar la figura (opcional)
+            summary: Resumen precalculado del ranking (opcional)
         """
+        summary = self._summary(ranking_df, summary)
+        
         fig = plt.figure(figsize=(16, 10))
         gs = fig.add_gridspec(3, 3, hspace=0.3, wspace=0.3)
         
@@ -275,7 +496,7 @@ class PAESVisualizer:
         
         # 1. Top 10 establecimientos
         ax1 = fig.add_subplot(gs[0:2, 0])
-        top10 = ranking_df.head(10)
+        top10 = summary.top.head(10)
         bars = ax1.barh(range(len(top10)), top10['PAES_PROMEDIO'],
                        color=plt.cm.viridis(np.linspace(0, 1, len(top10))))
         ax1.set_yticks(range(len(top10)))
@@ -286,9 +507,9 @@ class PAESVisualizer:
         
         # 2. Distribución de puntajes
         ax2 = fig.add_subplot(gs[0, 1:])
-        ax2.hist(ranking_df['PAES_PROMEDIO'], bins=50, 
-                color='steelblue', edgecolor='black', alpha=0.7)
-        ax2.axvline(ranking_df['PAES_PROMEDIO'].mean(), 
+        self._histogram(ax2, summary, 
+                        color='steelblue', edgecolor='black', alpha=0.7)
+        ax2.axvline(summary.moments['PAES_PROMEDIO']['media'], 
                    color='red', linestyle='--', linewidth=2, label='Media')
         ax2.set_xlabel('Promedio PAES')
         ax2.set_ylabel('Frecuencia')
@@ -297,21 +518,20 @@ class PAESVisualizer:
         
         # 3. Box plots por prueba
         ax3 = fig.add_subplot(gs[1, 1])
-        bp = ax3.boxplot([ranking_df['CLEC_REG_ACTUAL'], 
-                          ranking_df['MATE1_REG_ACTUAL']], 
-                         labels=['CLEC', 'MATE1'],
-                         patch_artist=True)
-        for patch, color in zip(bp['boxes'], ['lightblue', 'lightgreen']):
-            patch.set_facecolor(color)
+        self._boxplot(ax3,
+                      [summary.box('CLEC_REG_ACTUAL', 'CLEC'),
+                       summary.box('MATE1_REG_ACTUAL', 'MATE1')],
+                      ['lightblue', 'lightgreen'])
         ax3.set_ylabel('Puntaje')
         ax3.set_title('Distribución por Prueba', fontweight='bold')
         
         # 4. Scatter CLEC vs MATE1
         ax4 = fig.add_subplot(gs[1, 2])
-        scatter = ax4.scatter(ranking_df['CLEC_REG_ACTUAL'], 
-                             ranking_df['MATE1_REG_ACTUAL'],
-                             c=ranking_df['PAES_PROMEDIO'],
-                             cmap='viridis', alpha=0.5, s=30)
+        self._scatter(ax4,
+                      ranking_df['CLEC_REG_ACTUAL'], 
+                      ranking_df['MATE1_REG_ACTUAL'],
+                      ranking_df['PAES_PROMEDIO'],
+                      alpha=0.5, s=30)
         ax4.set_xlabel('CLEC')
         ax4.set_ylabel('MATE1')
         ax4.set_title('CLEC vs MATE1', fontweight='bold')
@@ -320,14 +540,16 @@ class PAESVisualizer:
         ax5 = fig.add_subplot(gs[2, :])
         ax5.axis('off')
         
+        # Mismos números que get_statistics / estadisticas_paes_{año}.json
+        statistics = summary.to_statistics()
         stats = {
-            'Total Establecimientos': f"{len(ranking_df):,}",
-            'Total Estudiantes': f"{int(ranking_df['N_ESTUDIANTES'].sum()):,}",
-            'Promedio Nacional': f"{ranking_df['PAES_PROMEDIO'].mean():.2f}",
-            'Mediana': f"{ranking_df['PAES_PROMEDIO'].median():.2f}",
-            'Desv. Estándar': f"{ranking_df['PAES_PROMEDIO'].std():.2f}",
-            'Puntaje Máximo': f"{ranking_df['PAES_PROMEDIO'].max():.2f}",
-            'Puntaje Mínimo': f"{ranking_df['PAES_PROMEDIO'].min():.2f}"
+            'Total Establecimientos': f"{statistics['total_establecimientos']:,}",
+            'Total Estudiantes': f"{statistics['total_estudiantes']:,}",
+            'Promedio Nacional': f"{statistics['promedio_nacional']:.2f}",
+            'Mediana': f"{statistics['mediana_nacional']:.2f}",
+            'Desv. Estándar': f"{statistics['desviacion_estandar']:.2f}",
+            'Puntaje Máximo': f"{statistics['puntaje_maximo']:.2f}",
+            'Puntaje Mínimo': f"{statistics['puntaje_minimo']:.2f}"
         }
         
         stats_text = "ESTADÍSTICAS GENERALES\n" + "="*50 + "\n"
@@ -343,7 +565,6 @@ class PAESVisualizer:
                 bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
         
         if save_path:
-            plt.savefig(save_path, dpi=300, bbox_inches='tight')
-            print(f"✓ Dashboard guardado en: {save_path}")
+            self._save(fig, save_path, 'Dashboard')
         
         return fig
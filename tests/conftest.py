@@ -0,0 +1,21 @@
+"""
+Fixtures compartidas de los tests: archivos ArchivoC sintéticos pequeños
+"""
+
+import pytest
+
+from src.synthetic import generate_frame
+
+
+@pytest.fixture
+def archivo_c(tmp_path):
+    """Crea archivos ArchivoC sintéticos en tmp_path; devuelve la función creadora."""
+    def make(name='ArchivoC_Adm2025.csv', n_rows=3000, n_schools=60, seed=0, directory=None):
+        folder = directory or tmp_path
+        folder.mkdir(parents=True, exist_ok=True)
+        path = folder / name
+        generate_frame(n_rows, n_schools=n_schools, seed=seed).to_csv(
+            path, sep=';', index=False, float_format='%.0f'
+        )
+        return str(path)
+    return make
@@ -0,0 +1,60 @@
+"""
+Tests de los intervalos bootstrap del ranking (src/bootstrap.py)
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.bootstrap import (StudentScores, bootstrap_replicates, replicate_ranks,
+                           uncertainty_table)
+
+COLUMNS = ['CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL']
+
+
+def students():
+    """Estudiantes de cuatro colegios: 10 y 20 empatan siempre, 40 tiene uno solo."""
+    return pd.DataFrame({
+        'RBD': [10, 10, 20, 20, 30, 30, 30, 40],
+        'CLEC_REG_ACTUAL': [600, 600, 600, 600, 500, 550, 450, 700],
+        'MATE1_REG_ACTUAL': [600, 600, 600, 600, 520, 480, np.nan, 700]
+    })
+
+
+def test_posiciones_con_empates():
+    """Los empates reciben la menor posición del grupo, como rank(method='min')."""
+    replicates = np.array([[5, 7, 7, np.nan, 1],
+                           [3, 3, 3, 2, np.nan]], dtype=np.float32)
+    ranks = replicate_ranks(replicates)
+    np.testing.assert_array_equal(ranks[0], [3, 1, 1, np.nan, 4])
+    np.testing.assert_array_equal(ranks[1], [1, 1, 1, 4, np.nan])
+
+    expected = pd.DataFrame(replicates.T).rank(ascending=False, method='min').to_numpy().T
+    np.testing.assert_array_equal(ranks, expected)
+
+
+def test_intervalo_contiene_la_posicion_publicada():
+    """Un colegio empatado tiene un rango de posiciones que incluye su RANK."""
+    df = students()
+    scores = StudentScores.from_frame(df, COLUMNS)
+    table = uncertainty_table(scores, bootstrap_replicates(scores, 200, seed=1))
+
+    means = df.groupby('RBD')[COLUMNS].mean().mean(axis=1)
+    rank = means.rank(ascending=False, method='min')
+    for rbd in (10, 20):
+        assert table.loc[rbd, 'RANK_IC_INF'] <= rank[rbd] <= table.loc[rbd, 'RANK_IC_SUP']
+
+
+def test_marca_colegios_de_un_estudiante():
+    """Solo el colegio con un estudiante queda marcado (su intervalo tiene ancho cero)."""
+    scores = StudentScores.from_frame(students(), COLUMNS)
+    table = uncertainty_table(scores, bootstrap_replicates(scores, 50, seed=0))
+    assert table['IC_UN_ESTUDIANTE'].to_dict() == {10: False, 20: False, 30: False, 40: True}
+    assert table.loc[40, 'PAES_EE'] == 0
+
+
+def test_resultado_no_depende_de_los_procesos():
+    """Con la misma semilla, un proceso y varios entregan las mismas réplicas."""
+    scores = StudentScores.from_frame(students(), COLUMNS)
+    single = bootstrap_replicates(scores, 30, seed=3)
+    pooled = bootstrap_replicates(scores, 30, seed=3, workers=2)
+    np.testing.assert_array_equal(single, pooled)
@@ -0,0 +1,97 @@
+"""
+Tests del caché Parquet de archivos ArchivoC (src/data_cache.py)
+"""
+
+import os
+import zipfile
+
+import pytest
+
+from src import data_cache
+from src.paes_analyzer import PAESAnalyzer
+
+pytest.importorskip('pyarrow')
+
+
+def load(path, year, cache_dir):
+    """Carga rápida con caché; devuelve el analizador."""
+    analyzer = PAESAnalyzer(path, year, cache_dir=cache_dir, verbose=False)
+    analyzer.load_data(fast=True)
+    return analyzer
+
+
+def test_segunda_carga_usa_cache(archivo_c, tmp_path):
+    """La segunda carga del mismo archivo lee el caché y entrega los mismos datos."""
+    path = archivo_c()
+    first = load(path, 2025, str(tmp_path / 'cache'))
+    second = load(path, 2025, str(tmp_path / 'cache'))
+    assert first.load_stats['origen'] == 'csv'
+    assert second.load_stats['origen'] == 'cache'
+    assert second.df['RBD'].equals(first.df['RBD'])
+
+
+def test_zip_con_dos_anios_no_comparte_cache(archivo_c, tmp_path):
+    """Cada año de un .zip con varios ArchivoC tiene su propia entrada de caché."""
+    csv_2024 = archivo_c('ArchivoC_Adm2024.csv', seed=1)
+    csv_2025 = archivo_c('ArchivoC_Adm2025.csv', seed=2)
+    archive = tmp_path / 'paes.zip'
+    with zipfile.ZipFile(archive, 'w') as z:
+        z.write(csv_2024, 'ArchivoC_Adm2024.csv')
+        z.write(csv_2025, 'ArchivoC_Adm2025.csv')
+
+    cache_dir = str(tmp_path / 'cache')
+    expected = {2024: load(csv_2024, 2024, None).df, 2025: load(csv_2025, 2025, None).df}
+    for year in (2024, 2025, 2024, 2025):
+        analyzer = load(str(archive), year, cache_dir)
+        assert analyzer.df['RBD'].equals(expected[year]['RBD'])
+    assert analyzer.load_stats['origen'] == 'cache'
+
+
+def test_mismo_nombre_en_otro_directorio(archivo_c, tmp_path):
+    """Archivos con el mismo nombre en distintos directorios no se desalojan."""
+    cache_dir = str(tmp_path / 'cache')
+    path_a = archivo_c(directory=tmp_path / 'a', seed=1)
+    path_b = archivo_c(directory=tmp_path / 'b', seed=2)
+    load(path_a, 2025, cache_dir)
+    load(path_b, 2025, cache_dir)
+    assert load(path_a, 2025, cache_dir).load_stats['origen'] == 'cache'
+    assert load(path_b, 2025, cache_dir).load_stats['origen'] == 'cache'
+
+
+def test_huella_cambia_con_el_contenido(archivo_c, tmp_path):
+    """Editar el archivo cambia la huella; solo tocarlo no."""
+    path = archivo_c()
+    cache_dir = str(tmp_path / 'cache')
+    original = data_cache.file_fingerprint(path, 'rapido', 2025, cache_dir=cache_dir)
+
+    os.utime(path)
+    assert data_cache.file_fingerprint(path, 'rapido', 2025, cache_dir=cache_dir) == original
+
+    with open(path, 'r+b') as f:
+        f.seek(os.path.getsize(path) // 2)
+        byte = f.read(1)
+        f.seek(-1, os.SEEK_CUR)
+        f.write(b'9' if byte != b'9' else b'8')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert data_cache.file_fingerprint(path, 'rapido', 2025, cache_dir=cache_dir) != original
+
+
+def test_huella_incluye_anio_y_renombres(archivo_c, tmp_path):
+    """El año y los renombres de columnas forman parte de la huella."""
+    path = archivo_c()
+    cache_dir = str(tmp_path / 'cache')
+    base = data_cache.file_fingerprint(path, 'rapido', 2025, cache_dir=cache_dir)
+    assert data_cache.file_fingerprint(path, 'rapido', 2024, cache_dir=cache_dir) != base
+    assert data_cache.file_fingerprint(path, 'rapido', 2025, {'RBD_X': 'RBD'},
+                                       cache_dir=cache_dir) != base
+
+
+def test_cache_no_escribible(archivo_c, tmp_path):
+    """Un directorio de caché inválido no impide cargar los datos."""
+    path = archivo_c()
+    blocker = tmp_path / 'archivo'
+    blocker.write_text('no es un directorio')
+    analyzer = load(path, 2025, str(blocker / 'cache'))
+    assert analyzer.load_stats['origen'] == 'csv'
+    assert len(analyzer.df) == 3000
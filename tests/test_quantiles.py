@@ -0,0 +1,77 @@
+"""
+Tests de los sketches de percentiles (src/quantiles.py)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.quantiles import QuantileSketch
+
+COLUMNS = ['CLEC_REG_ACTUAL', 'MATE1_REG_ACTUAL']
+
+
+def students(n=5000, seed=0):
+    """Puntajes enteros de estudiantes en tres regiones, con faltantes."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'CODIGO_REGION': rng.integers(1, 4, size=n),
+        **{col: np.clip(np.round(rng.normal(500, 100, size=n)), 100, 1000)
+           for col in COLUMNS}
+    })
+    df.loc[rng.random(n) < 0.1, 'MATE1_REG_ACTUAL'] = np.nan
+    return df
+
+
+def test_percentiles_exactos_con_puntajes_enteros():
+    """Con resolución 1 los percentiles coinciden con np.quantile (inverted_cdf)."""
+    df = students()
+    table = QuantileSketch.from_frame(df, COLUMNS).quantiles((0.1, 0.5, 0.9))
+    for _, row in table.iterrows():
+        values = df[row['PRUEBA']].dropna()
+        assert row['N'] == len(values)
+        expected = np.quantile(values, [0.1, 0.5, 0.9], method='inverted_cdf')
+        assert [row['P10'], row['P50'], row['P90']] == expected.tolist()
+
+
+def test_merge_igual_a_construir_con_todo():
+    """Combinar los sketches de dos bloques equivale a construir uno con ambos."""
+    df = students()
+    first = QuantileSketch.from_frame(df.iloc[:2000], COLUMNS, 'CODIGO_REGION')
+    second = QuantileSketch.from_frame(df.iloc[2000:], COLUMNS, 'CODIGO_REGION')
+    whole = QuantileSketch.from_frame(df, COLUMNS, 'CODIGO_REGION')
+    merged = first.merge(second)
+    np.testing.assert_array_equal(merged.counts, whole.counts)
+    pd.testing.assert_frame_equal(merged.quantiles(by_group=True),
+                                  whole.quantiles(by_group=True))
+
+
+def test_merge_con_columnas_y_claves_distintas():
+    """Columnas faltantes se combinan en cero; agrupaciones distintas, como totales."""
+    df = students()
+    regional = QuantileSketch.from_frame(df, COLUMNS, 'CODIGO_REGION')
+    national = QuantileSketch.from_frame(df, ['CLEC_REG_ACTUAL'])
+    merged = regional.merge(national)
+    assert merged.key is None
+    table = merged.quantiles().set_index('PRUEBA')
+    assert table.loc['CLEC_REG_ACTUAL', 'N'] == 2 * len(df)
+    assert table.loc['MATE1_REG_ACTUAL', 'N'] == df['MATE1_REG_ACTUAL'].notna().sum()
+
+
+def test_resoluciones_distintas():
+    """No se combinan sketches con distinta resolución."""
+    df = students(100)
+    with pytest.raises(ValueError):
+        QuantileSketch.from_frame(df, COLUMNS).merge(
+            QuantileSketch.from_frame(df, COLUMNS, resolution=5.0)
+        )
+
+
+def test_sin_puntajes_y_nivel_invalido():
+    """Una columna vacía da NaN; un nivel fuera de [0, 1] es un error."""
+    df = pd.DataFrame({'CLEC_REG_ACTUAL': [np.nan, np.nan]})
+    sketch = QuantileSketch.from_frame(df, ['CLEC_REG_ACTUAL'])
+    row = sketch.quantiles().iloc[0]
+    assert row['N'] == 0 and np.isnan(row['P50'])
+    with pytest.raises(ValueError):
+        sketch.quantiles((1.5,))
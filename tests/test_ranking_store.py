@@ -0,0 +1,67 @@
+"""
+Tests de la base SQLite de rankings (src/ranking_store.py)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.ranking_store import RankingStore
+
+
+@pytest.fixture
+def store():
+    """Base en memoria con un año: RBD 2 no tiene puntajes ni posición."""
+    ranking = pd.DataFrame({
+        'RBD': [1, 3, 4, 2],
+        'CLEC_REG_ACTUAL': [600.0, 550.0, 500.0, np.nan],
+        'MATE1_REG_ACTUAL': [620.0, 530.0, 500.0, np.nan],
+        'PAES_PROMEDIO': [610.0, 540.0, 500.0, np.nan],
+        'N_ESTUDIANTES': [30, 20, 10, 1],
+        'RANK': [1.0, 2.0, 3.0, np.nan]
+    })
+    with RankingStore(':memory:') as db:
+        db.write_year(2025, ranking)
+        yield db
+
+
+def test_top_excluye_sin_posicion(store):
+    """Un establecimiento sin RANK (NULL) no aparece primero en el top."""
+    top = store.get_top_schools(2025, n=3)
+    assert [row['RBD'] for row in top] == [1, 3, 4]
+
+
+def test_read_ranking_deja_nulos_al_final(store):
+    """read_ranking ordena por RANK con los NULL al final, como el ranking en memoria."""
+    ranking = store.read_ranking(2025)
+    assert ranking['RBD'].tolist() == [1, 3, 4, 2]
+
+
+def test_posicion_sin_ranking(store):
+    """Un establecimiento sin puntajes se entrega con campos nulos."""
+    position = store.get_school_position(2025, 2)
+    assert position['rank'] is None
+    assert position['percentil'] is None
+    assert position['paes_promedio'] is None
+    assert position['n_estudiantes'] == 1
+
+
+def test_posicion_y_percentil(store):
+    """Posición, promedios redondeados y percentil de un establecimiento."""
+    position = store.get_school_position(2025, 3)
+    assert position['rank'] == 2
+    assert position['clec'] == 550.0
+    assert position['percentil'] == 50.0
+
+
+def test_rbd_inexistente(store):
+    """Un RBD que no está en la base devuelve un mensaje de error."""
+    assert 'error' in store.get_school_position(2025, 999)
+
+
+def test_reescribir_anio(store):
+    """write_year reemplaza el año completo."""
+    store.write_year(2025, pd.DataFrame({'RBD': [7], 'PAES_PROMEDIO': [500.0],
+                                         'N_ESTUDIANTES': [5], 'RANK': [1.0]}))
+    assert store.read_ranking(2025)['RBD'].tolist() == [7]
+    assert store.years() == [2025]
@@ -0,0 +1,75 @@
+"""
+Tests de la validación previa del esquema (src/schema.py)
+"""
+
+import pandas as pd
+import pytest
+
+from src.schema import column_renames, validate_source
+
+
+def write(tmp_path, df, name='ArchivoC_Adm2025.csv'):
+    """Escribe un DataFrame como ArchivoC separado por ';'."""
+    path = tmp_path / name
+    df.to_csv(path, sep=';', index=False)
+    return str(path)
+
+
+def base_frame():
+    """Tres estudiantes con las columnas requeridas y la región."""
+    return pd.DataFrame({
+        'RBD': [1, 1, 2],
+        'SITUACION_EGRESO': [1, 1, 2],
+        'CODIGO_REGION': [13, 13, 5],
+        'CLEC_REG_ACTUAL': [600, 550, 500],
+        'MATE1_REG_ACTUAL': [610, 540, 480]
+    })
+
+
+def test_archivo_valido(tmp_path):
+    """Un archivo correcto no tiene errores ni advertencias."""
+    report = validate_source(write(tmp_path, base_frame()), 2025)
+    assert report['errores'] == []
+    assert report['advertencias'] == []
+    assert report['filas_muestra'] == 3
+
+
+def test_falta_columna_requerida(tmp_path):
+    """Sin una columna requerida la validación estricta falla con su nombre."""
+    path = write(tmp_path, base_frame().drop(columns='MATE1_REG_ACTUAL'))
+    with pytest.raises(ValueError, match='MATE1_REG_ACTUAL'):
+        validate_source(path, 2025)
+    report = validate_source(path, 2025, strict=False)
+    assert any('MATE1_REG_ACTUAL' in error for error in report['errores'])
+
+
+def test_puntaje_fuera_de_rango(tmp_path):
+    """Un puntaje mayor a 1000 es un error."""
+    df = base_frame()
+    df.loc[0, 'CLEC_REG_ACTUAL'] = 1200
+    report = validate_source(write(tmp_path, df), 2025, strict=False)
+    assert any('CLEC_REG_ACTUAL' in error for error in report['errores'])
+
+
+def test_codigo_territorial_invalido_es_advertencia(tmp_path):
+    """Un código de región no numérico advierte, sin importar dónde esté la fila."""
+    df = base_frame().astype({'CODIGO_REGION': object})
+    df.loc[0, 'CODIGO_REGION'] = 'XX'
+    report = validate_source(write(tmp_path, df), 2025)
+    assert report['errores'] == []
+    assert any('CODIGO_REGION' in warning for warning in report['advertencias'])
+
+
+def test_renombres_del_registro(tmp_path):
+    """Los nombres alternativos de un año se llevan a los canónicos."""
+    df = base_frame().rename(columns={'CLEC_REG_ACTUAL': 'CLEC_ACTUAL',
+                                      'SITUACION_EGRESO': 'SITUACION_EGRESO_ACTUAL'})
+    report = validate_source(write(tmp_path, df, 'ArchivoC_Adm2023.csv'), 2023)
+    assert report['renombres'] == {'CLEC_ACTUAL': 'CLEC_REG_ACTUAL',
+                                   'SITUACION_EGRESO_ACTUAL': 'SITUACION_EGRESO'}
+
+
+def test_alias_no_reemplaza_columna_canonica():
+    """Un alias no se aplica si el archivo ya trae la columna canónica."""
+    assert column_renames(['CLEC_ACTUAL', 'CLEC_REG_ACTUAL'], 2023) == {}
+    assert column_renames([' rbd '], 2025) == {' rbd ': 'RBD'}
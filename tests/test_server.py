@@ -0,0 +1,118 @@
+"""
+Tests del servicio HTTP de consultas (src/server.py)
+"""
+
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.paes_analyzer import PAESAnalyzer
+from src.ranking_store import RankingStore
+from src.server import (InvalidParameter, PooledHTTPServer, RankingService,
+                        make_handler)
+
+
+def ranking():
+    """Ranking de un año: RBD 2 no tiene puntajes ni posición."""
+    return pd.DataFrame({
+        'RBD': [1, 3, 2],
+        'CLEC_REG_ACTUAL': [600.0, 500.0, np.nan],
+        'MATE1_REG_ACTUAL': [620.0, 480.0, np.nan],
+        'PAES_PROMEDIO': [610.0, 490.0, np.nan],
+        'N_ESTUDIANTES': [30, 20, 1],
+        'RANK': [1.0, 2.0, np.nan]
+    })
+
+
+def analyzer(year):
+    """Analizador con el ranking ya calculado."""
+    result = PAESAnalyzer(f'ranking_{year}.csv', year, verbose=False)
+    result.ranking = ranking()
+    return result
+
+
+@pytest.fixture
+def service():
+    return RankingService([analyzer(2024), analyzer(2025)])
+
+
+@pytest.fixture
+def base_url(service):
+    """Servidor real en un puerto libre; devuelve su URL."""
+    server = PooledHTTPServer(('127.0.0.1', 0), make_handler(service), workers=2)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+def get(url):
+    """GET que devuelve (estado, JSON) también para respuestas de error."""
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_posicion(service):
+    """La posición de un establecimiento con ranking."""
+    result = service.handle('position', {'year': '2025', 'rbd': '3'})
+    assert result['rank'] == 2
+    assert result['paes_promedio'] == 490.0
+
+
+def test_posicion_sin_ranking_no_es_error(service):
+    """Un establecimiento sin posición se entrega con campos nulos."""
+    result = service.handle('position', {'year': '2025', 'rbd': '2'})
+    assert result['rank'] is None
+    assert result['percentil'] is None
+    assert result['n_estudiantes'] == 1
+
+
+def test_comparacion_sin_ranking(service):
+    """Comparar un establecimiento sin posición informa 'sin ranking'."""
+    result = service.handle('compare', {'year1': '2024', 'year2': '2025', 'rbd': '2'})
+    assert result['tendencia'] == 'sin ranking'
+    assert result['cambio_ranking'] is None
+
+
+def test_parametros(service):
+    """Parámetros inválidos, faltantes o años desconocidos."""
+    with pytest.raises(InvalidParameter):
+        service.handle('position', {'year': '2025', 'rbd': 'abc'})
+    with pytest.raises(KeyError):
+        service.handle('position', {'year': '2025'})
+    with pytest.raises(LookupError):
+        service.handle('position', {'year': '1999', 'rbd': '1'})
+
+
+def test_http_nan_como_null(base_url):
+    """Por HTTP, un dato faltante es null (JSON válido) con estado 200."""
+    status, body = get(f'{base_url}/position?year=2025&rbd=2')
+    assert status == 200
+    assert body['rank'] is None and body['clec'] is None
+
+
+def test_http_estados_de_error(base_url):
+    """400 para parámetros inválidos y 404 para años o endpoints desconocidos."""
+    assert get(f'{base_url}/position?year=2025&rbd=abc')[0] == 400
+    assert get(f'{base_url}/position?year=2025')[0] == 400
+    assert get(f'{base_url}/position?year=1999&rbd=1')[0] == 404
+    assert get(f'{base_url}/nada')[0] == 404
+
+
+def test_top_desde_sqlite(tmp_path):
+    """Cargado desde SQLite, el top no empieza con un establecimiento sin posición."""
+    db_path = str(tmp_path / 'rankings.db')
+    with RankingStore(db_path) as store:
+        store.write_year(2025, ranking())
+    service = RankingService.from_sqlite(db_path)
+    top = service.handle('top', {'year': '2025', 'n': '2'})['top']
+    assert [row['RBD'] for row in top] == [1, 3]